@@ -29,19 +29,7 @@ def merge_runs(input_dir: str) -> tuple[int, str]:
 
     try:
         dom = defusedxml.minidom.parseString(doc_xml.read_text(encoding="utf-8"))
-        root = dom.documentElement
-
-        # Clean up elements that block merging
-        _remove_elements(root, "proofErr")
-        _strip_run_rsid_attrs(root)
-
-        # Find all containers that have runs
-        containers = {run.parentNode for run in _find_elements(root, "r")}
-
-        # Merge runs in each container
-        merge_count = 0
-        for container in containers:
-            merge_count += _merge_runs_in(container)
+        merge_count = merge_runs_in_dom(dom)
 
         doc_xml.write_bytes(dom.toxml(encoding="UTF-8"))
         return merge_count, f"Merged {merge_count} runs"
@@ -50,6 +38,32 @@ def merge_runs(input_dir: str) -> tuple[int, str]:
         return 0, f"Error: {e}"
 
 
+def merge_runs_in_dom(dom) -> int:
+    """Merge adjacent runs in a parsed document.xml, in place.
+
+    Args:
+        dom: minidom Document of word/document.xml
+
+    Returns:
+        Number of runs merged
+    """
+    root = dom.documentElement
+
+    # Clean up elements that block merging
+    _remove_elements(root, "proofErr")
+    _strip_run_rsid_attrs(root)
+
+    # Find all containers that have runs
+    containers = {run.parentNode for run in _find_elements(root, "r")}
+
+    # Merge runs in each container
+    merge_count = 0
+    for container in containers:
+        merge_count += _merge_runs_in(container)
+
+    return merge_count
+
+
 # --- Element helpers ---
 
 
@@ -3,30 +3,86 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--jobs N] [--original <file>]
+        [--compress-level N] [--reproducible] [--verbose]
+
+With --original, parts that are unchanged from the original file are copied
+into the new file as they are compressed there, and only edited parts are
+compressed again. Already-compressed media (images, audio, video, WOFF fonts,
+embedded archives) is stored; everything else is deflated at --compress-level
+(1 = fastest, 9 = smallest). --reproducible writes fixed timestamps and sorted
+members, so the same directory always packs to the same bytes.
 """
 
 import argparse
-import shutil
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
-import zipfile
 from pathlib import Path
 
+from validation.packing import (
+    DEFAULT_LEVEL,
+    MAX_BUFFERED_SIZE,
+    CompressionPolicy,
+    pack_directory,
+)
+from validation.parallel import PhaseTimer
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for condensing XML parts (0 = one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "--original",
+        help="Original Office file to copy unchanged members from (incremental repack)",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        choices=range(10),
+        default=DEFAULT_LEVEL,
+        metavar="0-9",
+        help=(
+            f"Deflate level, 1 = fastest, 9 = smallest (default: {DEFAULT_LEVEL}); files"
+            f" over {MAX_BUFFERED_SIZE >> 20} MB are streamed at {DEFAULT_LEVEL} to bound memory"
+        ),
+    )
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Fixed timestamps and member order, for byte-identical output",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Also print recompressed members, compression statistics and phase timings",
+    )
     args = parser.parse_args()
 
     try:
+        timer = PhaseTimer(args.jobs)
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            jobs=args.jobs,
+            timer=timer,
+            original_file=args.original,
+            policy=CompressionPolicy(args.compress_level, reproducible=args.reproducible),
+            verbose=args.verbose,
         )
+        if args.verbose:
+            print(timer.summary())
 
         # Show warning if validation was skipped
         if args.force:
@@ -42,13 +98,29 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(
+    input_dir,
+    output_file,
+    validate=False,
+    jobs=1,
+    timer=None,
+    original_file=None,
+    policy=None,
+    verbose=False,
+):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        jobs: Worker processes for condensing XML parts (0 = one per CPU)
+        timer: Optional PhaseTimer that records the time of each phase
+        original_file: Optional original Office file; members that are
+            unchanged from it are copied without recompressing them
+        policy: Optional CompressionPolicy for the other members
+        verbose: If True, also list the recompressed members and print what
+            compression saved and cost
 
     Returns:
         bool: True if successful, False if validation failed
@@ -60,29 +132,31 @@ def pack_document(input_dir, output_file, validate=False):
         raise ValueError(f"{input_dir} is not a directory")
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
-
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    if original_file is not None and not Path(original_file).is_file():
+        raise ValueError(f"{original_file} does not exist")
+
+    # Condense XML parts straight into the zip; input_dir is left untouched
+    timer = timer if timer is not None else PhaseTimer(jobs)
+    stats = pack_directory(
+        input_dir,
+        output_file,
+        jobs=jobs,
+        timer=timer,
+        original_file=original_file,
+        policy=policy,
+    )
+    if original_file is not None:
+        print(stats.summary(verbose))
+    if verbose:
+        print(stats.compression_summary())
+
+    # Validate if requested
+    if validate:
+        with timer.phase("validate"):
+            valid = validate_document(output_file)
+        if not valid:
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
@@ -130,30 +204,5 @@ def validate_document(doc_path):
             return False
 
 
-def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
-
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
-            continue
-
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
-
-
 if __name__ == "__main__":
     main()
@@ -1,15 +1,38 @@
 """
 Validation modules for Word document processing.
+
+Exports are imported on first use, so light modules such as the validation
+server client can be imported without loading lxml and every validator.
 """
 
-from .base import BaseSchemaValidator
-from .docx import DOCXSchemaValidator
-from .pptx import PPTXSchemaValidator
-from .redlining import RedliningValidator
-
-__all__ = [
-    "BaseSchemaValidator",
-    "DOCXSchemaValidator",
-    "PPTXSchemaValidator",
-    "RedliningValidator",
-]
+import importlib
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    "BaseSchemaValidator": ".base",
+    "BaselineRegistry": ".baseline",
+    "DOCXSchemaValidator": ".docx",
+    "PPTXSchemaValidator": ".pptx",
+    "RedliningValidator": ".redlining",
+    "ResultCache": ".cache",
+    "SCHEMA_REGISTRY": ".schemas",
+    "SchemaRegistry": ".schemas",
+    "SubtreeChange": ".subtrees",
+    "ValidationReport": ".report",
+    "XLSXSchemaValidator": ".xlsx",
+    "ZipPackage": ".zippackage",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
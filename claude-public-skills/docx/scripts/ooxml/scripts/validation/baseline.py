@@ -0,0 +1,153 @@
+"""
+XSD error baseline computed from the original Office file.
+"""
+
+import io
+import zipfile
+from collections import OrderedDict
+from pathlib import Path, PurePosixPath
+
+import lxml.etree
+
+
+class OriginalBaseline:
+    """Per-part XSD errors of the original document, read straight from its zip.
+
+    The archive is opened once and only the members that are actually asked
+    about are parsed, in memory. Error sets are memoized for the lifetime of
+    the baseline, so each part of the original is validated at most once no
+    matter how many times it is compared against.
+    """
+
+    def __init__(
+        self,
+        original_file,
+        validate_tree,
+        result_cache=None,
+        cache_key=None,
+        errors=None,
+    ):
+        """
+        Args:
+            original_file: Path to the original .docx/.pptx/.xlsx
+            validate_tree: Callable (xml_doc, relative_path) -> (is_valid, errors_set)
+                used to validate a parsed member of the original
+            result_cache: Optional ResultCache consulted before validating a member
+            cache_key: Callable (relative_path, member_bytes) -> key for result_cache
+            errors: Optional memo dict shared with earlier baselines of the same
+                original (see BaselineRegistry)
+        """
+        self.original_file = original_file
+        self._validate_tree = validate_tree
+        self._result_cache = result_cache
+        self._cache_key = cache_key
+        self._zip = None
+        self._errors = errors if errors is not None else {}  # member -> error set
+
+    def _archive(self):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.original_file, "r")
+        return self._zip
+
+    def member_info(self, relative_path):
+        """Return the ZipInfo (CRC, sizes) for relative_path, or None if absent.
+
+        Only the central directory is consulted; nothing is decompressed.
+        """
+        try:
+            return self._archive().getinfo(PurePosixPath(relative_path).as_posix())
+        except KeyError:
+            return None
+
+    def has_member(self, member):
+        """Return True if the original archive contains the given member."""
+        return self.member_info(member) is not None
+
+    def errors_for(self, relative_path):
+        """Return the set of XSD errors for relative_path in the original file.
+
+        Parts that do not exist in the original have no errors.
+        """
+        member = PurePosixPath(relative_path).as_posix()
+        if member in self._errors:
+            return self._errors[member]
+
+        if not self.has_member(member):
+            errors = set()
+        elif self._result_cache is not None:
+            errors = self._cached_errors(member)
+        else:
+            try:
+                with self._archive().open(member) as f:
+                    xml_doc = lxml.etree.parse(f)
+                _, errors = self._validate_tree(xml_doc, PurePosixPath(member))
+            except Exception as e:
+                errors = {str(e)}
+
+        errors = errors if errors else set()
+        self._errors[member] = errors
+        return errors
+
+    def _cached_errors(self, member):
+        """Validate member via the persistent result cache."""
+        try:
+            data = self._archive().read(member)
+        except Exception as e:
+            return {str(e)}
+
+        key = self._cache_key(PurePosixPath(member), data)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            return set(cached["errors"] or ())
+
+        try:
+            xml_doc = lxml.etree.parse(io.BytesIO(data))
+        except Exception as e:
+            return {str(e)}
+        is_valid, errors = self._validate_tree(xml_doc, PurePosixPath(member))
+        self._result_cache.put(key, {"valid": is_valid, "errors": sorted(errors or ())})
+        return errors
+
+    def close(self):
+        """Close the underlying archive (it is reopened on demand)."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+class BaselineRegistry:
+    """Original-file XSD errors kept across validator instances.
+
+    A long-running process (the validation server) hands one registry to
+    every validator it creates, so the original document is validated once
+    rather than once per run. Entries are keyed by validator class and the
+    original's path, size and modification time, so an original that changes
+    on disk starts afresh; the least recently used originals are dropped once
+    more than max_entries are held.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.hits = 0
+        self._errors = OrderedDict()  # key -> {member: error set}
+
+    def errors_memo(self, validator_name, original_file):
+        """Return the shared {member: errors} memo for an original file."""
+        path = Path(original_file).resolve()
+        try:
+            stat = path.stat()
+        except OSError:
+            return {}  # Let the baseline report the missing file
+        key = (validator_name, str(path), stat.st_size, stat.st_mtime_ns)
+
+        if key in self._errors:
+            self.hits += 1
+            self._errors.move_to_end(key)
+        else:
+            self._errors[key] = {}
+            while len(self._errors) > self.max_entries:
+                self._errors.popitem(last=False)
+        return self._errors[key]
+
+    def clear(self):
+        self._errors.clear()
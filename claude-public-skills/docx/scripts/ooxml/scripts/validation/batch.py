@@ -0,0 +1,233 @@
+"""
+Batch validation of many documents on a bounded pool of worker processes.
+
+Every worker validates whole documents one after another, so compiled schemas
+and original-file baselines stay warm across documents. Where processes are
+forked, schemas are compiled once in the parent before the pool starts and the
+workers inherit them.
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .base import BaseSchemaValidator
+from .baseline import BaselineRegistry
+from .report import ValidationReport
+from .runner import PACKED_SUFFIXES, validate_path
+from .schemas import SCHEMA_REGISTRY
+
+# Main content folder whose schema each document type needs
+_CONTENT_FOLDERS = {".docx": "word", ".pptx": "ppt", ".xlsx": "xl"}
+
+# Options and baselines used by all documents of the current worker (see _init_worker)
+_worker_options = None
+_worker_baselines = None
+
+
+def read_manifest(manifest, default_original=None):
+    """Read (candidate, original) pairs from a manifest file.
+
+    Each line is either a JSON object {"path": ..., "original": ...} or the two
+    paths separated by a tab. The original may be left out when
+    default_original is given. Blank lines and lines starting with # are
+    ignored; relative paths are relative to the manifest's directory.
+    """
+    manifest = Path(manifest)
+    base = manifest.parent
+    pairs = []
+    with open(manifest, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                candidate, original = entry["path"], entry.get("original")
+            else:
+                candidate, _, original = line.partition("\t")
+            original = original or default_original
+            if original is None:
+                raise ValueError(f"{manifest}:{line_number}: no original file given")
+            pairs.append((base / candidate, base / original))
+    return pairs
+
+
+def find_documents(directory, original):
+    """Pair every packed Office file under directory with its original.
+
+    original is either one file used for every document, or a directory
+    holding the originals under the same relative paths.
+    """
+    directory = Path(directory)
+    original = Path(original)
+    candidates = sorted(
+        path
+        for path in directory.rglob("*")
+        if path.is_file() and path.suffix.lower() in PACKED_SUFFIXES
+    )
+    if original.is_dir():
+        return [(path, original / path.relative_to(directory)) for path in candidates]
+    return [(path, original) for path in candidates]
+
+
+def warm_schemas(suffixes):
+    """Compile the schemas documents of the given types validate against."""
+    schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+    skipped = {
+        folder for suffix, folder in _CONTENT_FOLDERS.items() if suffix not in suffixes
+    }
+    for key, schema in BaseSchemaValidator.SCHEMA_MAPPINGS.items():
+        if key in skipped:
+            continue
+        # A schema that fails to compile is reported by the check that needs it
+        with contextlib.suppress(Exception):
+            SCHEMA_REGISTRY.get(schemas_dir / schema)
+
+
+def _document_size(path):
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    return path.stat().st_size
+
+
+def _init_worker(options, suffixes):
+    global _worker_options, _worker_baselines
+    _worker_options = options
+    _worker_baselines = BaselineRegistry()
+    # Cache hits when the schemas were inherited from the parent process
+    warm_schemas(suffixes)
+
+
+def _validate_document(candidate, original):
+    """Validate one document and return its result record."""
+    result = {"path": str(candidate), "original": str(original)}
+    report = ValidationReport(echo=False)
+    start = time.perf_counter()
+    try:
+        result["bytes"] = _document_size(candidate)
+        # Checks print to the report; lines outside checks are not needed here
+        with contextlib.redirect_stdout(io.StringIO()):
+            success = validate_path(
+                candidate,
+                original,
+                auto_repair=_worker_options["auto_repair"],
+                jobs=1,
+                cache=_worker_options["cache"],
+                xsd_large_parts=_worker_options["xsd_large_parts"],
+                report=report,
+                baseline_registry=_worker_baselines,
+            )
+    except Exception as e:
+        result.update(success=False, error=f"{type(e).__name__}: {e}".strip())
+        if not isinstance(e, (AssertionError, OSError)):
+            result["traceback"] = traceback.format_exc()
+        success = False
+    result["seconds"] = round(time.perf_counter() - start, 6)
+    result["success"] = success
+    result["failed_checks"] = [
+        check["name"] for check in report.checks if not check["passed"]
+    ]
+    result["errors"] = [error for check in report.checks for error in check["errors"]]
+    return result
+
+
+def _pool_context():
+    # Forked workers inherit the schemas compiled before the pool started
+    if sys.platform.startswith("linux"):
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def validate_batch(
+    pairs, jobs=0, auto_repair=False, cache=True, xsd_large_parts=False, output=None
+):
+    """Validate (candidate, original) pairs, writing one JSON line per document.
+
+    Lines are written to output (stdout by default) as documents finish, so
+    they are not in input order. A final {"summary": ...} line gives the
+    totals and throughput.
+
+    Args:
+        pairs: Iterable of (candidate, original) paths; a candidate is a packed
+            Office file or an unpacked directory
+        jobs: Worker processes (0 = one per CPU)
+        auto_repair: Apply auto-repairs before validating (in memory for
+            packed files)
+        cache: Use the persistent per-part result cache
+        xsd_large_parts: Validate parts above XSD_SIZE_LIMIT against their
+            schema too
+
+    Returns:
+        Summary dict with counts, bytes, wall time, docs/s and MB/s
+    """
+    output = output if output is not None else sys.stdout
+    pairs = [(Path(candidate), Path(original)) for candidate, original in pairs]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(pairs) or 1))
+    options = {
+        "auto_repair": auto_repair,
+        "cache": cache,
+        "xsd_large_parts": xsd_large_parts,
+    }
+    suffixes = {original.suffix.lower() for _, original in pairs}
+
+    summary = {"documents": 0, "passed": 0, "failed": 0, "errors": 0, "bytes": 0}
+
+    def record(result):
+        output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        output.flush()
+        summary["documents"] += 1
+        summary["bytes"] += result.get("bytes", 0)
+        if "error" in result:
+            summary["errors"] += 1
+        elif result["success"]:
+            summary["passed"] += 1
+        else:
+            summary["failed"] += 1
+
+    start = time.perf_counter()
+    warm_schemas(suffixes)
+    if jobs == 1:
+        _init_worker(options, suffixes)
+        for candidate, original in pairs:
+            record(_validate_document(candidate, original))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=_pool_context(),
+            initializer=_init_worker,
+            initargs=(options, suffixes),
+        ) as executor:
+            futures = [
+                executor.submit(_validate_document, candidate, original)
+                for candidate, original in pairs
+            ]
+            for future in as_completed(futures):
+                record(future.result())
+    seconds = time.perf_counter() - start
+
+    summary["jobs"] = jobs
+    summary["seconds"] = round(seconds, 6)
+    summary["docs_per_second"] = round(summary["documents"] / seconds, 3) if seconds else None
+    summary["mb_per_second"] = round(summary["bytes"] / 1e6 / seconds, 3) if seconds else None
+    output.write(json.dumps({"summary": summary}) + "\n")
+    output.flush()
+    return summary
+
+
+def format_summary(summary):
+    """One-line human-readable version of a validate_batch() summary."""
+    return (
+        f"Validated {summary['documents']} document(s) in {summary['seconds']:.2f}s "
+        f"with {summary['jobs']} worker(s): {summary['passed']} passed, "
+        f"{summary['failed']} failed, {summary['errors']} error(s); "
+        f"{summary['docs_per_second'] or 0:.2f} docs/s, "
+        f"{summary['mb_per_second'] or 0:.2f} MB/s"
+    )
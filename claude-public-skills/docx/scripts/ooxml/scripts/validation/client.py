@@ -0,0 +1,77 @@
+"""
+Client side of the local validation server protocol (see server.py).
+
+The protocol is one JSON object per line: the client sends a request, the
+server answers with the captured stdout/stderr, exit code and any other
+results, then closes the connection. This module only needs the standard
+library, so a client does not pay for importing lxml or the validators.
+"""
+
+import json
+import os
+import socket
+from pathlib import Path
+
+from .cache import CACHE_DIR_ENV
+
+# Environment variable that overrides the default socket location
+SOCKET_ENV = "OOXML_VALIDATION_SOCKET"
+
+# Bumped whenever requests or responses change shape; a client talking to a
+# server of another version falls back to validating in-process
+PROTOCOL_VERSION = 1
+
+# Seconds a client waits for the server to accept a connection
+CONNECT_TIMEOUT = 2.0
+
+
+def default_socket_path():
+    """Return the socket path from $OOXML_VALIDATION_SOCKET or the cache directory."""
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    cache_dir = os.environ.get(CACHE_DIR_ENV) or (
+        Path.home() / ".cache" / "ooxml-validation"
+    )
+    return Path(cache_dir) / "server.sock"
+
+
+def connect(socket_path):
+    """Return a socket connected to socket_path, or None if nothing is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)  # Validation itself may take a while
+    return sock
+
+
+def request(command, socket_path=None, **fields):
+    """Send a request to a running server and return its response dict.
+
+    Paths in fields must already be absolute. Returns None if no server is
+    listening or it cannot handle the request, so the caller can fall back
+    to validating in-process.
+    """
+    sock = connect(socket_path or default_socket_path())
+    if sock is None:
+        return None
+
+    message = {"version": PROTOCOL_VERSION, "command": command, **fields}
+    try:
+        with sock, sock.makefile("rwb") as stream:
+            stream.write(json.dumps(message).encode("utf-8") + b"\n")
+            stream.flush()
+            line = stream.readline()
+    except OSError:
+        return None
+
+    try:
+        response = json.loads(line)
+    except ValueError:
+        return None
+    if "error" in response:
+        return None
+    return response
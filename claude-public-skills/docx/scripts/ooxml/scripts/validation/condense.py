@@ -0,0 +1,132 @@
+"""
+Pack-style condensing of pretty-printed XML parts.
+
+pack.py condenses every .xml/.rels part with minidom before zipping it:
+whitespace-only text nodes and comments are dropped from every element except
+text elements (w:t, a:t, ...), and the result is written with toxml(). The
+functions here produce the same bytes, using lxml for speed. Parts with a
+document type declaration always take the defusedxml path, which rejects
+entity declarations.
+"""
+
+import re
+
+import defusedxml.minidom
+import lxml.etree
+
+# Parser for the fast path, which only sees input without a DTD
+_PARSER = lxml.etree.XMLParser(resolve_entities=False, no_network=True)
+
+_XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>'
+
+# Text segments (between a tag's '>' and the next '<') that contain a quote
+_QUOTED_TEXT = re.compile(rb'>[^<"]*"[^<]*')
+
+# Character references lxml emits where minidom writes the raw character
+_RAW_CHARREFS = ((b"&#10;", b"\n"), (b"&#9;", b"\t"), (b"&#13;", b"\r"))
+
+
+def condense_xml_bytes(data):
+    """Strip pretty-printing whitespace and comments from an XML part.
+
+    The result is byte-identical to what pack.py writes for the part, so it can
+    be compared against a packed archive member by CRC and size. Text elements
+    (w:t, a:t, ...) keep their whitespace.
+
+    Args:
+        data: Raw bytes of the XML part
+
+    Returns:
+        bytes: Condensed XML, UTF-8 encoded with an XML declaration
+
+    Raises:
+        defusedxml.EntitiesForbidden: The part declares entities
+        xml.parsers.expat.ExpatError: The part is not well-formed
+    """
+    condensed = _condense_with_lxml(data)
+    if condensed is not None:
+        return condensed
+    return _condense_with_minidom(data)
+
+
+def _condense_with_minidom(data):
+    """Reference implementation: the minidom pass pack.py has always used."""
+    dom = defusedxml.minidom.parseString(data)
+
+    # Process each element to remove whitespace and comments
+    for element in dom.getElementsByTagName("*"):
+        # Skip text elements (w:t, a:t, etc.) - preserve their content
+        if element.tagName.endswith(":t"):
+            continue
+
+        # Remove whitespace-only text nodes and comment nodes
+        for child in list(element.childNodes):
+            if (
+                child.nodeType == child.TEXT_NODE
+                and child.nodeValue
+                and child.nodeValue.strip() == ""
+            ) or child.nodeType == child.COMMENT_NODE:
+                element.removeChild(child)
+
+    return dom.toxml(encoding="UTF-8")
+
+
+def _is_text_element(elem):
+    # minidom's tagName is the prefixed name, so only prefixed "x:t" elements count
+    return elem.prefix is not None and elem.tag.endswith("}t")
+
+
+def _condense_with_lxml(data):
+    """Fast path. Returns None for the rare inputs it cannot reproduce exactly
+    (comments or processing instructions that survive condensing, nodes outside
+    the root element, CDATA sections, or input lxml is stricter about than
+    minidom) and for input with a DTD, which defusedxml must vet; the caller
+    then falls back to minidom."""
+    if data.startswith((b"\xff\xfe", b"\xfe\xff")) or b"\x00" in data[:4]:
+        return None  # UTF-16/32, which the byte checks below cannot see into
+    if b"<!DOCTYPE" in data or b"<![CDATA[" in data:
+        return None
+    try:
+        root = lxml.etree.fromstring(data, _PARSER)
+    except lxml.etree.XMLSyntaxError:
+        return None
+    if root.getprevious() is not None or root.getnext() is not None:
+        return None
+
+    comments = []
+    for elem in root.iter(lxml.etree.Element):
+        keep_whitespace = _is_text_element(elem)
+        if not keep_whitespace and elem.text is not None and not elem.text.strip():
+            elem.text = None
+        for child in elem:
+            if child.tag is lxml.etree.Comment:
+                if keep_whitespace:
+                    return None
+                comments.append(child)
+            elif child.tag is lxml.etree.PI:
+                return None
+            if not keep_whitespace and child.tail is not None and not child.tail.strip():
+                child.tail = None
+
+    # Drop comments, keeping any (non-whitespace) text that followed them
+    for comment in comments:
+        parent = comment.getparent()
+        if comment.tail:
+            previous = comment.getprevious()
+            if previous is not None:
+                previous.tail = (previous.tail or "") + comment.tail
+            else:
+                parent.text = (parent.text or "") + comment.tail
+        parent.remove(comment)
+
+    body = lxml.etree.tostring(root, encoding="UTF-8", with_tail=False)
+
+    # minidom escapes quotes in text and writes tab/newline/CR raw
+    if b'"' in body:
+        body = _QUOTED_TEXT.sub(lambda m: m.group().replace(b'"', b"&quot;"), body)
+    for charref, raw in _RAW_CHARREFS:
+        if charref in body:
+            body = body.replace(charref, raw)
+
+    return _XML_DECLARATION + body
+
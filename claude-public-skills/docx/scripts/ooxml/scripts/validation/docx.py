@@ -4,13 +4,14 @@ Validator for Word document XML files against XSD schemas.
 
 import random
 import re
-import tempfile
 import zipfile
 
-import defusedxml.minidom
 import lxml.etree
 
 from .base import BaseSchemaValidator
+from .report import CheckError, print_failure
+from .streaming import count_tags
+from .zippackage import as_path
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
@@ -21,65 +22,61 @@ class DOCXSchemaValidator(BaseSchemaValidator):
     W14_NAMESPACE = "http://schemas.microsoft.com/office/word/2010/wordml"
     W16CID_NAMESPACE = "http://schemas.microsoft.com/office/word/2016/wordml/cid"
 
+    # paraId/durableId values are checked from the streaming scan
+    SCAN_TRACKED_ATTRIBUTES = (
+        f"{{{W14_NAMESPACE}}}paraId",
+        f"{{{W16CID_NAMESPACE}}}durableId",
+    )
+
+    # Word-specific auto-repairs, applied in the same pass as the common ones
+    REPAIRS = {
+        **BaseSchemaValidator.REPAIRS,
+        "_repair_durable_id": re.compile(rb"durableId"),
+    }
+
     # Word-specific element to relationship type mappings
     # Start with empty mapping - add specific cases as we discover them
     ELEMENT_RELATIONSHIP_TYPES = {}
 
-    def validate(self):
-        """Run all validation checks and return True if all pass."""
+    # Word checks run by validate(), in order
+    CHECKS = (
         # Test 0: XML well-formedness
-        if not self.validate_xml():
-            return False
-
+        "validate_xml",
         # Test 1: Namespace declarations
-        all_valid = True
-        if not self.validate_namespaces():
-            all_valid = False
-
+        "validate_namespaces",
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
-            all_valid = False
-
+        "validate_unique_ids",
         # Test 3: Relationship and file reference validation
-        if not self.validate_file_references():
-            all_valid = False
-
+        "validate_file_references",
         # Test 4: Content type declarations
-        if not self.validate_content_types():
-            all_valid = False
-
+        "validate_content_types",
         # Test 5: XSD schema validation
-        if not self.validate_against_xsd():
-            all_valid = False
-
+        "validate_against_xsd",
         # Test 6: Whitespace preservation
-        if not self.validate_whitespace_preservation():
-            all_valid = False
-
+        "validate_whitespace_preservation",
         # Test 7: Deletion validation
-        if not self.validate_deletions():
-            all_valid = False
-
+        "validate_deletions",
         # Test 8: Insertion validation
-        if not self.validate_insertions():
-            all_valid = False
-
+        "validate_insertions",
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
-            all_valid = False
-
+        "validate_all_relationship_ids",
         # Test 10: ID constraints (paraId, durableId)
-        if not self.validate_id_constraints():
-            all_valid = False
-
+        "validate_id_constraints",
         # Test 11: Comment marker validation
-        if not self.validate_comment_markers():
-            all_valid = False
+        "validate_comment_markers",
+        # Count and compare paragraphs, tables and sections
+        "compare_paragraph_counts",
+    )
 
-        # Count and compare paragraphs
-        self.compare_paragraph_counts()
+    # Paragraph counts are printed for information only
+    INFORMATIONAL_CHECKS = ("compare_paragraph_counts",)
 
-        return all_valid
+    # (label, element) pairs counted in document.xml by compare_paragraph_counts
+    DOCUMENT_STATISTICS = (
+        ("Paragraphs", f"{{{WORD_2006_NAMESPACE}}}p"),
+        ("Tables", f"{{{WORD_2006_NAMESPACE}}}tbl"),
+        ("Sections", f"{{{WORD_2006_NAMESPACE}}}sectPr"),
+    )
 
     def validate_whitespace_preservation(self):
         """
@@ -93,40 +90,36 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
+                # w:t elements with leading/trailing whitespace and no
+                # xml:space="preserve", collected by the streaming scan
+                for line, text in self._scan(xml_file).unpreserved_whitespace:
+                    # Show a preview of the text
+                    text_preview = (
+                        repr(text)[:50] + "..."
+                        if len(repr(text)) > 50
+                        else repr(text)
+                    )
+                    errors.append(
+                        CheckError(
+                            xml_file.relative_to(self.unpacked_dir),
+                            line,
+                            "unpreserved_whitespace",
+                            f"w:t element with whitespace missing xml:space='preserve': {text_preview}",
+                        )
+                    )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+                    CheckError(
+                        xml_file.relative_to(self.unpacked_dir),
+                        None,
+                        "check_error",
+                        f"Error: {e}",
+                    )
                 )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
-            for error in errors:
-                print(error)
+            print_failure(f"Found {len(errors)} whitespace preservation violations:", errors)
             return False
         else:
             if self.verbose:
@@ -146,36 +139,35 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
+                # Non-empty w:t elements that are descendants of w:del elements
+                for line, text in self._scan(xml_file).text_in_deletions:
+                    # Show a preview of the text
+                    text_preview = (
+                        repr(text)[:50] + "..."
+                        if len(repr(text)) > 50
+                        else repr(text)
+                    )
+                    errors.append(
+                        CheckError(
+                            xml_file.relative_to(self.unpacked_dir),
+                            line,
+                            "text_in_deletion",
+                            f"<w:t> found within <w:del>: {text_preview}",
                         )
+                    )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+                    CheckError(
+                        xml_file.relative_to(self.unpacked_dir),
+                        None,
+                        "check_error",
+                        f"Error: {e}",
+                    )
                 )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} deletion validation violations:")
-            for error in errors:
-                print(error)
+            print_failure(f"Found {len(errors)} deletion validation violations:", errors)
             return False
         else:
             if self.verbose:
@@ -184,7 +176,19 @@ class DOCXSchemaValidator(BaseSchemaValidator):
 
     def count_paragraphs_in_unpacked(self):
         """Count the number of paragraphs in the unpacked document."""
-        count = 0
+        return self.document_statistics_in_unpacked()["Paragraphs"]
+
+    def count_paragraphs_in_original(self):
+        """Count the number of paragraphs in the original docx file."""
+        return self.document_statistics_in_original()["Paragraphs"]
+
+    def document_statistics_in_unpacked(self):
+        """Count paragraphs, tables and sections in the unpacked document.
+
+        The tree shared with the other checks is used if document.xml has
+        already been parsed; otherwise the counts come from the streaming scan.
+        """
+        counts = {tag: 0 for _, tag in self.DOCUMENT_STATISTICS}
 
         for xml_file in self.xml_files:
             # Only check document.xml files
@@ -192,38 +196,34 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+                tree = self._parsed.get(as_path(xml_file))
+                if isinstance(tree, lxml.etree._ElementTree):
+                    counts = dict.fromkeys(counts, 0)
+                    for elem in tree.getroot().iter(*counts):
+                        counts[elem.tag] += 1
+                else:
+                    tag_counts = self._scan(xml_file).tag_counts
+                    counts = {tag: tag_counts.get(tag, 0) for tag in counts}
             except Exception as e:
                 print(f"Error counting paragraphs in unpacked document: {e}")
 
-        return count
+        return {label: counts[tag] for label, tag in self.DOCUMENT_STATISTICS}
 
-    def count_paragraphs_in_original(self):
-        """Count the number of paragraphs in the original docx file."""
-        count = 0
-
-        try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
+    def document_statistics_in_original(self):
+        """Count paragraphs, tables and sections in the original docx file.
 
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
-
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+        word/document.xml is streamed straight from the original archive.
+        """
+        counts = {tag: 0 for _, tag in self.DOCUMENT_STATISTICS}
 
+        try:
+            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
+                with zip_ref.open("word/document.xml") as source:
+                    counts = count_tags(source, counts)
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
 
-        return count
+        return {label: counts[tag] for label, tag in self.DOCUMENT_STATISTICS}
 
     def validate_insertions(self):
         """
@@ -237,34 +237,34 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 continue
 
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]", namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
+                # w:delText in w:ins that are NOT within w:del
+                for line, text in self._scan(xml_file).deltext_in_insertions:
                     text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
+                        repr(text)[:50] + "..."
+                        if len(repr(text)) > 50
+                        else repr(text)
                     )
                     errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
+                        CheckError(
+                            xml_file.relative_to(self.unpacked_dir),
+                            line,
+                            "deltext_in_insertion",
+                            f"<w:delText> within <w:ins>: {text_preview}",
+                        )
                     )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
                 errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+                    CheckError(
+                        xml_file.relative_to(self.unpacked_dir),
+                        None,
+                        "check_error",
+                        f"Error: {e}",
+                    )
                 )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} insertion validation violations:")
-            for error in errors:
-                print(error)
+            print_failure(f"Found {len(errors)} insertion validation violations:", errors)
             return False
         else:
             if self.verbose:
@@ -272,13 +272,15 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             return True
 
     def compare_paragraph_counts(self):
-        """Compare paragraph counts between original and new document."""
-        original_count = self.count_paragraphs_in_original()
-        new_count = self.count_paragraphs_in_unpacked()
+        """Compare paragraph, table and section counts between original and new document."""
+        original = self.document_statistics_in_original()
+        new = self.document_statistics_in_unpacked()
 
-        diff = new_count - original_count
-        diff_str = f"+{diff}" if diff > 0 else str(diff)
-        print(f"\nParagraphs: {original_count} → {new_count} ({diff_str})")
+        print()
+        for label, _ in self.DOCUMENT_STATISTICS:
+            diff = new[label] - original[label]
+            diff_str = f"+{diff}" if diff > 0 else str(diff)
+            print(f"{label}: {original[label]} → {new[label]} ({diff_str})")
 
     def _parse_id_value(self, val: str, base: int = 16) -> int:
         """Parse an ID value as hex (base=16) or decimal (base=10).
@@ -300,52 +302,75 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         - durableId < 0x7FFFFFFF (decimal in numbering.xml, hex elsewhere)
         """
         errors = []
-        para_id_attr = f"{{{self.W14_NAMESPACE}}}paraId"
-        durable_id_attr = f"{{{self.W16CID_NAMESPACE}}}durableId"
 
-        for xml_file in self.xml_files:
-            try:
-                for elem in lxml.etree.parse(str(xml_file)).iter():
-                    # paraId is always hex format
-                    if val := elem.get(para_id_attr):
-                        if self._parse_id_value(val, base=16) >= 0x80000000:
-                            errors.append(
-                                f"  {xml_file.name}:{elem.sourceline}: paraId={val} >= 0x80000000"
+        for file_errors in self._map_parts("_check_id_constraints", self.xml_files):
+            errors.extend(file_errors)
+
+        if errors:
+            print_failure(f"{len(errors)} ID constraint violations:", errors)
+        elif self.verbose:
+            print("PASSED - All paraId/durableId values within constraints")
+        return not errors
+
+    def _check_id_constraints(self, xml_file):
+        """Return paraId/durableId constraint violations for a single XML file."""
+        errors = []
+        part = xml_file.relative_to(self.unpacked_dir)
+        para_id_attr, durable_id_attr = self.SCAN_TRACKED_ATTRIBUTES
+
+        try:
+            for line, attr, val in self._scan(xml_file).tracked_attributes:
+                # paraId is always hex format
+                if attr == para_id_attr:
+                    if self._parse_id_value(val, base=16) >= 0x80000000:
+                        errors.append(
+                            CheckError(
+                                part,
+                                line,
+                                "para_id_out_of_range",
+                                f"paraId={val} >= 0x80000000",
                             )
+                        )
 
-                    if val := elem.get(durable_id_attr):
-                        # durableId in numbering.xml must be decimal.
-                        # Word rejects hex-formatted durableIds in numbering.xml.
-                        if xml_file.name == "numbering.xml":
-                            try:
-                                if self._parse_id_value(val, base=10) >= 0x7FFFFFFF:
-                                    errors.append(
-                                        f"  {xml_file.name}:{elem.sourceline}: "
-                                        f"durableId={val} >= 0x7FFFFFFF"
-                                    )
-                            except ValueError:
-                                # Contains non-decimal characters (e.g., hex letters A-F)
+                elif attr == durable_id_attr:
+                    # durableId in numbering.xml must be decimal.
+                    # Word rejects hex-formatted durableIds in numbering.xml.
+                    if xml_file.name == "numbering.xml":
+                        try:
+                            if self._parse_id_value(val, base=10) >= 0x7FFFFFFF:
                                 errors.append(
-                                    f"  {xml_file.name}:{elem.sourceline}: "
-                                    f"durableId={val} must be decimal in numbering.xml"
+                                    CheckError(
+                                        part,
+                                        line,
+                                        "durable_id_out_of_range",
+                                        f"durableId={val} >= 0x7FFFFFFF",
+                                    )
                                 )
-                        # durableId in other files (e.g. commentsIds.xml) uses hex format
-                        else:
-                            if self._parse_id_value(val, base=16) >= 0x7FFFFFFF:
-                                errors.append(
-                                    f"  {xml_file.name}:{elem.sourceline}: "
-                                    f"durableId={val} >= 0x7FFFFFFF"
+                        except ValueError:
+                            # Contains non-decimal characters (e.g., hex letters A-F)
+                            errors.append(
+                                CheckError(
+                                    part,
+                                    line,
+                                    "durable_id_not_decimal",
+                                    f"durableId={val} must be decimal in numbering.xml",
+                                )
+                            )
+                    # durableId in other files (e.g. commentsIds.xml) uses hex format
+                    else:
+                        if self._parse_id_value(val, base=16) >= 0x7FFFFFFF:
+                            errors.append(
+                                CheckError(
+                                    part,
+                                    line,
+                                    "durable_id_out_of_range",
+                                    f"durableId={val} >= 0x7FFFFFFF",
                                 )
-            except Exception:
-                pass
+                            )
+        except Exception:
+            pass
 
-        if errors:
-            print(f"FAILED - {len(errors)} ID constraint violations:")
-            for e in errors:
-                print(e)
-        elif self.verbose:
-            print("PASSED - All paraId/durableId values within constraints")
-        return not errors
+        return errors
 
     def validate_comment_markers(self):
         """Validate comment markers are properly paired and reference existing comments.
@@ -371,46 +396,42 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - No document.xml found (skipping comment validation)")
             return True
 
+        document_part = document_xml.relative_to(self.unpacked_dir)
         try:
-            doc_root = lxml.etree.parse(str(document_xml)).getroot()
-            namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-            # Collect all comment marker IDs from document.xml
-            range_starts = {
-                elem.get(f"{{{self.WORD_2006_NAMESPACE}}}id")
-                for elem in doc_root.xpath(".//w:commentRangeStart", namespaces=namespaces)
-            }
-            range_ends = {
-                elem.get(f"{{{self.WORD_2006_NAMESPACE}}}id")
-                for elem in doc_root.xpath(".//w:commentRangeEnd", namespaces=namespaces)
-            }
-            references = {
-                elem.get(f"{{{self.WORD_2006_NAMESPACE}}}id")
-                for elem in doc_root.xpath(".//w:commentReference", namespaces=namespaces)
-            }
+            # Comment marker IDs from document.xml, collected by the streaming scan
+            doc_scan = self._scan(document_xml)
+            range_starts = doc_scan.comment_range_starts
+            range_ends = doc_scan.comment_range_ends
+            references = doc_scan.comment_references
 
             # Check for orphaned commentRangeEnd (missing commentRangeStart)
             orphaned_ends = range_ends - range_starts
             for comment_id in sorted(orphaned_ends, key=lambda x: int(x) if x and x.isdigit() else 0):
                 errors.append(
-                    f"  document.xml: commentRangeEnd id=\"{comment_id}\" has no matching commentRangeStart"
+                    CheckError(
+                        document_part,
+                        None,
+                        "unmatched_comment_range_end",
+                        f"commentRangeEnd id=\"{comment_id}\" has no matching commentRangeStart",
+                    )
                 )
 
             # Check for orphaned commentRangeStart (missing commentRangeEnd)
             orphaned_starts = range_starts - range_ends
             for comment_id in sorted(orphaned_starts, key=lambda x: int(x) if x and x.isdigit() else 0):
                 errors.append(
-                    f"  document.xml: commentRangeStart id=\"{comment_id}\" has no matching commentRangeEnd"
+                    CheckError(
+                        document_part,
+                        None,
+                        "unmatched_comment_range_start",
+                        f"commentRangeStart id=\"{comment_id}\" has no matching commentRangeEnd",
+                    )
                 )
 
             # Get comment IDs from comments.xml if it exists
             comment_ids = set()
             if comments_xml and comments_xml.exists():
-                comments_root = lxml.etree.parse(str(comments_xml)).getroot()
-                comment_ids = {
-                    elem.get(f"{{{self.WORD_2006_NAMESPACE}}}id")
-                    for elem in comments_root.xpath(".//w:comment", namespaces=namespaces)
-                }
+                comment_ids = self._scan(comments_xml).comment_ids
 
                 # Check for markers referencing non-existent comments
                 marker_ids = range_starts | range_ends | references
@@ -418,28 +439,27 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 for comment_id in sorted(invalid_refs, key=lambda x: int(x) if x and x.isdigit() else 0):
                     if comment_id:  # Skip None values
                         errors.append(
-                            f"  document.xml: marker id=\"{comment_id}\" references non-existent comment"
+                            CheckError(
+                                document_part,
+                                None,
+                                "missing_comment",
+                                f"marker id=\"{comment_id}\" references non-existent comment",
+                            )
                         )
 
         except (lxml.etree.XMLSyntaxError, Exception) as e:
-            errors.append(f"  Error parsing XML: {e}")
+            errors.append(
+                CheckError(document_part, None, "check_error", f"Error parsing XML: {e}")
+            )
 
         if errors:
-            print(f"FAILED - {len(errors)} comment marker violations:")
-            for error in errors:
-                print(error)
+            print_failure(f"{len(errors)} comment marker violations:", errors)
             return False
         else:
             if self.verbose:
                 print("PASSED - All comment markers properly paired")
             return True
 
-    def repair(self) -> int:
-        """Run DOCX-specific auto-repairs."""
-        repairs = super().repair()
-        repairs += self.repair_durableId()
-        return repairs
-
     def repair_durableId(self) -> int:
         """Fix invalid durableId values.
 
@@ -451,58 +471,45 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         commentsExtended.xml, commentsIds.xml, and comment threading (paraIdParent).
         Changing paraId without updating all references would break comment associations.
         """
-        repairs = 0
-
-        for xml_file in self.xml_files:
-            try:
-                content = xml_file.read_text(encoding="utf-8")
-                dom = defusedxml.minidom.parseString(content)
-                modified = False
+        return self._apply_repairs(["_repair_durable_id"])
 
-                for elem in dom.getElementsByTagName("*"):
-                    if not elem.hasAttribute("w16cid:durableId"):
-                        continue
+    def _repair_durable_id(self, xml_file, elem):
+        """Replace an out-of-range or wrongly formatted durableId on elem.
+        Returns the log line, or None."""
+        durable_id_attr = f"{{{self.W16CID_NAMESPACE}}}durableId"
+        durable_id = elem.get(durable_id_attr)
+        if durable_id is None:
+            return None
 
-                    durable_id = elem.getAttribute("w16cid:durableId")
-                    needs_repair = False
+        needs_repair = False
 
-                    # Check if durableId needs repair based on file type
-                    if xml_file.name == "numbering.xml":
-                        # numbering.xml requires decimal format
-                        try:
-                            needs_repair = self._parse_id_value(durable_id, base=10) >= 0x7FFFFFFF
-                        except ValueError:
-                            # Contains non-decimal characters (e.g., hex letters A-F)
-                            needs_repair = True
-                    else:
-                        # Other files (e.g. commentsIds.xml) use hex format
-                        try:
-                            needs_repair = self._parse_id_value(durable_id, base=16) >= 0x7FFFFFFF
-                        except ValueError:
-                            needs_repair = True
-
-                    if needs_repair:
-                        # Generate new ID in the correct format for this file type
-                        value = random.randint(1, 0x7FFFFFFE)
-                        if xml_file.name == "numbering.xml":
-                            new_id = str(value)  # decimal for numbering.xml
-                        else:
-                            new_id = f"{value:08X}"  # hex for other files
-
-                        elem.setAttribute("w16cid:durableId", new_id)
-                        print(
-                            f"  Repaired: {xml_file.name}: durableId {durable_id} → {new_id}"
-                        )
-                        repairs += 1
-                        modified = True
+        # Check if durableId needs repair based on file type
+        if xml_file.name == "numbering.xml":
+            # numbering.xml requires decimal format
+            try:
+                needs_repair = self._parse_id_value(durable_id, base=10) >= 0x7FFFFFFF
+            except ValueError:
+                # Contains non-decimal characters (e.g., hex letters A-F)
+                needs_repair = True
+        else:
+            # Other files (e.g. commentsIds.xml) use hex format
+            try:
+                needs_repair = self._parse_id_value(durable_id, base=16) >= 0x7FFFFFFF
+            except ValueError:
+                needs_repair = True
 
-                if modified:
-                    xml_file.write_bytes(dom.toxml(encoding="UTF-8"))
+        if not needs_repair:
+            return None
 
-            except Exception:
-                pass
+        # Generate new ID in the correct format for this file type
+        value = random.randint(1, 0x7FFFFFFE)
+        if xml_file.name == "numbering.xml":
+            new_id = str(value)  # decimal for numbering.xml
+        else:
+            new_id = f"{value:08X}"  # hex for other files
 
-        return repairs
+        elem.set(durable_id_attr, new_id)
+        return f"  Repaired: {xml_file.name}: durableId {durable_id} → {new_id}"
 
 
 if __name__ == "__main__":
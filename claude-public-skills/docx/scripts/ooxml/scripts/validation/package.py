@@ -0,0 +1,222 @@
+"""
+Index of an unpacked package: its parts, content types and relationship graph.
+"""
+
+import os
+import posixpath
+import lxml.etree
+
+from .zippackage import PackagePath, as_path, xml_source
+
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+ROOT_RELS_PART = "_rels/.rels"
+
+
+class Relationship:
+    """One <Relationship> of a .rels part."""
+
+    __slots__ = ("id", "type", "target", "external", "part", "line")
+
+    def __init__(self, id, type, target, external, part, line):
+        self.id = id  # Id attribute (may be None)
+        self.type = type  # Full relationship type URI ("" if missing)
+        self.target = target  # Target attribute as written (may be None)
+        self.external = external  # True for URLs and TargetMode="External"
+        self.part = part  # Normalized target part name, None if external/absent
+        self.line = line  # Source line of the element in the .rels part
+
+
+def rels_part_for(part):
+    """Return the .rels part holding the relationships of part ("" = package)."""
+    directory, name = posixpath.split(part)
+    return posixpath.join(directory, "_rels", f"{name}.rels")
+
+
+def source_part_for(rels_part):
+    """Return the part whose relationships rels_part holds ("" = package)."""
+    rels_dir, name = posixpath.split(rels_part)
+    return posixpath.join(posixpath.dirname(rels_dir), name[: -len(".rels")])
+
+
+class PackageIndex:
+    """Everything the package-level checks ask about an unpacked document.
+
+    The directory is walked once; part names are package-relative POSIX paths
+    ("word/document.xml"). Relationship parts and [Content_Types].xml are
+    parsed on first use through the validator's parse function, so they share
+    its tree cache, and root tags are read from the first start event of a
+    part instead of a full parse.
+    """
+
+    def __init__(self, root, parse):
+        """
+        Args:
+            root: Unpacked package directory
+            parse: Callable(Path) -> lxml ElementTree used for .rels and content types
+        """
+        self.root = as_path(root)
+        self._parse = parse
+
+        # part name -> Path for every file, in directory walk order
+        self.files = {}
+        if isinstance(self.root, PackagePath):
+            walk = self.root.walk()
+        else:
+            walk = os.walk(self.root)
+        for directory, dirnames, filenames in walk:
+            dirnames.sort()
+            directory = as_path(directory)
+            relative = directory.relative_to(self.root).as_posix()
+            prefix = "" if relative == "." else relative + "/"
+            for filename in sorted(filenames):
+                self.files[prefix + filename] = directory / filename
+
+        self.rels_parts = [part for part in self.files if part.endswith(".rels")]
+
+        self._relationships = {}  # rels part -> [Relationship] or exception
+        self._content_types = None
+        self._root_tags = {}
+
+    def part_name(self, path):
+        """Return the part name of a file inside the package directory."""
+        return as_path(path).relative_to(self.root).as_posix()
+
+    def parts_in(self, directory, suffix=""):
+        """Return part names directly inside directory that end with suffix."""
+        return [
+            part
+            for part in self.files
+            if posixpath.dirname(part) == directory and part.endswith(suffix)
+        ]
+
+    def relationships(self, rels_part):
+        """Return the relationships declared in rels_part, in document order.
+
+        Raises whatever parsing the part raised.
+        """
+        if rels_part not in self._relationships:
+            try:
+                self._relationships[rels_part] = self._read_relationships(rels_part)
+            except Exception as e:
+                self._relationships[rels_part] = e
+
+        relationships = self._relationships[rels_part]
+        if isinstance(relationships, Exception):
+            raise relationships
+        return relationships
+
+    def _read_relationships(self, rels_part):
+        root = self._parse(self.files[rels_part]).getroot()
+        base_dir = posixpath.dirname(source_part_for(rels_part))
+
+        relationships = []
+        for rel in root.findall(f".//{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"):
+            target = rel.get("Target")
+            external = bool(target) and (
+                rel.get("TargetMode") == "External"
+                or target.startswith(("http", "mailto:"))
+            )
+
+            part = None
+            if target and not external:
+                # Absolute targets are relative to the package root, relative
+                # targets to the directory of the source part
+                if target.startswith("/"):
+                    part = posixpath.normpath(target.lstrip("/"))
+                else:
+                    part = posixpath.normpath(posixpath.join(base_dir, target))
+
+            relationships.append(
+                Relationship(
+                    rel.get("Id"),
+                    rel.get("Type", ""),
+                    target,
+                    external,
+                    part,
+                    rel.sourceline,
+                )
+            )
+        return relationships
+
+    def relationships_from(self, part):
+        """Return the relationships of part ("" = package), [] if it has none."""
+        rels_part = rels_part_for(part)
+        if rels_part not in self.files:
+            return []
+        return self.relationships(rels_part)
+
+    def reachable_parts(self):
+        """Return the set of parts reachable through relationships.
+
+        The walk starts at the package relationships (_rels/.rels). Packages
+        without them fall back to treating every relationship part as a root.
+        Relationship parts that cannot be parsed are skipped.
+        """
+        if ROOT_RELS_PART in self.files:
+            pending = [""]
+        else:
+            pending = [source_part_for(rels_part) for rels_part in self.rels_parts]
+
+        reached = set()
+        while pending:
+            source = pending.pop()
+            try:
+                relationships = self.relationships_from(source)
+            except Exception:
+                continue
+            for rel in relationships:
+                if rel.part in self.files and rel.part not in reached:
+                    reached.add(rel.part)
+                    pending.append(rel.part)
+        return reached
+
+    def content_types(self):
+        """Return (defaults, overrides) from [Content_Types].xml.
+
+        defaults maps lower-case extensions and overrides maps part names
+        (without the leading "/") to content types. Raises if the part is
+        missing or cannot be parsed.
+        """
+        if self._content_types is None:
+            try:
+                root = self._parse(self.files[CONTENT_TYPES_PART]).getroot()
+                defaults = {}
+                for default in root.findall(f".//{{{CONTENT_TYPES_NAMESPACE}}}Default"):
+                    extension = default.get("Extension")
+                    if extension is not None:
+                        defaults[extension.lower()] = default.get("ContentType")
+                overrides = {}
+                for override in root.findall(f".//{{{CONTENT_TYPES_NAMESPACE}}}Override"):
+                    part_name = override.get("PartName")
+                    if part_name is not None:
+                        overrides[part_name.lstrip("/")] = override.get("ContentType")
+                self._content_types = (defaults, overrides)
+            except Exception as e:
+                self._content_types = e
+
+        if isinstance(self._content_types, Exception):
+            raise self._content_types
+        return self._content_types
+
+    def root_tag(self, part):
+        """Return the Clark-notation root tag of an XML part.
+
+        Only the first start event is read, so the cost does not depend on the
+        size of the part. Raises lxml.etree.XMLSyntaxError if the part does not
+        start with a well-formed element.
+        """
+        if part not in self._root_tags:
+            context = lxml.etree.iterparse(
+                xml_source(self.files[part]),
+                events=("start",),
+                resolve_entities=False,
+                no_network=True,
+            )
+            _, elem = next(context)
+            self._root_tags[part] = elem.tag
+        return self._root_tags[part]
@@ -0,0 +1,410 @@
+"""
+Streaming pack of an unpacked directory into an Office file.
+"""
+
+import contextlib
+import os
+import shutil
+import struct
+import sys
+import time
+import zipfile
+import zlib
+from pathlib import Path
+
+from .condense import condense_xml_bytes
+from .parallel import PhaseTimer, map_by_size
+
+# Parts condensed before they are zipped
+XML_SUFFIXES = (".xml", ".rels")
+
+# Already-compressed payloads: deflating them again costs CPU and saves nothing
+STORED_EXTENSIONS = (
+    # Images
+    {".jpg", ".jpeg", ".jpe", ".png", ".gif", ".webp", ".wdp", ".jxr", ".hdp"}
+    # Audio and video
+    | {".mp3", ".m4a", ".aac", ".wma", ".ogg", ".mp4", ".m4v", ".mov", ".avi"}
+    | {".wmv", ".webm", ".mpg", ".mpeg"}
+    # Compressed fonts
+    | {".woff", ".woff2"}
+    # Archives and embedded Office files
+    | {".zip", ".gz", ".7z", ".docx", ".docm", ".xlsx", ".xlsm", ".pptx", ".pptm"}
+)
+
+# Deflate level zlib uses by default
+DEFAULT_LEVEL = 6
+
+# Largest file read into memory to be deflated at the chosen level; bigger
+# ones (embedded objects, metafiles, scans) are streamed at DEFAULT_LEVEL
+MAX_BUFFERED_SIZE = 32 << 20
+
+# Timestamp of every member of a reproducible archive, the earliest zip allows
+REPRODUCIBLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Part written first in a reproducible archive, as Office applications do
+CONTENT_TYPES_PART = "[Content_Types].xml"
+
+# General purpose flag bits of a zip entry
+_FLAG_ENCRYPTED = 0x01
+_FLAG_DATA_DESCRIPTOR = 0x08  # CRC and sizes follow the data, not in the header
+
+_CHUNK_SIZE = 1 << 20
+
+# zipfile has no API to write a compressed stream as-is; _copy_member() uses
+# these ZipFile internals and is only used where they all exist. Elsewhere
+# unchanged members are compressed again
+_RAW_COPY_ATTRIBUTES = (
+    "fp",
+    "start_dir",
+    "filelist",
+    "NameToInfo",
+    "_writecheck",
+    "_didModify",
+)
+
+
+class CompressionPolicy:
+    """How pack_directory() compresses, stamps and orders archive members.
+
+    Members whose extension is in stored_extensions are stored, everything
+    else is deflated at level: 1 is fastest (edit loops), 9 smallest (final
+    export). Files over MAX_BUFFERED_SIZE are deflated at DEFAULT_LEVEL, as
+    they are streamed rather than read into memory. With reproducible, every
+    member gets the same timestamp and attributes and members are written in
+    name order, [Content_Types].xml first, so the same directory always packs
+    to the same bytes (given the same zlib). Members copied from an original
+    archive keep the compression they have there.
+    """
+
+    def __init__(
+        self, level=DEFAULT_LEVEL, stored_extensions=STORED_EXTENSIONS, reproducible=False
+    ):
+        if not 0 <= level <= 9:
+            raise ValueError(f"Deflate level must be 0-9, not {level}")
+        self.level = level
+        self.stored_extensions = frozenset(ext.lower() for ext in stored_extensions)
+        self.reproducible = reproducible
+
+    def compress_type(self, name):
+        if os.path.splitext(name)[1].lower() in self.stored_extensions:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    def order(self, files, input_dir):
+        """files in the order their members are written."""
+        if not self.reproducible:
+            return files
+
+        def key(path):
+            name = path.relative_to(input_dir).as_posix()
+            return name != CONTENT_TYPES_PART, name
+
+        return sorted(files, key=key)
+
+    def zip_info(self, path, arcname):
+        """ZipInfo for the member arcname holding the file at path."""
+        if self.reproducible:
+            zinfo = zipfile.ZipInfo(str(arcname), REPRODUCIBLE_DATE_TIME)
+            zinfo.create_system = 0
+            zinfo.external_attr = 0
+            zinfo.file_size = path.stat().st_size
+        else:
+            zinfo = zipfile.ZipInfo.from_file(path, arcname)
+        zinfo.compress_type = self.compress_type(zinfo.filename)
+        return zinfo
+
+
+class PackStats:
+    """Members pack_directory() wrote, by how they got into the archive."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        # (member name, compressed bytes) copied as-is from the original archive
+        self.copied = []
+        # (member name, file bytes, compressed bytes, compress type, seconds)
+        # compressed anew
+        self.compressed = []
+
+    def _written(self, compress_type):
+        members = [entry for entry in self.compressed if entry[3] == compress_type]
+        return {
+            "members": len(members),
+            "file_bytes": sum(entry[1] for entry in members),
+            "compressed_bytes": sum(entry[2] for entry in members),
+            "seconds": round(sum(entry[4] for entry in members), 6),
+        }
+
+    def compression(self):
+        """Size and time of the stored and of the deflated members."""
+        return {
+            "level": self.policy.level,
+            "reproducible": self.policy.reproducible,
+            "stored": self._written(zipfile.ZIP_STORED),
+            "deflated": self._written(zipfile.ZIP_DEFLATED),
+        }
+
+    def compression_summary(self):
+        """One line with what deflating saved and what it cost."""
+        compression = self.compression()
+        deflated = compression["deflated"]
+        stored = compression["stored"]
+        ratio = (
+            deflated["compressed_bytes"] / deflated["file_bytes"]
+            if deflated["file_bytes"]
+            else 1.0
+        )
+        line = (
+            f"Compression: deflated {deflated['members']} member(s) at level "
+            f"{compression['level']}, {deflated['file_bytes']:,} -> "
+            f"{deflated['compressed_bytes']:,} bytes ({ratio:.1%}) in "
+            f"{deflated['seconds']:.2f}s; stored {stored['members']} member(s), "
+            f"{stored['file_bytes']:,} bytes in {stored['seconds']:.2f}s"
+        )
+        if self.copied:
+            line += f"; copied {len(self.copied)} member(s)"
+        return line
+
+    def to_dict(self):
+        return {
+            "copied": {
+                "members": len(self.copied),
+                "compressed_bytes": sum(size for _, size in self.copied),
+                "names": [name for name, _ in self.copied],
+            },
+            "recompressed": {
+                "members": len(self.compressed),
+                "file_bytes": sum(entry[1] for entry in self.compressed),
+                "compressed_bytes": sum(entry[2] for entry in self.compressed),
+                "names": [entry[0] for entry in self.compressed],
+            },
+            "compression": self.compression(),
+        }
+
+    def summary(self, verbose=False):
+        """Copied vs recompressed counts and bytes, one line.
+
+        With verbose, the recompressed members follow, one per line; after
+        unpack and pack every XML part differs from the original's bytes, so
+        this lists them all. to_dict() always has the names.
+        """
+        stats = self.to_dict()
+        copied = stats["copied"]
+        recompressed = stats["recompressed"]
+        lines = [
+            f"Reused {copied['members']} unchanged member(s) from the original "
+            f"({copied['compressed_bytes']:,} compressed bytes copied), "
+            f"recompressed {recompressed['members']} member(s) "
+            f"({recompressed['file_bytes']:,} -> "
+            f"{recompressed['compressed_bytes']:,} bytes)"
+        ]
+        if verbose and self.copied:
+            lines.extend(f"  recompressed {name}" for name in recompressed["names"])
+        return "\n".join(lines)
+
+
+def _condense_part(path):
+    """Condensed bytes of one part, or the exception condensing it raised."""
+    try:
+        return condense_xml_bytes(path.read_bytes())
+    except Exception as e:
+        return e
+
+
+def _file_crc(path):
+    crc = 0
+    with path.open("rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _unchanged(original, path, data):
+    """True if the part (data, or the file at path) matches the original member.
+
+    Matches are decided by size and CRC-32, as stored in the original's
+    central directory; the file is only read when the sizes agree.
+    """
+    if original is None or original.flag_bits & _FLAG_ENCRYPTED:
+        return False
+    if data is not None:
+        return len(data) == original.file_size and zlib.crc32(data) == original.CRC
+    return (
+        path.stat().st_size == original.file_size and _file_crc(path) == original.CRC
+    )
+
+
+def _can_copy_raw(zf):
+    """True if _copy_member() can write into zf on this Python."""
+    return hasattr(zipfile.ZipInfo, "FileHeader") and all(
+        hasattr(zf, name) for name in _RAW_COPY_ATTRIBUTES
+    )
+
+
+def _copy_member(zf, source, original, zinfo):
+    """Write original (a member of the open archive file source) into zf as zinfo.
+
+    The compressed stream is copied as-is, without decompressing it, and the
+    member keeps its compression method, CRC and sizes. zipfile has no API
+    for this, so the header is written the way ZipFile.mkdir() writes one;
+    callers check _can_copy_raw() first.
+    """
+    source.seek(original.header_offset)
+    header = struct.unpack(
+        zipfile.structFileHeader, source.read(zipfile.sizeFileHeader)
+    )
+    if header[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local file header for {original.filename}")
+    # Skip the name and extra field; their lengths are fields 10 and 11
+    source.seek(header[10] + header[11], os.SEEK_CUR)
+
+    zinfo.compress_type = original.compress_type
+    # Sizes go in the header, so no data descriptor follows the data
+    zinfo.flag_bits = original.flag_bits & ~_FLAG_DATA_DESCRIPTOR
+    zinfo.CRC = original.CRC
+    zinfo.compress_size = original.compress_size
+    zinfo.file_size = original.file_size
+
+    zf.fp.seek(zf.start_dir)
+    zinfo.header_offset = zf.fp.tell()
+    zf._writecheck(zinfo)
+    zf._didModify = True
+    zf.filelist.append(zinfo)
+    zf.NameToInfo[zinfo.filename] = zinfo
+    zf.fp.write(zinfo.FileHeader(None))
+
+    remaining = original.compress_size
+    while remaining:
+        chunk = source.read(min(remaining, _CHUNK_SIZE))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated data for {original.filename}")
+        zf.fp.write(chunk)
+        remaining -= len(chunk)
+    zf.start_dir = zf.fp.tell()
+
+
+def pack_directory(
+    input_dir, output_file, jobs=1, timer=None, original_file=None, policy=None
+):
+    """Zip input_dir into output_file, condensing XML parts on the way.
+
+    The directory is walked once and never modified: XML parts are condensed
+    in memory (see condense_xml_bytes), on jobs worker processes when jobs > 1,
+    and written straight into the archive. Other files that are stored
+    (media) are streamed into it from disk. The rest are read whole, so the
+    deflate level can be passed to writestr(), up to MAX_BUFFERED_SIZE each;
+    larger ones are streamed too, which keeps memory bounded but deflates
+    them at DEFAULT_LEVEL whatever the policy. Members are written in
+    directory walk order whatever the number of jobs. The archive is built
+    next to output_file and only moved into place once complete, so a
+    failure never leaves a partial file behind.
+
+    With original_file (incremental repack), every part whose condensed
+    content matches the original's member of the same name, by size and
+    CRC-32, is copied over as its compressed stream instead of being
+    compressed again. Untouched media, fonts and embedded objects then cost
+    a read and a copy. On a Python whose zipfile lacks the internals this
+    needs, those members are compressed again instead.
+
+    How the other members are compressed, and in which order and with which
+    timestamps they are written, is up to policy (a CompressionPolicy).
+
+    Args:
+        input_dir: Unpacked Office document directory
+        output_file: Office file to write (.docx/.pptx/.xlsx)
+        jobs: Worker processes for condensing (0 = one per CPU)
+        timer: PhaseTimer the "condense" and "write" phases are added to
+        original_file: Optional original Office file to reuse members from
+        policy: CompressionPolicy (default: CompressionPolicy())
+
+    Returns:
+        PackStats: Members copied from the original and members compressed
+
+    Raises:
+        Exception: Whatever condensing the first part that is not well-formed
+            raised
+    """
+    input_dir = Path(input_dir)
+    output_file = Path(output_file)
+    timer = timer if timer is not None else PhaseTimer(jobs)
+    policy = policy if policy is not None else CompressionPolicy()
+    stats = PackStats(policy)
+
+    with timer.phase("condense"):
+        files = policy.order(
+            [path for path in input_dir.rglob("*") if path.is_file()], input_dir
+        )
+        xml_files = [path for path in files if path.name.endswith(XML_SUFFIXES)]
+        condensed = dict(
+            zip(
+                xml_files,
+                map_by_size(
+                    _condense_part,
+                    xml_files,
+                    [path.stat().st_size for path in xml_files],
+                    jobs,
+                ),
+            )
+        )
+        for path, data in condensed.items():
+            if isinstance(data, Exception):
+                print(f"ERROR: Failed to parse {path.name}: {data}", file=sys.stderr)
+                raise data
+
+    with timer.phase("write"):
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+        with contextlib.ExitStack() as stack:
+            originals = {}
+            if original_file is not None:
+                original_zip = stack.enter_context(zipfile.ZipFile(original_file))
+                originals = {info.filename: info for info in original_zip.infolist()}
+                source = stack.enter_context(open(original_file, "rb"))
+            try:
+                with zipfile.ZipFile(temp_file, "w", zipfile.ZIP_DEFLATED) as zf:
+                    if not _can_copy_raw(zf):
+                        originals = {}
+                    for path in files:
+                        arcname = path.relative_to(input_dir)
+                        data = condensed.pop(path, None)
+                        zinfo = policy.zip_info(path, arcname)
+                        original = originals.get(zinfo.filename)
+                        if _unchanged(original, path, data):
+                            _copy_member(zf, source, original, zinfo)
+                            stats.copied.append((zinfo.filename, zinfo.compress_size))
+                            continue
+
+                        start = time.perf_counter()
+                        if data is None and (
+                            zinfo.compress_type == zipfile.ZIP_STORED
+                            or zinfo.file_size > MAX_BUFFERED_SIZE
+                        ):
+                            # Streamed from disk; ZipFile.open() takes no level
+                            # and zlib deflates at its default
+                            large = zinfo.file_size > zipfile.ZIP64_LIMIT
+                            with (
+                                path.open("rb") as src,
+                                zf.open(zinfo, "w", force_zip64=large) as dest,
+                            ):
+                                shutil.copyfileobj(src, dest, _CHUNK_SIZE)
+                        else:
+                            # Only writestr() and write() take a level for a
+                            # member; ZipFile.open() reads it off the ZipInfo
+                            if data is None:
+                                data = path.read_bytes()
+                            zf.writestr(zinfo, data, compresslevel=policy.level)
+                        stats.compressed.append(
+                            (
+                                zinfo.filename,
+                                zinfo.file_size,
+                                zinfo.compress_size,
+                                zinfo.compress_type,
+                                time.perf_counter() - start,
+                            )
+                        )
+                os.replace(temp_file, output_file)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    temp_file.unlink()
+                raise
+
+    return stats
@@ -0,0 +1,69 @@
+"""
+Registry of compiled XSD schemas shared across validators.
+"""
+
+import time
+from pathlib import Path
+
+import lxml.etree
+
+
+class SchemaRegistry:
+    """Compile each XSD schema once per process and hand out the compiled object.
+
+    Schemas are keyed by their resolved path, so every validator (and every
+    repair/validate phase) that asks for e.g. wml.xsd gets the same
+    lxml.etree.XMLSchema instead of re-parsing the schema and all of its imports.
+    """
+
+    def __init__(self):
+        self._schemas = {}  # resolved path -> XMLSchema or the exception raised compiling it
+        self.compiled = 0
+        self.compile_time = 0.0
+        self.hits = 0
+
+    def get(self, schema_path):
+        """Return the compiled schema for schema_path, compiling it on first use.
+
+        Raises whatever lxml raised while compiling; the failure is remembered so a
+        broken schema is not recompiled for every part.
+        """
+        key = Path(schema_path).resolve()
+
+        if key in self._schemas:
+            self.hits += 1
+            schema = self._schemas[key]
+        else:
+            start = time.perf_counter()
+            try:
+                with open(key, "rb") as xsd_file:
+                    parser = lxml.etree.XMLParser()
+                    xsd_doc = lxml.etree.parse(xsd_file, parser=parser, base_url=str(key))
+                    schema = lxml.etree.XMLSchema(xsd_doc)
+            except Exception as e:
+                schema = e
+            self.compile_time += time.perf_counter() - start
+            self.compiled += 1
+            self._schemas[key] = schema
+
+        if isinstance(schema, Exception):
+            raise schema
+        return schema
+
+    def clear(self):
+        """Drop all compiled schemas and reset the statistics."""
+        self._schemas.clear()
+        self.compiled = 0
+        self.compile_time = 0.0
+        self.hits = 0
+
+    def summary(self):
+        """One-line description of compile time and cache hits."""
+        return (
+            f"Schema cache: {self.compiled} schema(s) compiled in "
+            f"{self.compile_time:.2f}s, {self.hits} hit(s)"
+        )
+
+
+# Process-wide registry used by validators unless one is passed explicitly
+SCHEMA_REGISTRY = SchemaRegistry()
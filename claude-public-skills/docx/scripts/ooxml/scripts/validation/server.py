@@ -0,0 +1,158 @@
+"""
+Local validation server on a Unix socket.
+
+A server process keeps compiled schemas and original-file baselines warm, so
+repeated validate.py/pack.py calls on the same host skip the heavy imports and
+schema compilation. See client.py for the protocol.
+"""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socketserver
+import sys
+import traceback
+from pathlib import Path
+
+from .baseline import BaselineRegistry
+from .client import PROTOCOL_VERSION, connect, default_socket_path
+from .report import ValidationReport
+from .runner import validate_for_pack, validate_path
+
+
+def _handle_validate(request, baselines):
+    report = ValidationReport(echo=False) if request.get("report") else None
+    success = validate_path(
+        request["path"],
+        request["original"],
+        verbose=request.get("verbose", False),
+        auto_repair=request.get("auto_repair", False),
+        jobs=request.get("jobs", 1),
+        cache=request.get("cache", True),
+        report=report,
+        baseline_registry=baselines,
+        xsd_large_parts=request.get("xsd_large_parts", False),
+        fail_fast=request.get("fail_fast", False),
+        time_budget=request.get("time_budget"),
+        only=request.get("only"),
+    )
+    return {
+        "exit_code": 0 if success else 1,
+        "report": report.to_dict() if report is not None else None,
+    }
+
+
+def _handle_pack_validation(request, baselines):
+    report = ValidationReport(echo=False) if request.get("report") else None
+    success, output = validate_for_pack(
+        Path(request["path"]),
+        Path(request["original"]),
+        cache=request.get("cache", True),
+        report=report,
+        baseline_registry=baselines,
+        verbose=request.get("verbose", False),
+    )
+    return {
+        "exit_code": 0 if success else 1,
+        "success": success,
+        "output": output,
+        "report": report.to_dict() if report is not None else None,
+    }
+
+
+# Request "command" -> handler(request, baseline_registry) -> response fields
+COMMANDS = {
+    "validate": _handle_validate,
+    "pack-validation": _handle_pack_validation,
+}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        if request.get("version") != PROTOCOL_VERSION:
+            response = {"error": f"unsupported protocol version {request.get('version')}"}
+        elif request.get("command") not in COMMANDS:
+            response = {"error": f"unknown command {request.get('command')!r}"}
+        else:
+            handler = COMMANDS[request["command"]]
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    response = handler(request, self.server.baselines)
+                except Exception:
+                    # What an uncaught exception would do to the CLI process
+                    traceback.print_exc()
+                    response = {"exit_code": 1}
+            self.server.requests += 1
+
+        response["stdout"] = stdout.getvalue()
+        response["stderr"] = stderr.getvalue()
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class ValidationServer(socketserver.UnixStreamServer):
+    """Serves validation requests one at a time from a Unix socket.
+
+    Requests run sequentially in the server process, so process-wide state
+    (the schema registry, redirected stdout) is never shared between two
+    requests at once.
+    """
+
+    def __init__(self, socket_path=None):
+        self.socket_path = Path(socket_path or default_socket_path())
+        self.baselines = BaselineRegistry()
+        self.requests = 0
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        if self.socket_path.exists():
+            sock = connect(self.socket_path)
+            if sock is not None:
+                sock.close()
+                raise RuntimeError(f"A server is already listening on {self.socket_path}")
+            self.socket_path.unlink()  # Left behind by a server that died
+
+        super().__init__(str(self.socket_path), _RequestHandler)
+        os.chmod(self.socket_path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        with contextlib.suppress(OSError):
+            self.socket_path.unlink()
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(socket_path=None):
+    """Run a ValidationServer until interrupted (SIGINT or SIGTERM).
+
+    Returns False if it could not start because another server is running.
+    """
+    try:
+        server = ValidationServer(socket_path)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return False
+
+    signal.signal(signal.SIGTERM, _interrupt)
+    print(f"Validation server listening on {server.socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(
+            f"Validation server stopped after {server.requests} request(s)",
+            file=sys.stderr,
+        )
+    return True
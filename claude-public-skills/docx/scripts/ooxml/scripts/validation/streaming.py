@@ -0,0 +1,269 @@
+"""
+Single streaming pass that gathers what the element-level checks need.
+"""
+
+import re
+
+import lxml.etree
+
+MC_NAMESPACE = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+OFFICE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+
+_ALTERNATE_CONTENT = f"{{{MC_NAMESPACE}}}AlternateContent"
+_R_ID = f"{{{OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+_W_ID = f"{{{WORD_2006_NAMESPACE}}}id"
+_W_T = f"{{{WORD_2006_NAMESPACE}}}t"
+_W_DEL = f"{{{WORD_2006_NAMESPACE}}}del"
+_W_INS = f"{{{WORD_2006_NAMESPACE}}}ins"
+_W_DELTEXT = f"{{{WORD_2006_NAMESPACE}}}delText"
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+# Comment marker elements in document.xml -> PartScan attribute collecting their IDs
+_COMMENT_MARKERS = {
+    f"{{{WORD_2006_NAMESPACE}}}commentRangeStart": "comment_range_starts",
+    f"{{{WORD_2006_NAMESPACE}}}commentRangeEnd": "comment_range_ends",
+    f"{{{WORD_2006_NAMESPACE}}}commentReference": "comment_references",
+    f"{{{WORD_2006_NAMESPACE}}}comment": "comment_ids",
+}
+
+_LEADING_WHITESPACE = re.compile(r"^\s.*")
+_TRAILING_WHITESPACE = re.compile(r".*\s$")
+
+
+class PartScan:
+    """Facts about one XML part, gathered in a single pass.
+
+    Line numbers are source lines of the element's start tag, as reported by
+    lxml's sourceline, so checks built on a scan print the same messages as
+    checks walking a full tree.
+    """
+
+    def __init__(self):
+        # Root element tag, namespace declarations and attributes
+        self.root_tag = None
+        self.root_nsmap = {}
+        self.root_attrib = {}
+
+        # Number of elements per tag (Clark notation)
+        self.tag_counts = {}
+
+        # ID uniqueness (outside mc:AlternateContent and excluded containers):
+        # ("file", line, tag, attr_name, id_value, first_line) for duplicates
+        # within the part, ("global", id_value, line, tag) for globally scoped IDs
+        self.id_findings = []
+
+        # (line, element local name, rid) for every r:id attribute
+        self.relationship_refs = []
+
+        # (line, attribute, value) for attributes requested via tracked_attributes
+        self.tracked_attributes = []
+
+        # Word tracked-change and whitespace rules: (line, text)
+        self.unpreserved_whitespace = []  # w:t with edge whitespace, no xml:space
+        self.text_in_deletions = []  # non-empty w:t inside w:del
+        self.deltext_in_insertions = []  # w:delText inside w:ins but not w:del
+
+        # Word comment IDs
+        self.comment_range_starts = set()
+        self.comment_range_ends = set()
+        self.comment_references = set()
+        self.comment_ids = set()
+
+
+def _local_lower(name):
+    return name.split("}")[-1].lower() if "}" in name else name.lower()
+
+
+def scan_part(
+    source,
+    unique_id_requirements,
+    excluded_id_containers,
+    tracked_attributes=(),
+):
+    """Walk an XML part once with iterparse and return a PartScan.
+
+    Ancestor context (mc:AlternateContent, excluded ID containers, w:del and
+    w:ins nesting) is tracked with counters instead of iterancestors(), and
+    every element is cleared once it has been processed, so memory stays
+    bounded no matter how large the part is.
+
+    Args:
+        source: Path or file-like object with the XML
+        unique_id_requirements: {local tag: (attribute, scope)} as in
+            BaseSchemaValidator.UNIQUE_ID_REQUIREMENTS
+        excluded_id_containers: Local tag names whose descendants are skipped
+            by the ID uniqueness rule
+        tracked_attributes: Clark-notation attribute names to record
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the part is not well-formed
+    """
+    scan = PartScan()
+    file_ids = {}  # (tag, attribute) -> {id value: first line}
+    tracked_attributes = tuple(tracked_attributes)
+
+    # Per-tag facts, computed once per distinct tag:
+    # tag -> (local lower name, ID rule or None, excluded container?, comment marker)
+    tag_info = {}
+    tag_counts = scan.tag_counts
+
+    alternate_content_depth = 0
+    excluded_depth = 0
+    del_depth = 0
+    ins_depth = 0
+    excluded_stack = []  # Whether each open element is an excluded container
+
+    # huge_tree lifts libxml2's safety limits on very large text nodes/depth
+    context = lxml.etree.iterparse(
+        str(source) if not hasattr(source, "read") else source,
+        events=("start", "end"),
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=True,
+    )
+
+    for event, elem in context:
+        tag = elem.tag
+
+        if event == "start":
+            info = tag_info.get(tag)
+            if info is None:
+                local = _local_lower(tag)
+                info = tag_info[tag] = (
+                    local,
+                    unique_id_requirements.get(local),
+                    local in excluded_id_containers,
+                    _COMMENT_MARKERS.get(tag),
+                )
+            local, id_rule, is_excluded, marker = info
+            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+
+            if not excluded_stack:
+                scan.root_tag = tag
+                scan.root_nsmap = dict(elem.nsmap)
+                scan.root_attrib = dict(elem.attrib)
+
+            # ID uniqueness, ignoring anything inside mc:AlternateContent
+            if id_rule and not alternate_content_depth and not excluded_depth:
+                attr_name, scope = id_rule
+                id_value = None
+                for attr, value in elem.attrib.items():
+                    if _local_lower(attr) == attr_name:
+                        id_value = value
+                        break
+
+                if id_value is not None:
+                    if scope == "global":
+                        scan.id_findings.append(
+                            ("global", id_value, elem.sourceline, local)
+                        )
+                    elif scope == "file":
+                        seen = file_ids.setdefault((local, attr_name), {})
+                        if id_value in seen:
+                            scan.id_findings.append((
+                                "file",
+                                elem.sourceline,
+                                local,
+                                attr_name,
+                                id_value,
+                                seen[id_value],
+                            ))
+                        else:
+                            seen[id_value] = elem.sourceline
+
+            rid = elem.get(_R_ID)
+            if rid:
+                scan.relationship_refs.append(
+                    (elem.sourceline, tag.split("}")[-1] if "}" in tag else tag, rid)
+                )
+
+            for attr in tracked_attributes:
+                value = elem.get(attr)
+                if value:
+                    scan.tracked_attributes.append((elem.sourceline, attr, value))
+
+            if marker:
+                getattr(scan, marker).add(elem.get(_W_ID))
+
+            # Open this element's ancestor context for its descendants
+            excluded_stack.append(is_excluded)
+            if is_excluded:
+                excluded_depth += 1
+            if tag == _ALTERNATE_CONTENT:
+                alternate_content_depth += 1
+            elif tag == _W_DEL:
+                del_depth += 1
+            elif tag == _W_INS:
+                ins_depth += 1
+
+        else:
+            # Close this element's ancestor context
+            if excluded_stack.pop():
+                excluded_depth -= 1
+            if tag == _ALTERNATE_CONTENT:
+                alternate_content_depth -= 1
+            elif tag == _W_DEL:
+                del_depth -= 1
+            elif tag == _W_INS:
+                ins_depth -= 1
+
+            # Text is only complete at the end event
+            if tag == _W_T:
+                text = elem.text
+                if text:
+                    if (
+                        _LEADING_WHITESPACE.match(text)
+                        or _TRAILING_WHITESPACE.match(text)
+                    ) and elem.get(_XML_SPACE) != "preserve":
+                        scan.unpreserved_whitespace.append((elem.sourceline, text))
+                    if del_depth:
+                        scan.text_in_deletions.append((elem.sourceline, text))
+            elif tag == _W_DELTEXT and ins_depth and not del_depth:
+                scan.deltext_in_insertions.append((elem.sourceline, elem.text or ""))
+
+            # Free the processed subtree and any earlier siblings
+            elem.clear(keep_tail=True)
+            if excluded_stack:
+                parent = elem.getparent()
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+    return scan
+
+
+def count_tags(source, tags):
+    """Count the elements with the given tags in an XML part.
+
+    Only the counted elements are reported by iterparse; each is cleared
+    when counted, with its earlier siblings, so memory stays bounded.
+
+    Args:
+        source: Path or file-like object with the XML
+        tags: Clark-notation tags to count
+
+    Returns:
+        dict: tag -> number of elements, for every tag in tags
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the part is not well-formed
+    """
+    counts = dict.fromkeys(tags, 0)
+    context = lxml.etree.iterparse(
+        str(source) if not hasattr(source, "read") else source,
+        events=("end",),
+        tag=tuple(counts),
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=True,
+    )
+    for _, elem in context:
+        counts[elem.tag] += 1
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+    return counts
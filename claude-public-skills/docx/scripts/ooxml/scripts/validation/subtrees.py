@@ -0,0 +1,346 @@
+"""
+Canonical Merkle hashes of XML subtrees, to find the regions an edit changed.
+"""
+
+import hashlib
+import zlib
+import zipfile
+
+import lxml.etree
+
+from .package import PackageIndex
+from .textdiff import diff_sequences
+from .zippackage import as_path, xml_source
+
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+DRAWINGML_NAMESPACE = "http://schemas.openxmlformats.org/drawingml/2006/main"
+PRESENTATIONML_NAMESPACE = "http://schemas.openxmlformats.org/presentationml/2006/main"
+SPREADSHEETML_NAMESPACE = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+# Elements whose subtrees are compared as a unit; the root of every part is
+# one too. Nested ones (a paragraph in a table cell) are compared on their own,
+# so a change is reported at the innermost of them that contains it
+REGION_TAGS = {
+    f"{{{WORD_2006_NAMESPACE}}}{name}"
+    for name in ("p", "tbl", "tr", "tc", "sdt", "sectPr", "comment", "footnote", "endnote")
+} | {
+    f"{{{PRESENTATIONML_NAMESPACE}}}{name}"
+    for name in ("sp", "pic", "graphicFrame", "grpSp", "cxnSp", "cSld", "notes")
+} | {
+    f"{{{DRAWINGML_NAMESPACE}}}{name}" for name in ("p", "tbl", "tr", "tc")
+} | {
+    f"{{{SPREADSHEETML_NAMESPACE}}}{name}" for name in ("row", "si", "comment")
+} | {
+    f"{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship",
+    f"{{{CONTENT_TYPES_NAMESPACE}}}Default",
+    f"{{{CONTENT_TYPES_NAMESPACE}}}Override",
+}
+
+# Elements whose text is hashed as is; everywhere else runs of whitespace in
+# text count as one space and leading/trailing whitespace is ignored, so
+# pretty-printing does not change a hash
+TEXT_TAGS = {
+    f"{{{WORD_2006_NAMESPACE}}}t",
+    f"{{{WORD_2006_NAMESPACE}}}delText",
+    f"{{{WORD_2006_NAMESPACE}}}instrText",
+    f"{{{WORD_2006_NAMESPACE}}}delInstrText",
+    f"{{{DRAWINGML_NAMESPACE}}}t",
+    f"{{{SPREADSHEETML_NAMESPACE}}}t",
+}
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _normalize(text):
+    return " ".join(text.split()) if text else ""
+
+
+def _add_tail(children, tail):
+    """Add the text after a child element, unless it is only whitespace."""
+    tail = _normalize(tail)
+    if tail:
+        children.append(b"\x02" + tail.encode("utf-8") + b"\x00")
+
+
+class Region:
+    """Hashes of one region element of a part.
+
+    shallow covers the element with its nested regions left out; digest also
+    covers the nested regions, in order, and the elements between this region
+    and the one containing it. Two regions with equal digests have equal
+    canonical content.
+    """
+
+    __slots__ = ("tag", "name", "line", "path", "shallow", "digest", "children")
+
+    def __init__(self, tag, name, line, path):
+        self.tag = tag  # Clark notation, namespace prefixes do not matter
+        self.name = name  # Prefixed name for messages ("w:p")
+        self.line = line  # Source line of the start tag
+        self.path = path  # Tags of the elements between it and its containing region
+        self.shallow = None
+        self.digest = None
+        self.children = []  # Nested regions, in document order
+
+
+class SubtreeChange:
+    """One changed, added or removed region (or whole part) of a package."""
+
+    __slots__ = ("part", "kind", "name", "original_line", "line")
+
+    def __init__(self, part, kind, name=None, original_line=None, line=None):
+        self.part = part  # Part name ("word/document.xml")
+        self.kind = kind  # "changed", "added" or "removed"
+        self.name = name  # Region element ("w:p"), None for a whole non-XML part
+        self.original_line = original_line  # Start line in the original, if any
+        self.line = line  # Start line in the edited part, if any
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __str__(self):
+        what = f"{self.kind} {self.name}" if self.name else self.kind
+        if self.original_line is not None:
+            what += f" (original line {self.original_line})"
+        if self.line is not None:
+            return f"{self.part}: Line {self.line}: {what}"
+        return f"{self.part}: {what}"
+
+
+def hash_regions(source):
+    """Hash the region subtrees of one XML part in a single streaming pass.
+
+    Tags and attribute names are compared in Clark notation, so the prefixes
+    and namespace declarations a part uses do not matter; attributes are
+    compared in sorted order, and comments and processing instructions are
+    ignored. Elements are freed as soon as they are hashed, so memory only
+    grows with the number of regions.
+
+    Args:
+        source: Path or binary file-like object with the XML
+
+    Returns:
+        Region: The part's root element, with its nested regions
+    """
+    context = lxml.etree.iterparse(
+        str(source) if not hasattr(source, "read") else source,
+        events=("start", "end"),
+        remove_comments=True,
+        remove_pis=True,
+        resolve_entities=False,
+        no_network=True,
+        huge_tree=True,
+    )
+
+    # (digests and tails of the children, innermost region, True if the
+    # element is that region, tag) per open element
+    stack = []
+    root = None
+
+    for event, elem in context:
+        tag = elem.tag
+
+        if event == "start":
+            if not stack or tag in REGION_TAGS:
+                local = tag.rsplit("}", 1)[-1]
+                name = f"{elem.prefix}:{local}" if elem.prefix else local
+                path = []
+                for frame in reversed(stack):
+                    if frame[2]:
+                        break
+                    path.append(frame[3])
+                region = Region(tag, name, elem.sourceline, "\x00".join(path))
+                if stack:
+                    stack[-1][1].children.append(region)
+                else:
+                    root = region
+                stack.append(([], region, True, tag))
+            else:
+                stack.append(([], stack[-1][1], False, tag))
+            continue
+
+        children, region, is_region, _ = stack.pop()
+
+        # The tail of the last child is only complete now
+        for child in elem:
+            _add_tail(children, child.tail)
+
+        head = tag
+        attributes = elem.items()
+        if attributes:
+            attributes.sort()
+            head += "".join(f"\x00{name}\x00{value}" for name, value in attributes)
+        text = elem.text
+        if text and tag not in TEXT_TAGS:
+            text = _normalize(text)
+        digest = _digest(f"{head}\x01{text or ''}\x01".encode("utf-8") + b"".join(children))
+
+        if is_region:
+            # Nested regions are left out of the hash of the elements around
+            # them, so adding or removing one does not change those
+            region.shallow = digest
+            region.digest = _digest(
+                region.path.encode("utf-8")
+                + b"\x00"
+                + digest
+                + b"".join(nested.digest for nested in region.children)
+            )
+
+        # Free the element; its tail is hashed when the next sibling or the
+        # parent ends, once it is complete
+        elem.clear(keep_tail=True)
+        if stack:
+            parent_children = stack[-1][0]
+            previous = elem.getprevious()
+            if previous is not None:
+                _add_tail(parent_children, previous.tail)
+                parent = elem.getparent()
+                while elem.getprevious() is not None:
+                    del parent[0]
+            if not is_region:
+                parent_children.append(digest)
+
+    return root
+
+
+def diff_regions(original, modified, part=""):
+    """Return the minimal SubtreeChanges turning one hashed part into the other.
+
+    Equal subtrees are skipped by digest. Where two matching regions differ
+    only inside nested regions, the nested regions are aligned (by digest) and
+    compared in turn, so only the innermost changed regions are reported.
+
+    Args:
+        original: Region returned by hash_regions() for the original part
+        modified: Region returned by hash_regions() for the edited part
+        part: Part name used in the changes
+    """
+    changes = []
+    _compare(original, modified, part, changes)
+    return changes
+
+
+def _compare(original, modified, part, changes):
+    if original.digest == modified.digest:
+        return
+    if original.tag != modified.tag or original.shallow != modified.shallow:
+        changes.append(
+            SubtreeChange(part, "changed", modified.name, original.line, modified.line)
+        )
+        return
+
+    a = [region.digest for region in original.children]
+    b = [region.digest for region in modified.children]
+    i = j = 0
+    removed = []
+    added = []
+    for op, items in diff_sequences(a, b, len(a) + len(b)) + [("=", [])]:
+        if op == "-":
+            removed.extend(original.children[i : i + len(items)])
+            i += len(items)
+        elif op == "+":
+            added.extend(modified.children[j : j + len(items)])
+            j += len(items)
+        else:
+            _compare_unmatched(removed, added, part, changes)
+            removed = []
+            added = []
+            i += len(items)
+            j += len(items)
+
+
+def _compare_unmatched(removed, added, part, changes):
+    """Report one change region: the regions between two runs of equal ones.
+
+    Each removed region is paired with the next added one with the same tag
+    (preferring one whose own content is unchanged) and compared in detail;
+    the rest were removed or added as a whole.
+    """
+    j = 0
+    for region in removed:
+        candidates = [k for k in range(j, len(added)) if added[k].tag == region.tag]
+        if not candidates:
+            changes.append(SubtreeChange(part, "removed", region.name, region.line))
+            continue
+        best = next(
+            (k for k in candidates if added[k].shallow == region.shallow), candidates[0]
+        )
+        for k in range(j, best):
+            changes.append(SubtreeChange(part, "added", added[k].name, line=added[k].line))
+        _compare(region, added[best], part, changes)
+        j = best + 1
+    for region in added[j:]:
+        changes.append(SubtreeChange(part, "added", region.name, line=region.line))
+
+
+def _crc32(path):
+    crc = 0
+    with path.open("rb") as f:
+        while chunk := f.read(1 << 20):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def package_changes(path, original_file):
+    """Compare an edited package with its original, part by part.
+
+    Parts whose bytes match the original member (by size and the CRC-32 in
+    the original's central directory) are skipped without parsing. Changed
+    XML parts are hashed on both sides and diffed with diff_regions(); other
+    parts, and XML that cannot be parsed, are reported as a whole.
+
+    Args:
+        path: Unpacked directory, or a ZipPackage root for a packed file
+        original_file: Path to the original .docx/.pptx/.xlsx
+
+    Returns:
+        list[SubtreeChange], ordered by part name
+    """
+    files = PackageIndex(as_path(path), None).files
+    changes = []
+    with zipfile.ZipFile(original_file, "r") as original_zip:
+        originals = {
+            info.filename: info for info in original_zip.infolist() if not info.is_dir()
+        }
+        for part in sorted(set(files) | set(originals)):
+            if part not in files:
+                changes.append(SubtreeChange(part, "removed"))
+                continue
+            if part not in originals:
+                changes.append(SubtreeChange(part, "added"))
+                continue
+
+            info = originals[part]
+            modified_file = files[part]
+            if (
+                modified_file.stat().st_size == info.file_size
+                and _crc32(modified_file) == info.CRC
+            ):
+                continue
+            if not part.endswith((".xml", ".rels")):
+                changes.append(SubtreeChange(part, "changed"))
+                continue
+
+            try:
+                with original_zip.open(info) as original_source:
+                    original = hash_regions(original_source)
+                modified = hash_regions(xml_source(modified_file))
+            except lxml.etree.XMLSyntaxError:
+                changes.append(SubtreeChange(part, "changed"))
+                continue
+            changes.extend(diff_regions(original, modified, part))
+    return changes
+
+
+def format_changes(changes):
+    """One line per change, then a one-line summary."""
+    lines = [str(change) for change in changes]
+    parts = len({change.part for change in changes})
+    lines.append(f"{len(changes)} changed subtree(s) in {parts} part(s)")
+    return "\n".join(lines)
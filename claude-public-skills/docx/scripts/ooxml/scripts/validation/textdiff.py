@@ -0,0 +1,275 @@
+"""
+In-process paragraph/character diff with git word-diff style output.
+
+Changed text is shown inline as [-removed-]{+added+}, one output line per
+changed paragraph; unchanged paragraphs are not shown (like git's -U0).
+"""
+
+import re
+
+# Work budget (roughly (n + m) * edit distance) for one diff before falling
+# back to coarser tokens: characters -> words -> the whole paragraph
+_WORK_LIMIT = 2_000_000
+
+# How many added paragraphs a removed one is compared with when pairing edits
+_PAIRING_WINDOW = 32
+
+# Words compared when no paragraph shares a prefix or suffix with another
+_WORD = re.compile(r"\w+")
+
+_WORDS = re.compile(r"\w+|\s+|[^\w\s]")
+
+
+def _middle_snake(a, a0, a1, b, b0, b1, max_d):
+    """Find the middle snake of the shortest edit script (Myers, linear space).
+
+    Returns (d, x, y, u, v): the edit distance d and a snake from (x, y) to
+    (u, v), relative to (a0, b0). Returns None if d would exceed max_d.
+    """
+    n = a1 - a0
+    m = b1 - b0
+    delta = n - m
+    odd = delta & 1
+    half = (n + m + 1) // 2
+    # d counts the steps of each search, so the edit distance is 2d - 1 or 2d
+    limit = min(half, (max_d + 1) // 2)
+
+    size = 2 * limit + 3
+    vf = [0] * size  # furthest forward x per diagonal k = x - y
+    vb = [0] * size  # furthest backward x' per diagonal of the reversed problem
+    offset = limit + 1
+
+    for d in range(limit + 1):
+        # Forward search from (0, 0)
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vf[offset + k - 1] < vf[offset + k + 1]):
+                x = vf[offset + k + 1]
+            else:
+                x = vf[offset + k - 1] + 1
+            y = x - k
+            x_start, y_start = x, y
+            while x < n and y < m and a[a0 + x] == b[b0 + y]:
+                x += 1
+                y += 1
+            vf[offset + k] = x
+
+            k_reverse = delta - k
+            if odd and -(d - 1) <= k_reverse <= d - 1:
+                if x + vb[offset + k_reverse] >= n:
+                    if 2 * d - 1 > max_d:
+                        return None
+                    return 2 * d - 1, x_start, y_start, x, y
+
+        # Backward search from (n, m), as a forward search on the reversed inputs
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vb[offset + k - 1] < vb[offset + k + 1]):
+                x = vb[offset + k + 1]
+            else:
+                x = vb[offset + k - 1] + 1
+            y = x - k
+            x_start, y_start = x, y
+            while x < n and y < m and a[a1 - 1 - x] == b[b1 - 1 - y]:
+                x += 1
+                y += 1
+            vb[offset + k] = x
+
+            k_forward = delta - k
+            if not odd and -d <= k_forward <= d:
+                if vf[offset + k_forward] + x >= n:
+                    if 2 * d > max_d:
+                        return None
+                    return 2 * d, n - x, m - y, n - x_start, m - y_start
+
+    return None
+
+
+def _diff(a, a0, a1, b, b0, b1, ops, max_d):
+    """Append ("=", "-", "+", items) operations turning a[a0:a1] into b[b0:b1].
+
+    Returns False if the edit distance exceeds max_d.
+    """
+    # Common prefix and suffix never need the snake search
+    start = a0
+    while a0 < a1 and b0 < b1 and a[a0] == b[b0]:
+        a0 += 1
+        b0 += 1
+    if a0 > start:
+        ops.append(("=", a[start:a0]))
+
+    suffix = 0
+    while a1 - suffix > a0 and b1 - suffix > b0 and a[a1 - 1 - suffix] == b[b1 - 1 - suffix]:
+        suffix += 1
+    a1 -= suffix
+    b1 -= suffix
+
+    if a0 == a1 or b0 == b1:
+        if (a1 - a0) + (b1 - b0) > max_d:
+            return False
+        if b0 < b1:
+            ops.append(("+", b[b0:b1]))
+        if a0 < a1:
+            ops.append(("-", a[a0:a1]))
+    else:
+        snake = _middle_snake(a, a0, a1, b, b0, b1, max_d)
+        if snake is None:
+            return False
+        d, x, y, u, v = snake
+        if not _diff(a, a0, a0 + x, b, b0, b0 + y, ops, max_d):
+            return False
+        if u > x:
+            ops.append(("=", a[a0 + x : a0 + u]))
+        if not _diff(a, a0 + u, a1, b, b0 + v, b1, ops, max_d):
+            return False
+
+    if suffix:
+        ops.append(("=", a[a1 : a1 + suffix]))
+    return True
+
+
+def diff_sequences(a, b, max_d):
+    """Return the operations turning sequence a into sequence b.
+
+    Operations are ("=", items), ("-", items) and ("+", items) with items
+    slices of a or b. Returns None if more than max_d edits are needed.
+    """
+    ops = []
+    if not _diff(a, 0, len(a), b, 0, len(b), ops, max_d):
+        return None
+    return ops
+
+
+def _inline_diff(original, modified):
+    """Render one changed paragraph as text with [-...-]{+...+} markers."""
+    for tokens in (list, _WORDS.findall):
+        a = tokens(original)
+        b = tokens(modified)
+        ops = diff_sequences(a, b, max(1, _WORK_LIMIT // (len(a) + len(b) + 1)))
+        if ops is not None:
+            break
+    else:
+        ops = [("-", [original]), ("+", [modified])]
+
+    parts = []
+    removed = []
+    added = []
+    for op, items in ops + [("=", [])]:
+        if op == "-":
+            removed.append("".join(items))
+        elif op == "+":
+            added.append("".join(items))
+        else:
+            # Flush the pending change, removed text first like git
+            if removed:
+                parts.append(f"[-{''.join(removed)}-]")
+            if added:
+                parts.append(f"{{+{''.join(added)}+}}")
+            removed = []
+            added = []
+            parts.append("".join(items))
+    return "".join(parts)
+
+
+def _similarity(a, b):
+    """Length of the common prefix plus common suffix of two strings."""
+    limit = min(len(a), len(b))
+    prefix = 0
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+    return prefix + suffix
+
+
+def _shared_words(a, b):
+    """Number of distinct words two strings have in common, ignoring case."""
+    return len(set(_WORD.findall(a.lower())) & set(_WORD.findall(b.lower())))
+
+
+def _pair_paragraphs(removed, added):
+    """Yield (original, modified) pairs for one change region, in order.
+
+    Each removed paragraph is paired with the most similar of the next few
+    added ones (by common prefix and suffix, then by shared words), so an
+    edited paragraph next to an inserted or deleted one is still shown as an
+    inline edit. Where nothing is similar but as many paragraphs remain on
+    both sides, they are paired in order, as replacements. Unpaired
+    paragraphs come with None on the other side.
+    """
+    j = 0
+    for i, original in enumerate(removed):
+        best = None
+        best_score = (0, 0)
+        for k in range(j, min(j + _PAIRING_WINDOW, len(added))):
+            score = (_similarity(original, added[k]), _shared_words(original, added[k]))
+            if score > best_score:
+                best, best_score = k, score
+        if best is None and j < len(added) and len(removed) - i == len(added) - j:
+            best = j
+        if best is None:
+            yield original, None
+            continue
+        for k in range(j, best):
+            yield None, added[k]
+        yield original, added[best]
+        j = best + 1
+    for k in range(j, len(added)):
+        yield None, added[k]
+
+
+def diff_paragraphs(original, modified, max_chars=20_000):
+    """Diff two lists of paragraph texts.
+
+    Paragraphs are first aligned as whole units, so unchanged paragraphs cost
+    one comparison and are skipped. Paired changed paragraphs get a
+    character-level diff (word-level or whole-paragraph if that is too
+    expensive); unpaired ones are shown as wholly removed or added.
+
+    Args:
+        original: Paragraph texts of the original document
+        modified: Paragraph texts of the modified document
+        max_chars: Approximate cap on the size of the returned text
+
+    Returns:
+        str: One line per changed paragraph, "" if the lists are equal
+    """
+    ops = diff_sequences(original, modified, len(original) + len(modified))
+
+    # Group into change regions: the removed and added paragraphs between
+    # two runs of unchanged ones
+    regions = []
+    removed = []
+    added = []
+    for op, items in ops + [("=", [])]:
+        if op == "-":
+            removed.extend(items)
+        elif op == "+":
+            added.extend(items)
+        elif removed or added:
+            regions.append((removed, added))
+            removed = []
+            added = []
+
+    lines = []
+    size = 0
+    changed = sum(max(len(old), len(new)) for old, new in regions)
+    shown = 0
+    for old, new in regions:
+        for original_text, modified_text in _pair_paragraphs(old, new):
+            if original_text is None:
+                line = f"{{+{modified_text}+}}"
+            elif modified_text is None:
+                line = f"[-{original_text}-]"
+            else:
+                line = _inline_diff(original_text, modified_text)
+
+            if lines and size + len(line) > max_chars:
+                lines.append(
+                    f"... diff truncated ({changed - shown} more changed paragraph(s))"
+                )
+                return "\n".join(lines)
+            lines.append(line)
+            size += len(line) + 1
+            shown += 1
+
+    return "\n".join(lines)
@@ -0,0 +1,422 @@
+"""
+Validator for Excel workbook XML files against XSD schemas.
+"""
+
+import re
+
+import lxml.etree
+
+from .base import BaseSchemaValidator
+from .report import CheckError, print_failure
+from .zippackage import xml_source
+
+# Sheet1! or 'Quoted ''sheet'' name'! prefixes of cell references in formulas,
+# at the start of the formula or after an operator or separator
+_SHEET_REFERENCE = re.compile(
+    r"(?<![^\s(,;=+\-*/&^<>{}])"
+    r"(?:'(?P<quoted>(?:[^']|'')+)'|(?P<plain>[^\s'!\"(),;=+\-*/&^<>{}\[\]]+))!"
+)
+_STRING_LITERAL = re.compile(r'"(?:[^"]|"")*"')
+
+
+class XLSXSchemaValidator(BaseSchemaValidator):
+    """Validator for Excel workbook XML files against XSD schemas.
+
+    Worksheet parts can be several hundred MB, so the cell-level checks stream
+    them with iterparse and free every row once it has been checked; memory
+    does not grow with the size of a sheet.
+    """
+
+    # Excel workbook namespace
+    SPREADSHEETML_NAMESPACE = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+    # Excel-specific element to relationship type mappings
+    ELEMENT_RELATIONSHIP_TYPES = {
+        "sheet": "sheet",  # worksheet, chartsheet or dialogsheet
+        "drawing": "drawing",
+        "legacydrawing": "vmldrawing",
+        "legacydrawinghf": "vmldrawing",
+        "tablepart": "table",
+        "pivotcache": "pivotcachedefinition",
+        "externalreference": "externallink",
+        "hyperlink": "hyperlink",
+        "picture": "image",
+    }
+
+    # Folders below xl/ whose parts are SpreadsheetML validated with sml.xsd
+    SPREADSHEETML_FOLDERS = {
+        "worksheets",
+        "chartsheets",
+        "dialogsheets",
+        "tables",
+        "pivotTables",
+        "pivotCache",
+        "externalLinks",
+    }
+
+    # Sheet parts this large are only checked against sml.xsd on request: a
+    # full tree of them would not fit the memory the streaming checks use
+    XSD_SIZE_LIMIT = BaseSchemaValidator.LARGE_PART_BYTES
+
+    # Cell-level errors listed per worksheet before the rest are only counted
+    MAX_CELL_ERRORS_PER_PART = 20
+
+    # Excel checks run by validate(), in order
+    CHECKS = (
+        # Test 0: XML well-formedness
+        "validate_xml",
+        # Test 1: Namespace declarations
+        "validate_namespaces",
+        # Test 2: Unique IDs (including sheetId in workbook.xml)
+        "validate_unique_ids",
+        # Test 3: Relationship and file reference validation
+        "validate_file_references",
+        # Test 4: Content type declarations
+        "validate_content_types",
+        # Test 5: XSD schema validation
+        "validate_against_xsd",
+        # Test 6: Relationship ID reference validation
+        "validate_all_relationship_ids",
+        # Test 7: Unique sheet names
+        "validate_sheet_names",
+        # Test 8: Defined name targets
+        "validate_defined_names",
+        # Test 9: Shared string and style indexes used by cells
+        "validate_cell_indexes",
+    )
+
+    def _get_schema_path(self, xml_file):
+        schema_path = super()._get_schema_path(xml_file)
+        if schema_path is None and xml_file.parent.name in self.SPREADSHEETML_FOLDERS:
+            if xml_file.parent.parent.name == "xl":
+                return self.schemas_dir / self.SCHEMA_MAPPINGS["xl"]
+        return schema_path
+
+    def _workbook_part(self):
+        """Return the part name of the workbook (the package's main part)."""
+        package = self._package_index()
+        try:
+            for rel in package.relationships_from(""):
+                if rel.type.endswith("/officeDocument") and rel.part in package.files:
+                    return rel.part
+        except Exception:
+            pass
+        return "xl/workbook.xml"
+
+    def _workbook_targets(self, type_suffix):
+        """Return the parts the workbook relates to with a type ending in type_suffix."""
+        package = self._package_index()
+        return [
+            rel.part
+            for rel in package.relationships_from(self._workbook_part())
+            if rel.type.endswith(type_suffix) and rel.part in package.files
+        ]
+
+    def _sheets(self):
+        """Return [(name, line)] of the <sheet> elements of the workbook, in order."""
+        package = self._package_index()
+        root = self._parse(package.files[self._workbook_part()]).getroot()
+        return [
+            (sheet.get("name", ""), sheet.sourceline)
+            for sheet in root.iterfind(
+                f"{{{self.SPREADSHEETML_NAMESPACE}}}sheets/"
+                f"{{{self.SPREADSHEETML_NAMESPACE}}}sheet"
+            )
+        ]
+
+    def validate_sheet_names(self):
+        """Validate that sheet names in the workbook are unique (ignoring case)."""
+        errors = []
+        workbook = self._workbook_part()
+
+        try:
+            first_lines = {}
+            for name, line in self._sheets():
+                key = name.casefold()
+                if key in first_lines:
+                    errors.append(
+                        CheckError(
+                            workbook,
+                            line,
+                            "duplicate_sheet_name",
+                            f"Duplicate sheet name '{name}' "
+                            f"(first occurrence at line {first_lines[key]})",
+                        )
+                    )
+                else:
+                    first_lines[key] = line
+        except Exception as e:
+            errors.append(CheckError(workbook, None, "check_error", f"Error: {e}"))
+
+        if errors:
+            print_failure(f"Found {len(errors)} sheet name errors:", errors)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All sheet names are unique")
+            return True
+
+    def validate_defined_names(self):
+        """Validate that defined names point at sheets that exist in the workbook."""
+        errors = []
+        package = self._package_index()
+        workbook = self._workbook_part()
+
+        try:
+            sheets = self._sheets()
+            sheet_names = {name.casefold() for name, _ in sheets}
+            sheet_count = len(sheets)
+            root = self._parse(package.files[workbook]).getroot()
+
+            for defined_name in root.iterfind(
+                f"{{{self.SPREADSHEETML_NAMESPACE}}}definedNames/"
+                f"{{{self.SPREADSHEETML_NAMESPACE}}}definedName"
+            ):
+                name = defined_name.get("name", "")
+                line = defined_name.sourceline
+
+                local_sheet_id = defined_name.get("localSheetId")
+                if local_sheet_id is not None and not (
+                    local_sheet_id.isdigit() and int(local_sheet_id) < sheet_count
+                ):
+                    errors.append(
+                        CheckError(
+                            workbook,
+                            line,
+                            "invalid_local_sheet_id",
+                            f"definedName '{name}' has localSheetId='{local_sheet_id}' "
+                            f"but the workbook has {sheet_count} sheet(s)",
+                        )
+                    )
+
+                for sheet in self._referenced_sheets(defined_name.text or ""):
+                    if sheet.casefold() not in sheet_names:
+                        errors.append(
+                            CheckError(
+                                workbook,
+                                line,
+                                "missing_sheet",
+                                f"definedName '{name}' refers to missing sheet '{sheet}'",
+                            )
+                        )
+        except Exception as e:
+            errors.append(CheckError(workbook, None, "check_error", f"Error: {e}"))
+
+        if errors:
+            print_failure(f"Found {len(errors)} defined name errors:", errors)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All defined names refer to existing sheets")
+            return True
+
+    def _referenced_sheets(self, formula):
+        """Yield the names of workbook sheets a defined name's formula refers to.
+
+        References to other workbooks ([1]Sheet1!A1) and error values such as
+        #REF! are not sheet names and are skipped.
+        """
+        formula = _STRING_LITERAL.sub('""', formula)
+        for match in _SHEET_REFERENCE.finditer(formula):
+            if match["quoted"] is not None:
+                reference = match["quoted"].replace("''", "'")
+            else:
+                reference = match["plain"]
+            if reference.startswith(("[", "#")):
+                continue
+            # A 3-D reference (Sheet1:Sheet3!A1) names both end sheets
+            yield from reference.split(":")
+
+    def validate_cell_indexes(self):
+        """Validate that cells, rows and columns only use shared strings and
+        cell formats that exist."""
+        errors = []
+        error_count = 0
+
+        try:
+            worksheets = self._workbook_targets("/worksheet")
+        except Exception as e:
+            print_failure(
+                None,
+                [
+                    CheckError(
+                        None,
+                        None,
+                        "check_error",
+                        f"Could not read the workbook relationships: {e}",
+                    )
+                ],
+            )
+            return False
+
+        package = self._package_index()
+        for file_errors, file_error_count in self._map_parts(
+            "_check_cell_indexes", [package.files[part] for part in worksheets]
+        ):
+            errors.extend(file_errors)
+            error_count += file_error_count
+
+        if errors:
+            print_failure(f"Found {error_count} cell index errors:", errors)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All shared string and style indexes are in range")
+            return True
+
+    def _index_bounds(self):
+        """Return (shared strings part, entry count, styles part, cellXfs count).
+
+        A part is None when the workbook has none; the style count is None when
+        the styles part has no cellXfs. Computed once per validator.
+        """
+        if not hasattr(self, "_bounds"):
+            package = self._package_index()
+
+            shared_strings = next(iter(self._workbook_targets("/sharedStrings")), None)
+            string_count = None
+            if shared_strings is not None:
+                string_count = self._count_shared_strings(package.files[shared_strings])
+
+            styles = next(iter(self._workbook_targets("/styles")), None)
+            style_count = None
+            if styles is not None:
+                cell_xfs = self._parse(package.files[styles]).getroot().find(
+                    f"{{{self.SPREADSHEETML_NAMESPACE}}}cellXfs"
+                )
+                if cell_xfs is not None:
+                    style_count = len(
+                        cell_xfs.findall(f"{{{self.SPREADSHEETML_NAMESPACE}}}xf")
+                    )
+
+            self._bounds = (shared_strings, string_count, styles, style_count)
+        return self._bounds
+
+    def _count_shared_strings(self, xml_file):
+        """Count the <si> entries of the shared string table with constant memory."""
+        self.bytes_parsed += xml_file.stat().st_size
+        count = 0
+        for _, elem in lxml.etree.iterparse(
+            xml_source(xml_file),
+            events=("end",),
+            tag=f"{{{self.SPREADSHEETML_NAMESPACE}}}si",
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+        ):
+            count += 1
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            while elem.getprevious() is not None:
+                del parent[0]
+        return count
+
+    def _check_cell_indexes(self, xml_file):
+        """Return (errors, error count) for one worksheet's shared string and
+        style indexes. Only the first MAX_CELL_ERRORS_PER_PART errors are
+        listed, followed by a line counting the rest.
+
+        The sheet is streamed: only <row> and <col> end events are handled,
+        and each row is cleared and dropped once its cells have been checked,
+        so at most two rows are in memory at a time.
+        """
+        errors = []
+        relative_path = xml_file.relative_to(self.unpacked_dir)
+        error_count = 0
+
+        def add(line, code, message):
+            nonlocal error_count
+            error_count += 1
+            if error_count <= self.MAX_CELL_ERRORS_PER_PART:
+                errors.append(CheckError(relative_path, line, code, message))
+
+        def check_style(line, what, style):
+            if style is None or style_count is None:
+                return
+            if not style.isdigit():
+                add(line, "invalid_style_index", f"{what} has invalid style index '{style}'")
+            elif int(style) >= style_count:
+                add(
+                    line,
+                    "style_out_of_range",
+                    f"{what} uses style {style} but {styles} defines "
+                    f"{style_count} cell format(s)",
+                )
+
+        ns = self.SPREADSHEETML_NAMESPACE
+        cell_tag, row_tag, col_tag = f"{{{ns}}}c", f"{{{ns}}}row", f"{{{ns}}}col"
+        value_tag = f"{{{ns}}}v"
+
+        try:
+            shared_strings, string_count, styles, style_count = self._index_bounds()
+            self.bytes_parsed += xml_file.stat().st_size
+
+            for _, elem in lxml.etree.iterparse(
+                xml_source(xml_file),
+                events=("end",),
+                tag=(row_tag, col_tag),
+                resolve_entities=False,
+                no_network=True,
+                huge_tree=True,
+            ):
+                if elem.tag == col_tag:
+                    columns = f"Columns {elem.get('min')}-{elem.get('max')}"
+                    check_style(elem.sourceline, columns, elem.get("style"))
+                    continue
+
+                if elem.get("customFormat") in ("1", "true"):
+                    check_style(elem.sourceline, f"Row {elem.get('r')}", elem.get("s"))
+
+                for cell in elem.iterchildren(cell_tag):
+                    reference = cell.get("r") or "?"
+                    style = cell.get("s")
+                    if style is not None:
+                        check_style(cell.sourceline, f"Cell {reference}", style)
+
+                    if cell.get("t") == "s":
+                        value = (cell.findtext(value_tag) or "").strip()
+                        if shared_strings is None:
+                            add(
+                                cell.sourceline,
+                                "missing_shared_strings",
+                                f"Cell {reference} is a shared string but the "
+                                "workbook has no shared strings part",
+                            )
+                        elif not value.isdigit():
+                            add(
+                                cell.sourceline,
+                                "invalid_shared_string_index",
+                                f"Cell {reference} has invalid shared string "
+                                f"index '{value}'",
+                            )
+                        elif int(value) >= string_count:
+                            add(
+                                cell.sourceline,
+                                "shared_string_out_of_range",
+                                f"Cell {reference} references shared string "
+                                f"{value} but {shared_strings} has "
+                                f"{string_count} entries",
+                            )
+
+                # Free the row's cells; the row before it was cleared already
+                elem.clear(keep_tail=True)
+                previous = elem.getprevious()
+                if previous is not None:
+                    elem.getparent().remove(previous)
+
+        except lxml.etree.XMLSyntaxError:
+            pass  # Reported by the well-formedness check
+        except Exception as e:
+            errors.append(CheckError(relative_path, None, "check_error", f"Error: {e}"))
+            error_count += 1
+
+        if error_count > self.MAX_CELL_ERRORS_PER_PART:
+            errors.append(
+                f"  {relative_path}: ... and "
+                f"{error_count - self.MAX_CELL_ERRORS_PER_PART} more"
+            )
+        return errors, error_count
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,219 @@
+"""
+Zip-backed view of a packed Office file that validators can use like a directory.
+"""
+
+import fnmatch
+import io
+import os
+import stat
+import zipfile
+from pathlib import Path, PurePosixPath
+
+
+class PackagePath(PurePosixPath):
+    """Path of a file or directory inside a ZipPackage.
+
+    Supports the read side of the pathlib API the validators use (exists,
+    is_file, stat, read_bytes, open, rglob, ...). The path string starts with
+    the archive's own path, so relative_to() and messages look the same as
+    for an unpacked directory. write_bytes() only updates the in-memory copy;
+    the archive is never modified.
+    """
+
+    __slots__ = ()
+
+    _package = None  # Set on the per-package subclass created by ZipPackage
+
+    def _member(self):
+        """Return the member name ("" for the root), or None if outside the package."""
+        try:
+            relative = self.relative_to(self._package.root)
+        except ValueError:
+            return None
+        return relative.as_posix() if relative.parts else ""
+
+    def resolve(self, strict=False):
+        return self
+
+    def exists(self):
+        return self.is_file() or self.is_dir()
+
+    def is_file(self):
+        return self._package.has_file(self._member())
+
+    def is_dir(self):
+        return self._package.has_dir(self._member())
+
+    def stat(self):
+        member = self._member()
+        if self._package.has_file(member):
+            size = self._package.size(member)
+            mode = stat.S_IFREG | 0o644
+        elif self._package.has_dir(member):
+            size = 0
+            mode = stat.S_IFDIR | 0o755
+        else:
+            raise FileNotFoundError(f"No such file in package: '{self}'")
+        return os.stat_result((mode, 0, 0, 1, 0, 0, size, 0, 0, 0))
+
+    def read_bytes(self):
+        return self._package.read(self._member())
+
+    def read_text(self, encoding=None, errors=None):
+        return self.read_bytes().decode(encoding or "utf-8", errors or "strict")
+
+    def write_bytes(self, data):
+        self._package.write(self._member(), bytes(data))
+        return len(data)
+
+    def open(self, mode="r", encoding=None, errors=None, newline=None):
+        if set(mode) - set("rbt"):
+            raise PermissionError(f"Package parts are read-only: '{self}'")
+        data = io.BytesIO(self.read_bytes())
+        if "b" in mode:
+            return data
+        return io.TextIOWrapper(
+            data, encoding=encoding or "utf-8", errors=errors, newline=newline
+        )
+
+    def iterdir(self):
+        member = self._member()
+        if not self._package.has_dir(member):
+            raise NotADirectoryError(f"Not a directory in package: '{self}'")
+        dirnames, filenames = self._package.listdir(member)
+        for name in dirnames + filenames:
+            yield self / name
+
+    def walk(self):
+        """Yield (dirpath, dirnames, filenames) top-down, like Path.walk()."""
+        pending = [self]
+        while pending:
+            directory = pending.pop()
+            dirnames, filenames = self._package.listdir(directory._member())
+            dirnames = list(dirnames)
+            yield directory, dirnames, list(filenames)
+            pending.extend(directory / name for name in reversed(dirnames))
+
+    def glob(self, pattern):
+        for path in self.iterdir():
+            if fnmatch.fnmatchcase(path.name, pattern):
+                yield path
+
+    def rglob(self, pattern):
+        """Yield files and directories below this one whose name matches pattern.
+
+        Files come in central directory order.
+        """
+        prefix = self._member()
+        prefix = prefix + "/" if prefix else ""
+        for member in self._package.members(directories=True):
+            if member.startswith(prefix) and fnmatch.fnmatchcase(
+                member.rsplit("/", 1)[-1], pattern
+            ):
+                yield self._package.root / member
+
+
+class ZipPackage:
+    """A packed Office file whose parts are read from the archive on demand.
+
+    Nothing is extracted to disk: parts are decompressed into memory the
+    first time they are read, and the file list comes from the central
+    directory. Use it as a context manager, or call close() when done.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path).resolve()
+        self._zip = zipfile.ZipFile(self.path, "r")
+
+        # member name -> ZipInfo for files, in central directory order
+        self._files = {
+            info.filename: info for info in self._zip.infolist() if not info.is_dir()
+        }
+
+        # directory -> (subdirectory names, file names), "" is the root
+        self._dirs = {"": (set(), [])}
+        for info in self._zip.infolist():
+            name = info.filename.rstrip("/")
+            if info.is_dir():
+                self._add_dir(name)
+            else:
+                parent, _, base = name.rpartition("/")
+                self._add_dir(parent)
+                self._dirs[parent][1].append(base)
+
+        self._data = {}  # member name -> bytes read (or written) so far
+
+        path_class = type("PackagePath", (PackagePath,), {"_package": self})
+        self.root = path_class(self.path)
+
+    def _add_dir(self, name):
+        """Register directory name and any missing ancestors."""
+        if name in self._dirs:
+            return
+        parent, _, base = name.rpartition("/")
+        self._add_dir(parent)
+        self._dirs[parent][0].add(base)
+        self._dirs[name] = (set(), [])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the archive and drop the parts held in memory."""
+        self._zip.close()
+        self._data.clear()
+
+    def has_file(self, member):
+        return member in self._files
+
+    def has_dir(self, member):
+        return member in self._dirs
+
+    def members(self, directories=False):
+        """Return member names in central directory order (optionally with directories)."""
+        names = list(self._files)
+        if directories:
+            names.extend(sorted(name for name in self._dirs if name))
+        return names
+
+    def listdir(self, member):
+        """Return (sorted subdirectory names, sorted file names) of a directory."""
+        dirnames, filenames = self._dirs.get(member, ((), ()))
+        return sorted(dirnames), sorted(filenames)
+
+    def size(self, member):
+        if member in self._data:
+            return len(self._data[member])
+        return self._files[member].file_size
+
+    def read(self, member):
+        """Return the bytes of a member, decompressing it on first use."""
+        if member not in self._data:
+            if member not in self._files:
+                raise FileNotFoundError(f"No such file in {self.path}: '{member}'")
+            self._data[member] = self._zip.read(self._files[member])
+        return self._data[member]
+
+    def write(self, member, data):
+        """Replace the in-memory bytes of a member (the archive is not touched)."""
+        if not self.has_file(member):
+            raise FileNotFoundError(f"No such file in {self.path}: '{member}'")
+        self._data[member] = data
+
+
+def as_path(path):
+    """Return path as a Path, keeping PackagePath objects as they are."""
+    return path if isinstance(path, PackagePath) else Path(path)
+
+
+def xml_source(path):
+    """Return what lxml should parse for path.
+
+    Files on disk are parsed by name; parts of a ZipPackage from their bytes.
+    """
+    if isinstance(path, PackagePath):
+        return io.BytesIO(path.read_bytes())
+    return str(path)
@@ -2,18 +2,26 @@
 """Pack a directory into a DOCX file.
 
 Validates with auto-repair, condenses XML formatting, and creates the DOCX.
+With --incremental, members unchanged from --original are copied over without
+being recompressed. Already-compressed media is stored and everything else is
+deflated at --compress-level; --reproducible writes fixed timestamps and
+sorted members for byte-identical output.
 """
 
 import argparse
-import shutil
+import contextlib
 import sys
-import tempfile
-import zipfile
 from pathlib import Path
 
-import defusedxml.minidom
-
-from ooxml.scripts.validation import DOCXSchemaValidator, RedliningValidator
+from ooxml.scripts.validation.client import request
+from ooxml.scripts.validation.packing import (
+    DEFAULT_LEVEL,
+    MAX_BUFFERED_SIZE,
+    CompressionPolicy,
+    pack_directory,
+)
+from ooxml.scripts.validation.parallel import PhaseTimer
+from ooxml.scripts.validation.report import ValidationReport
 
 
 def pack(
@@ -21,6 +29,14 @@ def pack(
     output_file: str,
     original_file: str | None = None,
     validate: bool = True,
+    cache: bool = True,
+    report: ValidationReport | None = None,
+    server: bool = False,
+    socket_path: str | None = None,
+    jobs: int = 1,
+    incremental: bool = False,
+    compression: CompressionPolicy | None = None,
+    verbose: bool = False,
 ) -> tuple[None, str]:
     """Pack a directory into a DOCX file.
 
@@ -29,6 +45,20 @@ def pack(
         output_file: Path to output DOCX file
         original_file: Path to original DOCX for validation comparison
         validate: If True, run validation with auto-repair before packing
+        cache: If True, reuse per-part validation results from earlier runs
+        report: Optional ValidationReport that records every validation check
+            (result, errors, timings) for logging
+        server: If True, validate through a running validation server when one
+            is available
+        socket_path: Server socket (default: $OOXML_VALIDATION_SOCKET or the
+            cache directory)
+        jobs: Worker processes for condensing XML parts (0 = one per CPU)
+        incremental: If True, copy members unchanged from original_file as
+            they are compressed there instead of recompressing them
+        compression: How members are compressed, stamped and ordered
+            (default: CompressionPolicy())
+        verbose: If True, also print cache and compression statistics, the
+            recompressed members and phase timings
 
     Returns:
         (None, message) - message indicates success or failure
@@ -42,93 +72,93 @@ def pack(
     if output_path.suffix.lower() != ".docx":
         return None, f"Error: {output_file} must be a .docx file"
 
+    if incremental and not (original_file and Path(original_file).is_file()):
+        return None, "Error: --incremental needs an existing --original file"
+
+    timer = PhaseTimer(jobs)
+
     # Validate with auto-repair if requested and original file provided
     if validate and original_file:
         original_path = Path(original_file)
         if original_path.exists():
-            success, output = _run_validation(input_dir, original_path)
+            with timer.phase("validate"):
+                success, output = _run_validation(
+                    input_dir,
+                    original_path,
+                    cache=cache,
+                    report=report,
+                    server=server,
+                    socket_path=socket_path,
+                    verbose=verbose,
+                )
             if output:
                 print(output)
             if not success:
                 return None, f"Error: Validation failed for {input_dir}"
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                _condense_xml(xml_file)
-
-        # Create final DOCX file as zip archive
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
+    # Condense XML parts straight into the zip; input_dir is left untouched
+    stats = pack_directory(
+        input_dir,
+        output_path,
+        jobs=jobs,
+        timer=timer,
+        original_file=original_file if incremental else None,
+        policy=compression,
+    )
 
+    if incremental:
+        print(stats.summary(verbose))
+    if verbose:
+        print(stats.compression_summary())
+        print(timer.summary())
+    if report is not None:
+        report.info["pack_timing"] = timer.to_dict()
+        report.info["pack_compression"] = stats.compression()
+        if incremental:
+            report.info["pack_members"] = stats.to_dict()
     return None, f"Successfully packed {input_dir} to {output_file}"
 
 
-def _run_validation(unpacked_dir: Path, original_file: Path) -> tuple[bool, str | None]:
+def _run_validation(
+    unpacked_dir: Path,
+    original_file: Path,
+    cache: bool = True,
+    report: ValidationReport | None = None,
+    server: bool = False,
+    socket_path: str | None = None,
+    verbose: bool = False,
+) -> tuple[bool, str | None]:
     """Run validation with auto-repair.
 
+    With server=True the validation is sent to a running validation server
+    (see validate.py --serve); if none is available it runs in-process.
+
     Returns:
         (success, output) - success is True if all validations pass
     """
-    validators = [DOCXSchemaValidator, RedliningValidator]
-    output_lines = []
-    success = True
-
-    # Run auto-repair
-    total_repairs = 0
-    for V in validators:
-        validator = V(unpacked_dir, original_file)
-        total_repairs += validator.repair()
-    if total_repairs:
-        output_lines.append(f"Auto-repaired {total_repairs} issue(s)")
-
-    # Run validation
-    for V in validators:
-        validator = V(unpacked_dir, original_file)
-        if not validator.validate():
-            success = False
-
-    if success:
-        output_lines.append("All validations PASSED!")
-
-    return success, "\n".join(output_lines) if output_lines else None
-
-
-def _condense_xml(xml_file: Path) -> None:
-    """Strip unnecessary whitespace and remove comments from XML."""
-    try:
-        with open(xml_file, encoding="utf-8") as f:
-            dom = defusedxml.minidom.parse(f)
-
-        # Process each element to remove whitespace and comments
-        for element in dom.getElementsByTagName("*"):
-            # Skip text elements (w:t, a:t, etc.) - preserve their content
-            if element.tagName.endswith(":t"):
-                continue
-
-            # Remove whitespace-only text nodes and comment nodes
-            for child in list(element.childNodes):
-                if (
-                    child.nodeType == child.TEXT_NODE
-                    and child.nodeValue
-                    and child.nodeValue.strip() == ""
-                ) or child.nodeType == child.COMMENT_NODE:
-                    element.removeChild(child)
-
-        # Write back the condensed XML
-        with open(xml_file, "wb") as f:
-            f.write(dom.toxml(encoding="UTF-8"))
-    except Exception as e:
-        print(f"ERROR: Failed to parse {xml_file.name}: {e}", file=sys.stderr)
-        raise
+    if server:
+        response = request(
+            "pack-validation",
+            socket_path,
+            path=str(unpacked_dir.absolute()),
+            original=str(original_file.absolute()),
+            cache=cache,
+            report=report is not None,
+            verbose=verbose,
+        )
+        if response is not None:
+            sys.stdout.write(response["stdout"])
+            sys.stderr.write(response["stderr"])
+            if report is not None:
+                report.load(response["report"])
+            return response["success"], response["output"]
+
+    # Imported here so client runs (server=True) never load lxml or the validators
+    from ooxml.scripts.validation.runner import validate_for_pack
+
+    return validate_for_pack(
+        unpacked_dir, original_file, cache=cache, report=report, verbose=verbose
+    )
 
 
 if __name__ == "__main__":
@@ -146,15 +176,83 @@ if __name__ == "__main__":
         metavar="true|false",
         help="Run validation with auto-repair (default: true)",
     )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Also print cache and compression statistics and phase timings",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the persistent validation result cache",
+    )
+    parser.add_argument(
+        "--report",
+        choices=["text", "json"],
+        default="text",
+        help="Output format; json prints only a validation report to stdout (default: text)",
+    )
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Validate through a running validation server (validate.py --serve), "
+        "falling back to in-process validation",
+    )
+    parser.add_argument("--socket", help="Validation server socket path")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for condensing XML parts (0 = one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Copy members unchanged from --original without recompressing them",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        choices=range(10),
+        default=DEFAULT_LEVEL,
+        metavar="0-9",
+        help=(
+            f"Deflate level, 1 = fastest, 9 = smallest (default: {DEFAULT_LEVEL}); files"
+            f" over {MAX_BUFFERED_SIZE >> 20} MB are streamed at {DEFAULT_LEVEL} to bound memory"
+        ),
+    )
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Fixed timestamps and member order, for byte-identical output",
+    )
     args = parser.parse_args()
 
-    _, message = pack(
-        args.input_directory,
-        args.output_file,
-        original_file=args.original,
-        validate=args.validate,
-    )
-    print(message)
+    report = ValidationReport(echo=False) if args.report == "json" else None
+    with contextlib.redirect_stdout(sys.stderr if report else sys.stdout):
+        _, message = pack(
+            args.input_directory,
+            args.output_file,
+            original_file=args.original,
+            validate=args.validate,
+            cache=not args.no_cache,
+            report=report,
+            server=args.server,
+            socket_path=args.socket,
+            jobs=args.jobs,
+            incremental=args.incremental,
+            compression=CompressionPolicy(
+                args.compress_level, reproducible=args.reproducible
+            ),
+            verbose=args.verbose,
+        )
+    if report:
+        report.info["message"] = message
+        print(report.to_json())
+    else:
+        print(message)
 
     if "Error" in message:
         sys.exit(1)
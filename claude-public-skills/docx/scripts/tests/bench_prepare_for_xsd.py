@@ -0,0 +1,118 @@
+"""
+Benchmark XSD preprocessing (_prepare_for_xsd) against the pipeline it replaced.
+
+Builds a synthetic document.xml with tracked-change markup, w14 attributes,
+an mc:Ignorable root and template tags, then times each implementation (best
+of --repeat runs) and measures its peak RSS above the parsed tree in a fresh
+process.
+
+Usage:
+    python tests/bench_prepare_for_xsd.py [--paragraphs N] [--repeat N]
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import legacy  # noqa: E402
+import lxml.etree  # noqa: E402
+from ooxml.scripts.validation.docx import DOCXSchemaValidator  # noqa: E402
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W14_NS = "http://schemas.microsoft.com/office/word/2010/wordml"
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+PARAGRAPH = (
+    '<w:p w14:paraId="{id:08X}" w14:textId="77777777"><w:pPr><w:jc w:val="left"/></w:pPr>'
+    '<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">Paragraph {i} {{{{ name }}}} </w:t></w:r>'
+    '<w:ins w:id="{i}" w:author="A"><w:r><w:t>inserted</w:t></w:r></w:ins>'
+    '<w:del w:id="{i}" w:author="A"><w:r><w:delText>deleted</w:delText></w:r></w:del>'
+    "<w14:foreign><w:r><w:t>x</w:t></w:r></w14:foreign></w:p>"
+)
+
+
+def write_document(path, paragraphs):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(
+            f'<w:document xmlns:w="{W_NS}" xmlns:w14="{W14_NS}" xmlns:mc="{MC_NS}" '
+            'mc:Ignorable="w14"><w:body>'
+        )
+        for i in range(paragraphs):
+            f.write(PARAGRAPH.format(id=i, i=i))
+        f.write("</w:body></w:document>")
+
+
+def implementations():
+    validator = DOCXSchemaValidator.__new__(DOCXSchemaValidator)
+    return {
+        "old": lambda doc: legacy.prepare_for_xsd(validator, doc, True),
+        "new": lambda doc: validator._prepare_for_xsd(doc, True),
+    }
+
+
+def parse(path):
+    return lxml.etree.parse(str(path), lxml.etree.XMLParser(huge_tree=True))
+
+
+def peak_rss(path, name):
+    """Run one implementation in this process; print its peak RSS in MB."""
+    doc = parse(path)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    implementations()[name](doc)
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print((after - before) / 1024)  # ru_maxrss is in KB on Linux
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paragraphs", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--rss", nargs=2, metavar=("PATH", "IMPLEMENTATION"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.rss:
+        peak_rss(*args.rss)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "document.xml"
+        write_document(path, args.paragraphs)
+
+        # Child processes start with the parent's peak RSS, so measure memory
+        # before this process holds a parsed tree
+        rss = {
+            name: float(
+                subprocess.run(
+                    [sys.executable, __file__, "--rss", str(path), name],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+            )
+            for name in implementations()
+        }
+
+        doc = parse(path)
+        elements = sum(1 for _ in doc.iter())
+        print(f"document.xml: {path.stat().st_size / 1e6:.1f} MB, {elements} elements")
+
+        for name, prepare in implementations().items():
+            seconds = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                prepare(doc)
+                seconds.append(time.perf_counter() - start)
+            print(f"{name}: {min(seconds):.2f}s, peak RSS +{rss[name]:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark unpack.unpack() against the extract-then-rewrite pipeline it replaced.
+
+Builds a synthetic .docx with a large word/document.xml (runs to merge,
+proofErr markers, smart quotes) plus a few small parts and an image, then
+unpacks it with each implementation in a fresh process and reports the time
+and the bytes written to disk (wchar in /proc/self/io).
+
+Usage:
+    python tests/bench_unpack.py [--paragraphs N]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import legacy  # noqa: E402
+import unpack  # noqa: E402
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+PARAGRAPH = (
+    '<w:p><w:r w:rsidR="00A1"><w:rPr><w:b/></w:rPr>'
+    '<w:t xml:space="preserve">Paragraph {i} </w:t></w:r><w:proofErr w:type="spellStart"/>'
+    '<w:r w:rsidR="00B2"><w:rPr><w:b/></w:rPr>'
+    "<w:t>“quoted”</w:t></w:r><w:r><w:t>plain</w:t></w:r></w:p>"
+)
+
+
+def write_docx(path, paragraphs):
+    body = "".join(PARAGRAPH.format(i=i) for i in range(paragraphs))
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", '<Types xmlns="urn:ct"/>')
+        zf.writestr("_rels/.rels", '<Relationships xmlns="urn:rels"/>')
+        zf.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>',
+        )
+        zf.writestr("word/styles.xml", f'<w:styles xmlns:w="{W_NS}"/>')
+        zf.writestr("word/media/image1.png", bytes(range(256)) * 4096)
+
+
+def written_bytes():
+    with open("/proc/self/io") as f:
+        for line in f:
+            if line.startswith("wchar:"):
+                return int(line.split()[1])
+    return 0
+
+
+def run_one(name, docx, output):
+    """Unpack with one implementation in this process; print seconds and MB."""
+    implementation = {"old": legacy.unpack, "new": unpack.unpack}[name]
+    before = written_bytes()
+    start = time.perf_counter()
+    _, message = implementation(docx, output)
+    seconds = time.perf_counter() - start
+    if "Error" in message:
+        sys.exit(message)
+    print(seconds, (written_bytes() - before) / 1e6)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paragraphs", type=int, default=20_000)
+    parser.add_argument(
+        "--run", nargs=3, metavar=("IMPLEMENTATION", "DOCX", "OUTPUT"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.run:
+        run_one(*args.run)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        docx = Path(directory) / "input.docx"
+        write_docx(docx, args.paragraphs)
+        with zipfile.ZipFile(docx) as zf:
+            size = zf.getinfo("word/document.xml").file_size
+        print(f"word/document.xml: {size / 1e6:.1f} MB, {args.paragraphs} paragraphs")
+
+        for name in ("old", "new"):
+            output = Path(directory) / name
+            result = subprocess.run(
+                [sys.executable, __file__, "--run", name, str(docx), str(output)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            seconds, megabytes = map(float, result.stdout.split())
+            print(f"{name}: {seconds:.2f}s, {megabytes:.1f} MB written")
+
+
+if __name__ == "__main__":
+    main()
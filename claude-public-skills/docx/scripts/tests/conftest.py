@@ -0,0 +1,147 @@
+"""
+Shared fixtures: minimal Office packages built with zipfile, and helpers to
+run the command line scripts.
+
+The scripts directory is put on sys.path, so the validation package is
+imported as ooxml.scripts.validation, as docx/scripts/pack.py imports it.
+"""
+
+import os
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+OOXML_SCRIPTS_DIR = SCRIPTS_DIR / "ooxml" / "scripts"
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+OFFICE_DOCUMENT = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Default Extension="png" ContentType="image/png"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+
+PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{PKG_RELS_NS}">'
+    f'<Relationship Id="rId1" Type="{OFFICE_DOCUMENT}" Target="{{target}}"/>'
+    "</Relationships>"
+)
+
+DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{PKG_RELS_NS}">{{relationships}}</Relationships>'
+)
+
+
+def paragraph(text):
+    """A w:p holding one run of text."""
+    return f'<w:p><w:r><w:t xml:space="preserve">{text}</w:t></w:r></w:p>'
+
+
+def document_xml(*paragraphs):
+    """word/document.xml with the given w:p elements in its body."""
+    body = "".join(paragraphs) or paragraph("Hello")
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+
+
+def docx_parts(document=None, relationships="", extra=None):
+    """Member name -> content of a minimal .docx package."""
+    parts = {
+        "[Content_Types].xml": DOCX_CONTENT_TYPES,
+        "_rels/.rels": PACKAGE_RELS.format(target="word/document.xml"),
+        "word/document.xml": document if document is not None else document_xml(),
+        "word/_rels/document.xml.rels": DOCUMENT_RELS.format(
+            relationships=relationships
+        ),
+    }
+    parts.update(extra or {})
+    return parts
+
+
+def write_package(path, parts):
+    """Write parts (name -> str or bytes) as a zip package at path."""
+    path = Path(path)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in parts.items():
+            zf.writestr(name, content)
+    return path
+
+
+def write_directory(path, parts):
+    """Write parts (name -> str or bytes) as an unpacked package under path."""
+    path = Path(path)
+    for name, content in parts.items():
+        target = path / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        target.write_bytes(content)
+    return path
+
+
+def run_script(script, *args, cwd=None, env=None):
+    """Run a script with the current interpreter and capture its output."""
+    return subprocess.run(
+        [sys.executable, str(script), *map(str, args)],
+        cwd=cwd,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        timeout=600,
+    )
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point the persistent result cache at a fresh directory for each test."""
+    path = tmp_path / "validation-cache"
+    monkeypatch.setenv("OOXML_VALIDATION_CACHE", str(path))
+    return path
+
+
+@pytest.fixture
+def original_docx(tmp_path):
+    """A minimal valid .docx."""
+    return write_package(tmp_path / "original.docx", docx_parts())
+
+
+@pytest.fixture
+def unpacked_docx(tmp_path):
+    """The parts of original_docx, unpacked."""
+    return write_directory(tmp_path / "unpacked", docx_parts())
+
+
+def validate(path, original, *args, **kwargs):
+    """Run ooxml/scripts/validate.py on path."""
+    return run_script(
+        OOXML_SCRIPTS_DIR / "validate.py",
+        path,
+        "--original",
+        original,
+        *args,
+        cwd=OOXML_SCRIPTS_DIR,
+        **kwargs,
+    )
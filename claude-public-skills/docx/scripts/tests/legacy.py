@@ -0,0 +1,111 @@
+"""
+Reference implementations of pipelines the scripts have replaced.
+
+Golden tests check that the replacements give the same results, and the
+bench_*.py scripts measure them against these.
+"""
+
+import re
+import zipfile
+from pathlib import Path
+
+import defusedxml.minidom
+import lxml.etree
+from helpers.merge_runs import merge_runs as do_merge_runs
+from unpack import SMART_QUOTE_REPLACEMENTS
+
+TEMPLATE_TAG = re.compile(r"\{\{[^}]*\}\}")
+
+
+def prepare_for_xsd(validator, xml_doc, clean_namespaces):
+    """XSD preprocessing as BaseSchemaValidator did it before _prepare_for_xsd.
+
+    Template tags, mc:Ignorable and foreign namespaces were each handled on a
+    serialized and re-parsed copy, with a recursive walk for the elements.
+    """
+    xml_doc = _remove_template_tags(xml_doc)
+
+    root = xml_doc.getroot()
+    ignorable = f"{{{validator.MC_NAMESPACE}}}Ignorable"
+    if ignorable in root.attrib:
+        del root.attrib[ignorable]
+
+    if not clean_namespaces:
+        return xml_doc
+
+    xml_copy = lxml.etree.fromstring(lxml.etree.tostring(xml_doc, encoding="unicode"))
+    for elem in xml_copy.iter():
+        foreign = [
+            attr
+            for attr in elem.attrib
+            if "{" in attr and attr.split("}")[0][1:] not in validator.OOXML_NAMESPACES
+        ]
+        for attr in foreign:
+            del elem.attrib[attr]
+    _remove_foreign_elements(validator, xml_copy)
+    return lxml.etree.ElementTree(xml_copy)
+
+
+def _remove_template_tags(xml_doc):
+    xml_copy = lxml.etree.fromstring(lxml.etree.tostring(xml_doc, encoding="unicode"))
+    for elem in xml_copy.iter():
+        if not hasattr(elem, "tag") or callable(elem.tag):
+            continue
+        tag = str(elem.tag)
+        if tag.endswith("}t") or tag == "t":
+            continue
+        if elem.text:
+            elem.text = TEMPLATE_TAG.sub("", elem.text)
+        if elem.tail:
+            elem.tail = TEMPLATE_TAG.sub("", elem.tail)
+    return lxml.etree.ElementTree(xml_copy)
+
+
+def _remove_foreign_elements(validator, root):
+    foreign = []
+    for elem in list(root):
+        if not hasattr(elem, "tag") or callable(elem.tag):
+            continue
+        tag = str(elem.tag)
+        if tag.startswith("{") and tag.split("}")[0][1:] not in validator.OOXML_NAMESPACES:
+            foreign.append(elem)
+            continue
+        _remove_foreign_elements(validator, elem)
+    for elem in foreign:
+        root.remove(elem)
+
+
+def unpack(input_file, output_directory, merge_runs=True):
+    """unpack.unpack() as it was before each member was written only once.
+
+    The archive was extracted, then every XML part was pretty-printed in
+    place, document.xml was re-parsed to merge runs, and every part was read
+    and rewritten once more to escape smart quotes.
+    """
+    output_path = Path(output_directory)
+    try:
+        output_path.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(input_file, "r") as zf:
+            zf.extractall(output_path)
+
+        xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
+        for xml_file in xml_files:
+            dom = defusedxml.minidom.parseString(xml_file.read_text(encoding="utf-8"))
+            xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="utf-8"))
+
+        message = f"Unpacked {input_file} ({len(xml_files)} XML files)"
+        if merge_runs:
+            merge_count, _ = do_merge_runs(str(output_path))
+            message += f", merged {merge_count} runs"
+
+        for xml_file in xml_files:
+            content = xml_file.read_text(encoding="utf-8")
+            for char, entity in SMART_QUOTE_REPLACEMENTS.items():
+                content = content.replace(char, entity)
+            xml_file.write_text(content, encoding="utf-8")
+
+        return None, message
+    except zipfile.BadZipFile:
+        return None, f"Error: {input_file} is not a valid DOCX file"
+    except Exception as e:
+        return None, f"Error unpacking: {e}"
@@ -0,0 +1,92 @@
+from conftest import (
+    docx_parts,
+    document_xml,
+    paragraph,
+    validate,
+    write_directory,
+    write_package,
+)
+from ooxml.scripts.validation.baseline import OriginalBaseline
+from ooxml.scripts.validation.cache import ResultCache
+
+
+def _counting_validator(calls):
+    def validate_tree(xml_doc, relative_path):
+        calls.append(str(relative_path))
+        return False, {f"error in {xml_doc.getroot().tag}"}
+
+    return validate_tree
+
+
+def test_members_parsed_once_from_the_zip(original_docx):
+    calls = []
+    baseline = OriginalBaseline(original_docx, _counting_validator(calls))
+
+    first = baseline.errors_for("word/document.xml")
+    second = baseline.errors_for("word/document.xml")
+    baseline.close()
+
+    assert first == second
+    assert calls == ["word/document.xml"]
+    assert next(iter(first)).startswith("error in {")
+
+
+def test_missing_member_has_no_errors(original_docx):
+    calls = []
+    baseline = OriginalBaseline(original_docx, _counting_validator(calls))
+
+    assert baseline.errors_for("word/missing.xml") == set()
+    assert not baseline.has_member("word/missing.xml")
+    assert baseline.member_info("word/document.xml").file_size > 0
+    assert calls == []
+
+
+def test_unparseable_member_reports_the_parse_error(tmp_path):
+    original = write_package(
+        tmp_path / "broken.docx", docx_parts(extra={"word/broken.xml": "<a>"})
+    )
+    baseline = OriginalBaseline(original, _counting_validator([]))
+
+    (error,) = baseline.errors_for("word/broken.xml")
+    assert "line 1" in error
+
+
+def test_result_cache_is_consulted_before_validating(original_docx, cache_dir):
+    cache = ResultCache(cache_dir)
+
+    def key(relative_path, data):
+        return ResultCache.make_key(str(relative_path), data)
+
+    calls = []
+    OriginalBaseline(
+        original_docx, _counting_validator(calls), cache, key
+    ).errors_for("word/document.xml")
+    errors = OriginalBaseline(
+        original_docx, _counting_validator(calls), cache, key
+    ).errors_for("word/document.xml")
+
+    assert len(calls) == 1
+    assert cache.hits == 1
+    assert len(errors) == 1
+
+
+def test_errors_already_in_the_original_are_not_reported(tmp_path):
+    invalid = "<w:p><w:bogus/></w:p>"
+    original = write_package(
+        tmp_path / "original.docx", docx_parts(document_xml(invalid))
+    )
+    edited = write_directory(
+        tmp_path / "edited", docx_parts(document_xml(invalid, paragraph("New")))
+    )
+
+    result = validate(edited, original)
+    assert result.returncode == 0, result.stdout
+
+    # A second, different schema error is new
+    (edited / "word" / "document.xml").write_text(
+        document_xml(invalid, "<w:p><w:other/></w:p>")
+    )
+    result = validate(edited, original)
+    assert result.returncode == 1
+    assert "other" in result.stdout
+    assert "bogus" not in result.stdout
@@ -0,0 +1,111 @@
+import io
+import json
+
+import pytest
+from conftest import OOXML_SCRIPTS_DIR, docx_parts, document_xml, run_script, write_package
+from ooxml.scripts.validation.batch import (
+    find_documents,
+    format_summary,
+    read_manifest,
+    validate_batch,
+)
+
+DUPLICATE_IDS = document_xml('<w:p><w:bookmarkStart w:id="1" w:name="a"/></w:p>' * 2)
+
+
+@pytest.fixture
+def documents(tmp_path):
+    """Two valid documents and one with duplicate IDs, in nested directories."""
+    directory = tmp_path / "documents"
+    (directory / "sub").mkdir(parents=True)
+    write_package(directory / "a.docx", docx_parts())
+    write_package(directory / "sub" / "b.docx", docx_parts())
+    write_package(directory / "sub" / "c.docx", docx_parts(DUPLICATE_IDS))
+    (directory / "notes.txt").write_text("not a document")
+    return directory
+
+
+def test_read_manifest(tmp_path):
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text(
+        "# comment\n"
+        "\n"
+        '{"path": "a.docx", "original": "orig/a.docx"}\n'
+        "b.docx\torig/b.docx\n"
+        '{"path": "c.docx"}\n'
+        "d.docx\n"
+    )
+
+    assert read_manifest(manifest, default_original="default.docx") == [
+        (tmp_path / "a.docx", tmp_path / "orig" / "a.docx"),
+        (tmp_path / "b.docx", tmp_path / "orig" / "b.docx"),
+        (tmp_path / "c.docx", tmp_path / "default.docx"),
+        (tmp_path / "d.docx", tmp_path / "default.docx"),
+    ]
+    with pytest.raises(ValueError, match="manifest.txt:5"):
+        read_manifest(manifest)
+
+
+def test_find_documents(documents, tmp_path, original_docx):
+    assert find_documents(documents, original_docx) == [
+        (documents / "a.docx", original_docx),
+        (documents / "sub" / "b.docx", original_docx),
+        (documents / "sub" / "c.docx", original_docx),
+    ]
+
+    originals = tmp_path / "originals"
+    originals.mkdir()
+    assert find_documents(documents, originals)[1] == (
+        documents / "sub" / "b.docx",
+        originals / "sub" / "b.docx",
+    )
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_batch(documents, original_docx, jobs):
+    output = io.StringIO()
+    summary = validate_batch(find_documents(documents, original_docx), jobs=jobs, output=output)
+
+    *lines, last = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert last == {"summary": summary}
+    assert summary["jobs"] == jobs
+    assert (summary["documents"], summary["passed"], summary["failed"]) == (3, 2, 1)
+    assert summary["bytes"] == sum(f.stat().st_size for f in documents.rglob("*.docx"))
+
+    results = {line["path"]: line for line in lines}
+    failed = results[str(documents / "sub" / "c.docx")]
+    assert failed["success"] is False
+    assert failed["failed_checks"] == ["validate_unique_ids"]
+    assert failed["errors"][0]["code"] == "duplicate_id"
+    assert results[str(documents / "a.docx")]["errors"] == []
+
+
+def test_unreadable_documents_are_errors_not_crashes(tmp_path, original_docx):
+    broken = tmp_path / "broken.docx"
+    broken.write_bytes(b"not a zip")
+
+    output = io.StringIO()
+    summary = validate_batch([(broken, original_docx)], output=output)
+
+    result = json.loads(output.getvalue().splitlines()[0])
+    assert result["success"] is False
+    assert "BadZipFile" in result["error"]
+    assert summary["errors"] == 1
+    assert "1 error(s)" in format_summary(summary)
+
+
+def test_batch_command_line(documents, original_docx):
+    result = run_script(
+        OOXML_SCRIPTS_DIR / "validate.py",
+        documents,
+        "--batch",
+        "--original",
+        original_docx,
+        "--jobs",
+        "2",
+        cwd=OOXML_SCRIPTS_DIR,
+    )
+
+    assert result.returncode == 1
+    assert len(result.stdout.splitlines()) == 4
+    assert "Validated 3 document(s)" in result.stderr
@@ -0,0 +1,145 @@
+import json
+import os
+import time
+
+import pytest
+from conftest import docx_parts, document_xml, paragraph, write_directory
+from ooxml.scripts.validation import cache as cache_module
+from ooxml.scripts.validation.cache import PRUNE_MARKER, ResultCache
+from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.runner import validate_for_pack, validate_path
+
+
+def test_get_put_round_trip(cache_dir):
+    cache = ResultCache(cache_dir)
+    key = ResultCache.make_key("xsd", b"<a/>")
+
+    assert cache.get(key) is None
+    cache.put(key, {"valid": True, "errors": []})
+
+    assert cache.get(key) == {"valid": True, "errors": []}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_keys_are_length_prefixed():
+    assert ResultCache.make_key("ab", "c") != ResultCache.make_key("a", "bc")
+
+
+def test_disabled_cache_neither_reads_nor_writes(cache_dir):
+    key = ResultCache.make_key("x")
+    ResultCache(cache_dir).put(key, 1)
+    cache = ResultCache(cache_dir, enabled=False)
+
+    assert cache.get(key) is None
+    cache.put(ResultCache.make_key("y"), 2)
+
+    assert len(list(cache_dir.glob("??/*.json"))) == 1
+    assert cache.summary() == "Result cache: disabled"
+
+
+def test_unwritable_cache_is_a_miss(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = ResultCache(blocker / "cache")
+
+    cache.put("ab" * 32, 1)
+    assert cache.get("ab" * 32) is None
+
+
+def _entry(cache, name, size, age):
+    key = ResultCache.make_key(name)
+    cache.put(key, "x" * size)
+    path = cache._entry_path(key)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_prune_drops_old_entries_then_least_recently_used(cache_dir):
+    cache = ResultCache(cache_dir, max_age=1000, max_bytes=250)
+    old = _entry(cache, "old", 10, 2000)
+    recent = _entry(cache, "recent", 100, 10)
+    older = _entry(cache, "older", 100, 20)
+    oldest = _entry(cache, "oldest", 100, 30)
+
+    assert cache.prune() == 2
+
+    assert not old.exists()
+    assert recent.exists() and older.exists()
+    assert not oldest.exists()
+
+
+def test_hits_keep_entries(cache_dir):
+    cache = ResultCache(cache_dir, max_bytes=150)
+    used = _entry(cache, "used", 100, 30)
+    unused = _entry(cache, "unused", 100, 20)
+
+    cache.get(ResultCache.make_key("used"))
+    cache.prune()
+
+    assert used.exists()
+    assert not unused.exists()
+
+
+def test_first_put_prunes_once_per_interval(cache_dir, monkeypatch):
+    pruned = []
+    monkeypatch.setattr(ResultCache, "prune", lambda self: pruned.append(1))
+
+    ResultCache(cache_dir).put("aa" * 32, 1)
+    ResultCache(cache_dir).put("bb" * 32, 1)
+    assert pruned == [1]
+    assert (cache_dir / PRUNE_MARKER).exists()
+
+    monkeypatch.setattr(cache_module, "PRUNE_INTERVAL", 0)
+    cache = ResultCache(cache_dir)
+    cache.put("cc" * 32, 1)
+    cache.put("dd" * 32, 1)
+    assert pruned == [1, 1]
+
+
+@pytest.fixture
+def stale_entry(tmp_path, original_docx, cache_dir):
+    """An edited package whose document.xml has a wrong cached XSD result."""
+    edited = write_directory(
+        tmp_path / "edited", docx_parts(document_xml(paragraph("Edited")))
+    )
+    document = edited / "word" / "document.xml"
+    validator = DOCXSchemaValidator(
+        edited, original_docx, result_cache=ResultCache(cache_dir)
+    )
+    key = validator._xsd_cache_key("word/document.xml", document.read_bytes())
+    validator.close()
+    entry = ResultCache(cache_dir)._entry_path(key)
+    entry.parent.mkdir(parents=True)
+    entry.write_text(json.dumps({"valid": False, "errors": ["stale result"]}))
+    return edited
+
+
+def test_cached_results_are_used(stale_entry, original_docx, capsys):
+    assert not validate_path(stale_entry, original_docx)
+    assert "stale result" in capsys.readouterr().out
+
+
+def test_no_cache_bypasses_stale_entries(stale_entry, original_docx, capsys):
+    assert validate_path(stale_entry, original_docx, cache=False)
+    assert "stale result" not in capsys.readouterr().out
+
+
+def test_cache_version_bump_bypasses_stale_entries(
+    stale_entry, original_docx, monkeypatch, capsys
+):
+    monkeypatch.setattr(
+        DOCXSchemaValidator, "CACHE_VERSION", DOCXSchemaValidator.CACHE_VERSION + 1
+    )
+    assert validate_path(stale_entry, original_docx)
+    assert "stale result" not in capsys.readouterr().out
+
+
+def test_pack_validation_prints_cache_statistics_only_when_verbose(
+    unpacked_docx, original_docx
+):
+    _, output = validate_for_pack(unpacked_docx, original_docx)
+    assert "Result cache" not in output
+
+    _, output = validate_for_pack(unpacked_docx, original_docx, verbose=True)
+    assert "Result cache" in output
@@ -0,0 +1,113 @@
+import defusedxml
+import pytest
+from conftest import docx_parts, write_directory, write_package
+from defusedxml.minidom import parseString
+from ooxml.scripts.validation.condense import (
+    _condense_with_lxml,
+    _condense_with_minidom,
+    condense_xml_bytes,
+)
+from ooxml.scripts.validation.docx import DOCXSchemaValidator
+
+DECLARATION = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Inputs the lxml fast path handles itself
+FAST_PATH = {
+    "pretty printed": (
+        b'<w:document xmlns:w="urn:w">\n  <w:body>\n    <w:p>\n'
+        b"      <w:r>\n        <w:t>Hi</w:t>\n      </w:r>\n"
+        b"    </w:p>\n  </w:body>\n</w:document>"
+    ),
+    "text element whitespace": (
+        b'<w:p xmlns:w="urn:w"> <w:t xml:space="preserve">  two  </w:t> '
+        b"<w:t>\n  </w:t><w:t/></w:p>"
+    ),
+    "unprefixed t": b'<a xmlns="urn:a">\n  <t>\n  </t>\n</a>',
+    "quotes and escapes": (
+        b'<w:p xmlns:w="urn:w" w:a="&quot;&gt;&amp;&lt;" b="\'">'
+        b'<w:t>"q" &gt; &amp; &lt; \'s\'</w:t> "text" </w:p>'
+    ),
+    "attribute whitespace characters": (
+        b'<w:p xmlns:w="urn:w" w:a="&#10;&#9;&#13;" w:b="x\ny"><w:t>&#13;</w:t></w:p>'
+    ),
+    "comments": (
+        b'<w:p xmlns:w="urn:w">\n  <!-- c -->\n  <w:r>"a" <!-- c --> b</w:r>'
+        b"<!-- d -->tail</w:p>"
+    ),
+    "mixed content": b'<w:p xmlns:w="urn:w">one <w:b/> two\n  <w:i/>\n</w:p>',
+    "namespaces": (
+        b'<w:d xmlns:w="urn:w" xmlns="urn:d" xmlns:r="urn:r">'
+        b'<x r:id="rId1"/><w:e xmlns:w="urn:other"/></w:d>'
+    ),
+    "non-ascii": '<w:t xmlns:w="urn:w">“quoted” é</w:t>'.encode(),
+}
+
+# Inputs the fast path hands to minidom
+FALLBACK = {
+    "comment in text element": b'<w:p xmlns:w="urn:w"><w:t>a<!-- c -->b</w:t></w:p>',
+    "processing instruction": b'<w:p xmlns:w="urn:w"><?pi data?></w:p>',
+    "comment after root": b'<w:p xmlns:w="urn:w"/><!-- c -->',
+    "cdata": b'<w:p xmlns:w="urn:w"><w:t><![CDATA[a < b & "c"]]></w:t></w:p>',
+    "doctype": b"<!DOCTYPE a>\n<a>\n  <b/>\n</a>",
+    "utf-16": '<w:t xmlns:w="urn:w"><![CDATA[<x>]]></w:t>'.encode("utf-16"),
+}
+
+
+@pytest.mark.parametrize("data", FAST_PATH.values(), ids=FAST_PATH.keys())
+def test_fast_path_matches_minidom(data):
+    for document in (data, DECLARATION + data):
+        assert _condense_with_lxml(document) is not None
+        assert condense_xml_bytes(document) == _condense_with_minidom(document)
+
+
+@pytest.mark.parametrize("data", FALLBACK.values(), ids=FALLBACK.keys())
+def test_fallback_inputs_go_through_minidom(data):
+    assert _condense_with_lxml(data) is None
+    assert condense_xml_bytes(data) == _condense_with_minidom(data)
+
+
+def test_doctype_is_kept():
+    assert b"<!DOCTYPE a>" in condense_xml_bytes(FALLBACK["doctype"])
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'<!DOCTYPE a [<!ENTITY e "x">]><a>&e;</a>',
+        b'<!DOCTYPE a [<!ENTITY e SYSTEM "file:///etc/passwd">]><a>&e;</a>',
+        b'<!DOCTYPE a [<!ENTITY a0 "x"><!ENTITY a1 "&a0;&a0;&a0;">]><a>&a1;</a>',
+        b'<!DOCTYPE a [<!ENTITY e "x">]><a/>',
+        '<?xml version="1.0" encoding="UTF-16"?><!DOCTYPE a [<!ENTITY e "x">]><a/>'
+        .encode("utf-16"),
+    ],
+)
+def test_entity_declarations_are_rejected(data):
+    with pytest.raises(defusedxml.EntitiesForbidden):
+        condense_xml_bytes(data)
+
+
+def test_malformed_input_raises():
+    with pytest.raises(Exception):
+        condense_xml_bytes(b"<a><b></a>")
+
+
+def test_pretty_printed_part_matches_its_packed_original(tmp_path):
+    parts = docx_parts()
+    condensed = {
+        name: condense_xml_bytes(content.encode()) for name, content in parts.items()
+    }
+    original = write_package(tmp_path / "original.docx", condensed)
+    pretty = {
+        name: parseString(content).toprettyxml(indent="  ", encoding="ascii")
+        for name, content in condensed.items()
+    }
+    unpacked = write_directory(tmp_path / "unpacked", pretty)
+    document = unpacked / "word" / "document.xml"
+
+    validator = DOCXSchemaValidator(unpacked, original)
+    try:
+        assert validator._matches_original(document, validator.unpacked_dir)
+        document.write_bytes(document.read_bytes().replace(b"Hello", b"Edited"))
+        assert not validator._matches_original(document, validator.unpacked_dir)
+    finally:
+        validator.close()
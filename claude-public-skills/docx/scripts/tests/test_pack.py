@@ -0,0 +1,280 @@
+import json
+import os
+import zipfile
+
+import pytest
+from conftest import (
+    OOXML_SCRIPTS_DIR,
+    SCRIPTS_DIR,
+    docx_parts,
+    document_xml,
+    paragraph,
+    run_script,
+    write_directory,
+)
+from ooxml.scripts.validation.condense import condense_xml_bytes
+from ooxml.scripts.validation import packing
+from ooxml.scripts.validation.packing import DEFAULT_LEVEL, CompressionPolicy, pack_directory
+
+PRETTY_DOCUMENT = document_xml(paragraph("one"), paragraph("two")).replace("><", ">\n  <")
+
+
+@pytest.fixture
+def pretty_docx(tmp_path):
+    return write_directory(
+        tmp_path / "unpacked",
+        docx_parts(PRETTY_DOCUMENT, extra={"word/media/image1.png": b"\x89PNG" * 100}),
+    )
+
+
+def directory_files(directory):
+    return {
+        path.relative_to(directory).as_posix(): path.read_bytes()
+        for path in directory.rglob("*")
+        if path.is_file()
+    }
+
+
+def test_parts_are_condensed_into_the_zip(tmp_path, pretty_docx):
+    before = directory_files(pretty_docx)
+
+    pack_directory(pretty_docx, tmp_path / "out.docx")
+
+    with zipfile.ZipFile(tmp_path / "out.docx") as zf:
+        assert zf.testzip() is None
+        members = {name: zf.read(name) for name in zf.namelist()}
+    assert set(members) == set(before)
+    for name, data in before.items():
+        expected = data if name.endswith(".png") else condense_xml_bytes(data)
+        assert members[name] == expected
+    assert directory_files(pretty_docx) == before  # Input left untouched
+
+
+def test_jobs_give_the_same_members(tmp_path, pretty_docx):
+    pack_directory(pretty_docx, tmp_path / "serial.docx")
+    pack_directory(pretty_docx, tmp_path / "parallel.docx", jobs=2)
+
+    with (
+        zipfile.ZipFile(tmp_path / "serial.docx") as serial,
+        zipfile.ZipFile(tmp_path / "parallel.docx") as parallel,
+    ):
+        assert serial.namelist() == parallel.namelist()
+        assert all(serial.read(name) == parallel.read(name) for name in serial.namelist())
+
+
+def test_malformed_part_leaves_no_file(tmp_path, pretty_docx, capsys):
+    (pretty_docx / "word" / "broken.xml").write_text("<w:a>")
+    output = tmp_path / "out.docx"
+    output.write_bytes(b"previous")
+
+    with pytest.raises(Exception):
+        pack_directory(pretty_docx, output)
+
+    assert "ERROR: Failed to parse broken.xml" in capsys.readouterr().err
+    assert output.read_bytes() == b"previous"
+    assert [path.name for path in tmp_path.iterdir() if path.suffix == ".tmp"] == []
+
+
+def test_command_line(tmp_path, pretty_docx):
+    output = tmp_path / "out.docx"
+
+    result = run_script(OOXML_SCRIPTS_DIR / "pack.py", pretty_docx, output, "--force")
+
+    assert result.returncode == 0
+    with zipfile.ZipFile(output) as zf:
+        assert zf.read("word/document.xml") == condense_xml_bytes(PRETTY_DOCUMENT.encode())
+
+
+@pytest.mark.parametrize(
+    "script, skip_validation",
+    [
+        (SCRIPTS_DIR / "pack.py", ("--validate", "false")),
+        (OOXML_SCRIPTS_DIR / "pack.py", ("--force",)),
+    ],
+)
+def test_statistics_only_with_verbose(tmp_path, pretty_docx, script, skip_validation):
+    quiet = run_script(script, pretty_docx, tmp_path / "quiet.docx", *skip_validation)
+    verbose = run_script(
+        script, pretty_docx, tmp_path / "verbose.docx", *skip_validation, "--verbose"
+    )
+
+    assert quiet.returncode == verbose.returncode == 0, quiet.stderr
+    assert "Timing:" not in quiet.stdout
+    assert "Compression:" not in quiet.stdout
+    assert "Timing: condense" in verbose.stdout
+    assert "Compression: deflated 4 member(s) at level 6" in verbose.stdout
+
+
+def zip_members(path):
+    with zipfile.ZipFile(path) as zf:
+        assert zf.testzip() is None
+        return {info.filename: (info.compress_type, zf.read(info)) for info in zf.infolist()}
+
+
+@pytest.fixture
+def repack(tmp_path, pretty_docx):
+    """Pack pretty_docx, edit document.xml, and pack it again from the original."""
+    original = tmp_path / "original.docx"
+    pack_directory(pretty_docx, original)
+    document = pretty_docx / "word" / "document.xml"
+    document.write_text(document.read_text().replace("two", "edited"))
+
+    def run(name):
+        output = tmp_path / name
+        return output, pack_directory(pretty_docx, output, original_file=original)
+
+    return run
+
+
+def test_incremental_repack_copies_unchanged_members(tmp_path, pretty_docx, repack):
+    output, stats = repack("incremental.docx")
+    pack_directory(pretty_docx, tmp_path / "plain.docx")
+
+    assert zip_members(output) == zip_members(tmp_path / "plain.docx")
+    assert sorted(name for name, _ in stats.copied) == [
+        "[Content_Types].xml",
+        "_rels/.rels",
+        "word/_rels/document.xml.rels",
+        "word/media/image1.png",
+    ]
+    assert [entry[0] for entry in stats.compressed] == ["word/document.xml"]
+
+
+def test_repack_without_raw_copy_support_recompresses(monkeypatch, repack):
+    incremental, _ = repack("incremental.docx")
+    missing = (*packing._RAW_COPY_ATTRIBUTES, "_no_such_attribute")
+    monkeypatch.setattr(packing, "_RAW_COPY_ATTRIBUTES", missing)
+
+    output, stats = repack("fallback.docx")
+
+    assert stats.copied == []
+    assert len(stats.compressed) == 5
+    assert zip_members(output) == zip_members(incremental)
+
+
+def test_command_line_repack_from_original(tmp_path, pretty_docx):
+    original = tmp_path / "original.docx"
+    pack_directory(pretty_docx, original)
+
+    output = tmp_path / "out.docx"
+    result = run_script(
+        OOXML_SCRIPTS_DIR / "pack.py", pretty_docx, output, "--force", "--original", original
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "Reused 5 unchanged member(s)" in result.stdout
+    assert zip_members(output) == zip_members(original)
+
+
+def test_recompressed_members_are_listed_only_with_verbose(tmp_path, pretty_docx):
+    original = tmp_path / "original.docx"
+    pack_directory(pretty_docx, original)
+    document = pretty_docx / "word" / "document.xml"
+    document.write_text(document.read_text().replace("two", "edited"))
+    args = ("--force", "--original", original)
+
+    quiet = run_script(OOXML_SCRIPTS_DIR / "pack.py", pretty_docx, tmp_path / "q.docx", *args)
+    verbose = run_script(
+        OOXML_SCRIPTS_DIR / "pack.py", pretty_docx, tmp_path / "v.docx", *args, "--verbose"
+    )
+
+    assert "Reused 4 unchanged member(s)" in quiet.stdout
+    assert "recompressed 1 member(s)" in quiet.stdout
+    assert "  recompressed word/document.xml" not in quiet.stdout
+    assert "  recompressed word/document.xml" in verbose.stdout
+
+
+def test_report_lists_recompressed_members(tmp_path, pretty_docx):
+    original = tmp_path / "original.docx"
+    pack_directory(pretty_docx, original)
+    document = pretty_docx / "word" / "document.xml"
+    document.write_text(document.read_text().replace("two", "edited"))
+
+    result = run_script(
+        SCRIPTS_DIR / "pack.py",
+        pretty_docx,
+        tmp_path / "out.docx",
+        "--original",
+        original,
+        "--validate",
+        "false",
+        "--incremental",
+        "--report",
+        "json",
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "  recompressed word/document.xml" not in result.stderr
+    members = json.loads(result.stdout)["pack_members"]
+    assert members["recompressed"]["names"] == ["word/document.xml"]
+    assert members["copied"]["members"] == 4
+
+
+def test_media_is_stored_and_the_rest_deflated(tmp_path, pretty_docx):
+    (pretty_docx / "word" / "embeddings").mkdir()
+    (pretty_docx / "word" / "embeddings" / "object.bin").write_bytes(b"abc" * 1000)
+
+    pack_directory(pretty_docx, tmp_path / "out.docx")
+
+    members = zip_members(tmp_path / "out.docx")
+    assert members["word/media/image1.png"][0] == zipfile.ZIP_STORED
+    assert members["word/embeddings/object.bin"][0] == zipfile.ZIP_DEFLATED
+    assert members["word/document.xml"][0] == zipfile.ZIP_DEFLATED
+
+
+def test_deflate_level_applies_to_every_deflated_member(tmp_path, pretty_docx):
+    (pretty_docx / "word" / "embeddings").mkdir()
+    (pretty_docx / "word" / "embeddings" / "object.bin").write_bytes(b"abc" * 1000)
+
+    sizes = {}
+    for level in (0, 9):
+        output = tmp_path / f"level{level}.docx"
+        pack_directory(pretty_docx, output, policy=CompressionPolicy(level))
+        with zipfile.ZipFile(output) as zf:
+            sizes[level] = {info.filename: info.compress_size for info in zf.infolist()}
+
+    for name in ("word/document.xml", "word/embeddings/object.bin"):
+        assert sizes[0][name] > sizes[9][name]
+    assert sizes[0]["word/media/image1.png"] == sizes[9]["word/media/image1.png"]
+
+
+
+def test_files_over_the_buffer_limit_are_streamed(tmp_path, pretty_docx, monkeypatch):
+    (pretty_docx / "word" / "embeddings").mkdir()
+    payload = bytes(range(256)) * 64 + b"abc" * 10_000
+    (pretty_docx / "word" / "embeddings" / "object.bin").write_bytes(payload)
+    monkeypatch.setattr(packing, "MAX_BUFFERED_SIZE", 1000)
+    read_whole = []
+    read_bytes = packing.Path.read_bytes
+    monkeypatch.setattr(
+        packing.Path, "read_bytes", lambda path: read_whole.append(path.name) or read_bytes(path)
+    )
+
+    sizes = {}
+    for level in (0, DEFAULT_LEVEL, 9):
+        output = tmp_path / f"level{level}.docx"
+        pack_directory(pretty_docx, output, policy=CompressionPolicy(level))
+        members = zip_members(output)
+        assert members["word/embeddings/object.bin"] == (zipfile.ZIP_DEFLATED, payload)
+        with zipfile.ZipFile(output) as zf:
+            sizes[level] = zf.getinfo("word/embeddings/object.bin").compress_size
+
+    assert "object.bin" not in read_whole
+    assert sizes[0] == sizes[DEFAULT_LEVEL] == sizes[9]  # Streamed at the default level
+
+def test_reproducible_packs_are_byte_identical(tmp_path, pretty_docx):
+    first = tmp_path / "first.docx"
+    run_script(OOXML_SCRIPTS_DIR / "pack.py", pretty_docx, first, "--force", "--reproducible")
+    for path in pretty_docx.rglob("*"):
+        os.utime(path, (1_000_000_000, 1_000_000_000))
+        if path.is_file():
+            path.chmod(0o600)
+    second = tmp_path / "second.docx"
+    pack_directory(pretty_docx, second, jobs=2, policy=CompressionPolicy(reproducible=True))
+
+    assert first.read_bytes() == second.read_bytes()
+    with zipfile.ZipFile(first) as zf:
+        names = zf.namelist()
+        assert {info.date_time for info in zf.infolist()} == {(1980, 1, 1, 0, 0, 0)}
+    assert names[0] == "[Content_Types].xml"
+    assert names[1:] == sorted(names[1:])
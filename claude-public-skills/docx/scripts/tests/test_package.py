@@ -0,0 +1,133 @@
+import lxml.etree
+import pytest
+from conftest import DOCUMENT_RELS, W_NS, docx_parts, write_directory
+from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.package import (
+    PackageIndex,
+    rels_part_for,
+    source_part_for,
+)
+
+IMAGE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+HYPERLINK = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink"
+)
+
+RELATIONSHIPS = (
+    f'<Relationship Id="rId1" Type="{IMAGE}" Target="media/a.png"/>'
+    f'<Relationship Id="rId2" Type="{IMAGE}" Target="/word/media/../media/b.png"/>'
+    f'<Relationship Id="rId3" Type="{HYPERLINK}" Target="https://example.com"/>'
+    f'<Relationship Id="rId4" Type="{HYPERLINK}" Target="x.docx" TargetMode="External"/>'
+)
+
+
+@pytest.fixture
+def index(tmp_path):
+    root = write_directory(
+        tmp_path / "package",
+        docx_parts(
+            relationships=RELATIONSHIPS,
+            extra={
+                "word/media/a.png": b"png",
+                "word/media/b.png": b"png",
+                "word/orphan.xml": f'<w:hdr xmlns:w="{W_NS}"><unclosed',
+            },
+        ),
+    )
+    return PackageIndex(root, lambda path: lxml.etree.parse(str(path)))
+
+
+def test_part_names():
+    assert rels_part_for("word/document.xml") == "word/_rels/document.xml.rels"
+    assert rels_part_for("") == "_rels/.rels"
+    assert source_part_for("word/_rels/document.xml.rels") == "word/document.xml"
+    assert source_part_for("_rels/.rels") == ""
+
+
+def test_files_are_indexed_by_part_name(index):
+    assert set(index.files) == {
+        "[Content_Types].xml",
+        "_rels/.rels",
+        "word/document.xml",
+        "word/_rels/document.xml.rels",
+        "word/media/a.png",
+        "word/media/b.png",
+        "word/orphan.xml",
+    }
+    assert index.parts_in("word/media", ".png") == ["word/media/a.png", "word/media/b.png"]
+    assert index.part_name(index.files["word/document.xml"]) == "word/document.xml"
+
+
+def test_relationship_targets_are_resolved(index):
+    relationships = index.relationships_from("word/document.xml")
+
+    assert [(rel.id, rel.part, rel.external) for rel in relationships] == [
+        ("rId1", "word/media/a.png", False),
+        ("rId2", "word/media/b.png", False),
+        ("rId3", None, True),
+        ("rId4", None, True),
+    ]
+    assert relationships[0].line == 2
+    assert index.relationships_from("word/media/a.png") == []
+
+
+def test_reachable_parts_follow_the_relationship_graph(index):
+    assert index.reachable_parts() == {
+        "word/document.xml",
+        "word/media/a.png",
+        "word/media/b.png",
+    }
+
+
+def test_content_types(index):
+    defaults, overrides = index.content_types()
+    assert defaults["png"] == "image/png"
+    assert "word/document.xml" in overrides
+
+
+def test_root_tag_reads_only_the_start_of_a_part(index):
+    assert index.root_tag("word/orphan.xml") == f"{{{W_NS}}}hdr"
+
+
+def test_parse_errors_are_raised_on_every_call(tmp_path):
+    root = write_directory(
+        tmp_path / "package", {"word/_rels/document.xml.rels": "<Relationships"}
+    )
+    index = PackageIndex(root, lambda path: lxml.etree.parse(str(path)))
+
+    for _ in range(2):
+        with pytest.raises(lxml.etree.XMLSyntaxError):
+            index.relationships("word/_rels/document.xml.rels")
+    with pytest.raises(KeyError):
+        index.content_types()
+
+
+def test_package_checks_use_the_index(tmp_path, original_docx, capsys):
+    parts = docx_parts(
+        relationships=f'<Relationship Id="rId1" Type="{IMAGE}" Target="media/gone.png"/>',
+        extra={"word/media/orphan.gif": b"gif"},
+    )
+    unpacked = write_directory(tmp_path / "unpacked", parts)
+    validator = DOCXSchemaValidator(unpacked, original_docx)
+    try:
+        assert validator.validate_file_references() is False
+        assert validator.validate_content_types() is False
+    finally:
+        validator.close()
+
+    output = capsys.readouterr().out
+    assert "word/_rels/document.xml.rels: Line 2: Broken reference to media/gone.png" in output
+    assert "word/media/orphan.gif: Unreferenced file" in output
+    assert "extension 'gif' not declared" in output
+
+
+def test_rels_parts_are_not_reported_as_unreferenced(unpacked_docx, original_docx):
+    (unpacked_docx / "word" / "_rels" / "document.xml.rels").write_text(
+        DOCUMENT_RELS.format(relationships="")
+    )
+    validator = DOCXSchemaValidator(unpacked_docx, original_docx)
+    try:
+        assert validator.validate_file_references()
+        assert validator.validate_content_types()
+    finally:
+        validator.close()
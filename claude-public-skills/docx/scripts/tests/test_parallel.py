@@ -0,0 +1,71 @@
+import pytest
+from conftest import docx_parts, document_xml, validate, write_directory
+from ooxml.scripts.validation import runner
+from ooxml.scripts.validation.base import BaseSchemaValidator
+from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.redlining import RedliningValidator
+
+
+@pytest.fixture
+def broken_docx(tmp_path):
+    """Several parts with well-formedness and ID errors."""
+    duplicate = '<w:p><w:bookmarkStart w:id="1" w:name="a"/></w:p>' * 2
+    return write_directory(
+        tmp_path / "broken",
+        docx_parts(
+            document_xml(duplicate),
+            extra={
+                "word/header1.xml": "<w:hdr",
+                "word/footer1.xml": "<w:ftr>",
+                "word/notes.xml": document_xml(duplicate),
+            },
+        ),
+    )
+
+
+def test_jobs_do_not_change_the_output(broken_docx, original_docx):
+    sequential = validate(broken_docx, original_docx, "--no-cache")
+    parallel = validate(broken_docx, original_docx, "--no-cache", "--jobs", "3")
+
+    assert sequential.returncode == parallel.returncode == 1
+    assert "XML violations" in sequential.stdout
+    assert parallel.stdout == sequential.stdout
+
+
+def test_per_part_results_come_back_in_order(unpacked_docx, original_docx):
+    for name in "abcdef":
+        (unpacked_docx / "word" / f"{name}.xml").write_text(f"<{name}")
+    validator = DOCXSchemaValidator(unpacked_docx, original_docx, jobs=3)
+    try:
+        errors = validator._map_parts("_check_well_formed", validator.xml_files)
+    finally:
+        validator.close()
+
+    expected = [validator._check_well_formed(f) for f in validator.xml_files]
+    assert errors == expected
+    assert validator._pool is None
+
+
+def test_validators_are_closed_when_a_check_raises(
+    unpacked_docx, original_docx, monkeypatch
+):
+    closed = []
+
+    def close(self):
+        closed.append(type(self).__name__)
+
+    def run(self, validators):
+        raise RuntimeError("check crashed")
+
+    monkeypatch.setattr(BaseSchemaValidator, "close", close)
+    monkeypatch.setattr(RedliningValidator, "close", close)
+    monkeypatch.setattr(runner.CheckScheduler, "run", run)
+
+    with pytest.raises(RuntimeError):
+        runner.validate_path(unpacked_docx, original_docx, jobs=2)
+    assert closed == ["DOCXSchemaValidator", "RedliningValidator"]
+
+    closed.clear()
+    with pytest.raises(RuntimeError):
+        runner.validate_for_pack(unpacked_docx, original_docx)
+    assert closed == ["DOCXSchemaValidator", "RedliningValidator"]
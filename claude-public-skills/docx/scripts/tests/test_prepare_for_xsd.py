@@ -0,0 +1,74 @@
+import legacy
+import lxml.etree
+import pytest
+from conftest import R_NS, W_NS, docx_parts
+from ooxml.scripts.validation.docx import DOCXSchemaValidator
+
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+W14_NS = "http://schemas.microsoft.com/office/word/2010/wordml"
+
+NAMESPACES = f'xmlns:w="{W_NS}" xmlns:r="{R_NS}" xmlns:mc="{MC_NS}" xmlns:w14="{W14_NS}"'
+
+DOCUMENTS = {
+    "template tags": (
+        f"<w:document {NAMESPACES}><w:body>{{{{ body }}}}<w:p>"
+        "<w:r><w:t>keep {{ tag }}</w:t></w:r>{{ tail }}<w:r><w:t>x</w:t></w:r>"
+        "</w:p>{{a}} and {{b}}</w:body></w:document>"
+    ),
+    "ignorable namespaces": (
+        f'<w:document {NAMESPACES} mc:Ignorable="w14"><w:body>'
+        '<w:p w14:paraId="1A2B3C4D" w14:textId="77777777"><w:r><w:t>a</w:t></w:r></w:p>'
+        "<w14:foreign><w:p><w:r><w:t>inside</w:t></w:r></w:p></w14:foreign>"
+        "<w:p><w14:nested w14:x=\"1\"/>tail {{ tag }}</w:p>"
+        "</w:body></w:document>"
+    ),
+    "comments and processing instructions": (
+        f"<w:document {NAMESPACES}><!-- {{{{ c }}}} --><w:body><?pi {{{{ x }}}}?>"
+        "<w:p/><!-- c -->{{ after comment }}</w:body></w:document>"
+    ),
+    "unprefixed elements": '<a xmlns:x="urn:x" x:attr="1"><t>{{ kept }}</t><b>{{ gone }}</b></a>',
+    "foreign root": f'<w14:root xmlns:w14="{W14_NS}" xmlns:w="{W_NS}"><w:p/><w14:x/></w14:root>',
+}
+
+
+def canonical(xml_doc):
+    # Canonical XML does not tell <b/> from <b></b>, as schema validation does not
+    return lxml.etree.tostring(xml_doc, method="c14n")
+
+
+@pytest.fixture(scope="module")
+def validator():
+    return DOCXSchemaValidator.__new__(DOCXSchemaValidator)
+
+
+@pytest.mark.parametrize("text", DOCUMENTS.values(), ids=DOCUMENTS.keys())
+@pytest.mark.parametrize("clean_namespaces", [False, True])
+def test_matches_the_old_pipeline(validator, text, clean_namespaces):
+    xml_doc = lxml.etree.ElementTree(lxml.etree.fromstring(text))
+    before = lxml.etree.tostring(xml_doc)
+
+    prepared = validator._prepare_for_xsd(xml_doc, clean_namespaces)
+    expected = legacy.prepare_for_xsd(validator, xml_doc, clean_namespaces)
+
+    assert canonical(prepared) == canonical(expected)
+    assert lxml.etree.tostring(xml_doc) == before
+
+
+@pytest.mark.parametrize("name, text", docx_parts().items())
+def test_package_parts_match_the_old_pipeline(validator, name, text):
+    xml_doc = lxml.etree.ElementTree(lxml.etree.fromstring(text.encode()))
+    prepared = validator._prepare_for_xsd(xml_doc, True)
+    expected = legacy.prepare_for_xsd(validator, xml_doc, True)
+    assert canonical(prepared) == canonical(expected)
+
+
+def test_what_is_removed(validator):
+    xml_doc = lxml.etree.ElementTree(
+        lxml.etree.fromstring(DOCUMENTS["ignorable namespaces"])
+    )
+    root = validator._prepare_for_xsd(xml_doc, True).getroot()
+
+    assert f"{{{MC_NS}}}Ignorable" not in root.attrib
+    assert not any(W14_NS in elem.tag for elem in root.iter())
+    assert not any(W14_NS in name for elem in root.iter() for name in elem.keys())
+    assert "{{" not in lxml.etree.tostring(root, encoding="unicode")
@@ -0,0 +1,112 @@
+import io
+
+import pytest
+from conftest import W_NS, docx_parts, document_xml, paragraph, write_directory, write_package
+from ooxml.scripts.validation.redlining import ParagraphStream, RedliningValidator
+
+
+def _run(text):
+    return f'<w:r><w:t xml:space="preserve">{text}</w:t></w:r>'
+
+
+def _ins(content, author="Claude"):
+    return f'<w:ins w:id="1" w:author="{author}">{content}</w:ins>'
+
+
+def _del(text, author="Claude"):
+    return (
+        f'<w:del w:id="2" w:author="{author}"><w:r>'
+        f'<w:delText xml:space="preserve">{text}</w:delText></w:r></w:del>'
+    )
+
+
+def _stream(*paragraphs):
+    body = "".join(paragraphs)
+    document = f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'
+    return ParagraphStream(io.BytesIO(document.encode()), "Claude")
+
+
+def test_author_changes_are_rejected():
+    stream = _stream(
+        f"<w:p>{_run('keep ')}{_ins(_run('added '))}{_del('removed ')}{_run('end')}</w:p>",
+        f"<w:p>{_ins(_run('other '), author='Someone')}{_del('gone', author='Someone')}</w:p>",
+    )
+
+    assert list(stream) == ["keep removed end", "other "]
+    assert stream.tracked_changes == 2
+
+
+def test_empty_and_inserted_paragraphs_are_skipped():
+    stream = _stream(
+        "<w:p/>",
+        f"<w:p>{_ins(_run('only inserted'))}</w:p>",
+        f"<w:p>{_run('text')}</w:p>",
+    )
+    assert list(stream) == ["text"]
+
+
+def test_nested_paragraphs_count_for_both():
+    stream = _stream(
+        f"<w:p>{_run('outer ')}<w:r><w:txbxContent><w:p>{_run('inner')}</w:p>"
+        "</w:txbxContent></w:r></w:p>"
+    )
+    assert list(stream) == ["outer inner", "inner"]
+
+
+def test_fingerprints_follow_the_text():
+    first = list(_stream(paragraph("a"), paragraph("b")).fingerprints())
+    same = list(_stream(paragraph("a"), f"<w:p>{_del('b')}</w:p>").fingerprints())
+    changed = list(_stream(paragraph("a"), paragraph("c")).fingerprints())
+
+    assert first == same
+    assert first[0] == changed[0] and first[1] != changed[1]
+
+
+@pytest.fixture
+def original(tmp_path):
+    parts = docx_parts(document_xml(paragraph("First paragraph."), paragraph("Second.")))
+    return write_package(tmp_path / "original.docx", parts)
+
+
+def _check(tmp_path, original, *paragraphs, **kwargs):
+    unpacked = write_directory(tmp_path / "edited", docx_parts(document_xml(*paragraphs)))
+    return RedliningValidator(unpacked, original, **kwargs).validate_tracked_changes()
+
+
+def test_properly_tracked_changes_pass(tmp_path, original, capsys):
+    edited = (
+        f"<w:p>{_run('First ')}{_del('paragraph')}{_ins(_run('line'))}{_run('.')}</w:p>",
+        paragraph("Second."),
+    )
+    assert _check(tmp_path, original, *edited, verbose=True)
+    assert "PASSED - All changes by Claude are properly tracked" in capsys.readouterr().out
+
+
+def test_documents_without_tracked_changes_pass(tmp_path, original):
+    assert _check(tmp_path, original, paragraph("Rewritten without tracking."))
+
+
+def test_untracked_edits_fail_with_a_diff(tmp_path, original, capsys):
+    edited = (
+        paragraph("First paragraph, edited."),
+        f"<w:p>{_run('Second.')}{_ins(_run(' More.'))}</w:p>",
+    )
+    assert not _check(tmp_path, original, *edited)
+
+    output = capsys.readouterr().out
+    assert output.startswith(f"FAILED - {RedliningValidator.TEXT_MISMATCH}\n")
+    assert "First paragraph{+, edited+}." in output
+
+
+def test_without_show_diff_only_the_failure_is_printed(tmp_path, original, capsys):
+    edited = (paragraph("Changed."), f"<w:p>{_ins(_run('x'))}</w:p>")
+    assert not _check(tmp_path, original, *edited, show_diff=False)
+    assert capsys.readouterr().out == f"FAILED - {RedliningValidator.TEXT_MISMATCH}\n"
+
+
+def test_original_without_document_xml(tmp_path, capsys):
+    original = write_package(tmp_path / "original.docx", {"other.xml": "<a/>"})
+
+    assert _check(tmp_path, original, paragraph("No tracked changes"))
+    assert not _check(tmp_path, original, f"<w:p>{_ins(_run('x'))}</w:p>")
+    assert "Original document.xml not found" in capsys.readouterr().out
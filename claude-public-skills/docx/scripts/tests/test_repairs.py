@@ -0,0 +1,106 @@
+import lxml.etree
+import pytest
+from conftest import W_NS, document_xml
+from ooxml.scripts.validation.docx import DOCXSchemaValidator
+
+W16CID_NS = "http://schemas.microsoft.com/office/word/2016/wordml/cid"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+COMMENTS_IDS = (
+    f'<w16cid:commentsIds xmlns:w16cid="{W16CID_NS}">'
+    '<w16cid:commentId w16cid:paraId="00000001" w16cid:durableId="{durable_id}"/>'
+    "</w16cid:commentsIds>"
+)
+
+
+@pytest.fixture
+def make_validator(unpacked_docx, original_docx):
+    """Build the validator once the test has written its parts."""
+    validators = []
+
+    def make():
+        validators.append(DOCXSchemaValidator(unpacked_docx, original_docx))
+        return validators[-1]
+
+    yield make
+    for validator in validators:
+        validator.close()
+
+
+def test_whitespace_repair(make_validator, unpacked_docx, capsys):
+    document = unpacked_docx / "word" / "document.xml"
+    document.write_text(document_xml("<w:p><w:r><w:t> lead</w:t></w:r></w:p>"))
+
+    validator = make_validator()
+    assert validator.repair() == 1
+
+    (text,) = lxml.etree.parse(str(document)).iter(f"{{{W_NS}}}t")
+    assert text.get(XML_SPACE) == "preserve"
+    assert "Repaired: document.xml" in capsys.readouterr().out
+    assert validator.validate_whitespace_preservation()
+
+
+@pytest.mark.parametrize("durable_id", ["FFFFFFFF", "XYZ"])
+def test_durable_id_repair(make_validator, unpacked_docx, durable_id):
+    comments_ids = unpacked_docx / "word" / "commentsIds.xml"
+    comments_ids.write_text(COMMENTS_IDS.format(durable_id=durable_id))
+
+    validator = make_validator()
+    assert validator.repair() == 1
+
+    (comment,) = lxml.etree.parse(str(comments_ids)).getroot()
+    repaired = comment.get(f"{{{W16CID_NS}}}durableId")
+    assert repaired != durable_id
+    assert int(repaired, 16) < 0x7FFFFFFF
+
+
+def test_all_repairs_in_one_pass_per_part(make_validator, unpacked_docx):
+    comments_ids = unpacked_docx / "word" / "commentsIds.xml"
+    comments_ids.write_text(
+        COMMENTS_IDS.format(durable_id="FFFFFFFF").replace(
+            "</w16cid:commentsIds>",
+            f'<w:t xmlns:w="{W_NS}">trailing </w:t></w16cid:commentsIds>',
+        )
+    )
+    validator = make_validator()
+    assert validator.repair() == 2
+
+
+def test_unchanged_parts_are_not_rewritten(make_validator):
+    validator = make_validator()
+    before = {f: (f.read_bytes(), f.stat().st_mtime_ns) for f in validator.xml_files}
+
+    assert validator.repair() == 0
+
+    assert before == {
+        f: (f.read_bytes(), f.stat().st_mtime_ns) for f in validator.xml_files
+    }
+
+
+def test_repairs_invalidate_the_parse_cache(make_validator, unpacked_docx):
+    document = unpacked_docx / "word" / "document.xml"
+    document.write_text(document_xml("<w:p><w:r><w:t> lead</w:t></w:r></w:p>"))
+    validator = make_validator()
+    assert validator._scan(document).unpreserved_whitespace != []
+
+    validator.repair()
+
+    assert validator._scan(document).unpreserved_whitespace == []
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '<!DOCTYPE w:t [<!ENTITY e "x">]><w:t xmlns:w="urn:w"> &e;</w:t>',
+        '<w:t xmlns:w="urn:w"> unclosed',
+    ],
+)
+def test_parts_with_entities_or_syntax_errors_are_left_alone(
+    make_validator, unpacked_docx, content
+):
+    part = unpacked_docx / "word" / "odd.xml"
+    part.write_text(content)
+
+    validator = make_validator()
+    assert validator.repair() == 0
+    assert part.read_text() == content
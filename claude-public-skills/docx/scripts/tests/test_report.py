@@ -0,0 +1,98 @@
+import json
+
+import pytest
+from conftest import document_xml, validate
+from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.report import (
+    CheckError,
+    ValidationReport,
+    print_failure,
+    record_errors,
+)
+
+
+def test_check_error_text():
+    assert str(CheckError("word/a.xml", 3, "x", "msg")) == "  word/a.xml: Line 3: msg"
+    assert str(CheckError("word/a.xml", None, "x", "msg")) == "  word/a.xml: msg"
+    assert str(CheckError(None, None, "x", "msg")) == "  msg"
+
+
+def test_print_failure_prints_and_records(capsys):
+    errors = [CheckError("a.xml", 1, "x", "one"), CheckError("b.xml", None, "y", "two")]
+
+    def check():
+        print_failure("Found 2 errors:", errors + ["  ... and 1 more"])
+        return False
+
+    report = ValidationReport(echo=False)
+    assert report.run(check) is False
+
+    (entry,) = report.checks
+    assert entry["errors"] == [error.to_dict() for error in errors]
+    assert entry["output"] == [
+        "FAILED - Found 2 errors:",
+        "  a.xml: Line 1: one",
+        "  b.xml: two",
+        "  ... and 1 more",
+    ]
+    assert capsys.readouterr().out == ""
+
+
+def test_single_error_failure(capsys):
+    print_failure(None, [CheckError("a.xml", None, "missing", "a.xml not found")])
+    assert capsys.readouterr().out == "FAILED - a.xml not found\n"
+
+
+def test_errors_are_only_recorded_inside_a_report_run():
+    record_errors([CheckError(None, None, "x", "outside")])
+
+    report = ValidationReport(echo=False)
+    report.run(lambda: True)
+    assert report.checks[0]["errors"] == []
+
+
+def test_check_records_match_their_text(unpacked_docx, original_docx):
+    (unpacked_docx / "word" / "document.xml").write_text(
+        document_xml("<w:p><w:r><w:t>trailing </w:t></w:r></w:p>")
+    )
+    report = ValidationReport(echo=False)
+    validator = DOCXSchemaValidator(unpacked_docx, original_docx)
+    try:
+        report.run(validator.validate_whitespace_preservation)
+    finally:
+        validator.close()
+
+    (entry,) = report.checks
+    (error,) = entry["errors"]
+    assert error["part"] == "word/document.xml"
+    assert error["line"] == 2
+    assert error["code"] == "unpreserved_whitespace"
+    assert str(CheckError(**error)) in entry["output"]
+
+
+@pytest.mark.parametrize(
+    "part, content, check, expected",
+    [
+        ("word/broken.xml", "<w:hdr", "validate_xml", ("word/broken.xml", 1, "not_well_formed")),
+        (
+            "word/document.xml",
+            document_xml(
+                '<w:bookmarkStart w:id="5" w:name="a"/><w:bookmarkStart w:id="5" w:name="b"/>'
+            ),
+            "validate_unique_ids",
+            ("word/document.xml", 2, "duplicate_id"),
+        ),
+    ],
+)
+def test_json_report_lists_errors_by_check(
+    part, content, check, expected, unpacked_docx, original_docx
+):
+    (unpacked_docx / part).write_text(content)
+
+    result = validate(unpacked_docx, original_docx, "--report", "json", "--no-cache")
+    assert result.returncode == 1
+    checks = {entry["name"]: entry for entry in json.loads(result.stdout)["checks"]}
+
+    (error,) = checks[check]["errors"]
+    assert (error["part"], error["line"], error["code"]) == expected
+    assert all(not entry["errors"] for entry in checks.values() if entry["passed"])
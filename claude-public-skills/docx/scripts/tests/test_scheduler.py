@@ -0,0 +1,156 @@
+import json
+
+import pytest
+from conftest import document_xml, validate
+from ooxml.scripts.validation.cache import ResultCache
+from ooxml.scripts.validation.report import ValidationReport
+from ooxml.scripts.validation.scheduler import COSTS_FILE, CheckScheduler
+
+
+class FakeValidator:
+    """Validator whose checks pass unless listed in failing."""
+
+    CHECKS = ("validate_xml", "validate_against_xsd", "validate_a", "validate_b")
+
+    def __init__(self, failing=(), parts=("word/document.xml",)):
+        self.failing = set(failing)
+        self.parts = set(parts)
+        self.ran = []
+
+    def limit_parts(self, parts):
+        return bool(self.parts & set(parts))
+
+    def __getattr__(self, name):
+        if not name.startswith("validate_"):
+            raise AttributeError(name)
+
+        def check():
+            self.ran.append(name)
+            return name not in self.failing
+
+        check.__name__ = name
+        return check
+
+
+def _write_costs(cache_dir, costs):
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    (cache_dir / COSTS_FILE).write_text(
+        json.dumps({"version": 1, "costs": {f"FakeValidator.{k}": v for k, v in costs.items()}})
+    )
+
+
+def test_default_runs_keep_declared_order(cache_dir, capsys):
+    validator = FakeValidator(failing={"validate_against_xsd"})
+    scheduler = CheckScheduler(result_cache=ResultCache(cache_dir))
+
+    assert scheduler.run([validator]) is False
+    assert validator.ran == list(FakeValidator.CHECKS)
+    assert scheduler.complete
+    assert capsys.readouterr().out == ""
+
+
+def test_default_runs_neither_read_nor_write_costs(cache_dir):
+    _write_costs(cache_dir, {"validate_b": 1.0})
+    before = (cache_dir / COSTS_FILE).read_text()
+
+    scheduler = CheckScheduler(result_cache=ResultCache(cache_dir))
+    scheduler.run([FakeValidator()])
+
+    assert scheduler.costs.estimate(FakeValidator(), "validate_b", 1.0) is None
+    assert (cache_dir / COSTS_FILE).read_text() == before
+
+
+def test_scheduled_runs_persist_costs(cache_dir):
+    CheckScheduler(result_cache=ResultCache(cache_dir), fail_fast=True).run([FakeValidator()])
+
+    costs = json.loads((cache_dir / COSTS_FILE).read_text())["costs"]
+    assert set(costs) == {f"FakeValidator.{check}" for check in FakeValidator.CHECKS}
+
+
+def test_only_runs_leave_costs_unchanged(cache_dir):
+    _write_costs(cache_dir, {"validate_a": 0.5, "validate_b": 0.002})
+    before = (cache_dir / COSTS_FILE).read_text()
+
+    scheduler = CheckScheduler(
+        result_cache=ResultCache(cache_dir), only=["word/document.xml"]
+    )
+    scheduler.run([FakeValidator()])
+
+    assert scheduler.costs.estimate(FakeValidator(), "validate_a", 2.0) == 1.0
+    assert (cache_dir / COSTS_FILE).read_text() == before
+
+
+def test_failed_gate_skips_the_validator(capsys):
+    validator = FakeValidator(failing={"validate_xml"})
+    scheduler = CheckScheduler()
+
+    assert scheduler.run([validator]) is False
+    assert validator.ran == ["validate_xml"]
+    assert not scheduler.complete
+    assert capsys.readouterr().out == ""  # Only scheduled runs print a summary
+
+
+def test_fail_fast_runs_cheapest_first_and_xsd_last(cache_dir, capsys):
+    _write_costs(cache_dir, {"validate_a": 5.0, "validate_b": 0.001, "validate_against_xsd": 0.001})
+    validator = FakeValidator(failing={"validate_b"})
+    report = ValidationReport(echo=False)
+    scheduler = CheckScheduler(report, ResultCache(cache_dir), fail_fast=True)
+
+    assert scheduler.run([validator]) is False
+    assert validator.ran == ["validate_xml", "validate_b"]
+
+    output = capsys.readouterr().out
+    assert "SKIPPED - 2 check(s) not run after the first failure (--fail-fast)" in output
+    assert "INCOMPLETE" in output
+    schedule = report.info["schedule"]
+    assert schedule["complete"] is False
+    assert [entry["name"] for entry in schedule["skipped"]] == [
+        "validate_a",
+        "validate_against_xsd",
+    ]
+
+
+def test_time_budget_defers_expensive_checks(cache_dir, capsys):
+    _write_costs(cache_dir, {"validate_a": 100.0})
+    validator = FakeValidator()
+    scheduler = CheckScheduler(result_cache=ResultCache(cache_dir), time_budget=10)
+
+    assert scheduler.run([validator]) is True
+    assert "validate_a" not in validator.ran
+    assert "deferred, over the 10s time budget" in capsys.readouterr().out
+
+
+def test_only_limits_validators_to_their_parts(capsys):
+    document = FakeValidator(parts={"word/document.xml"})
+    other = FakeValidator(parts={"word/styles.xml"})
+    scheduler = CheckScheduler(only=["/word/document.xml"])
+
+    scheduler.run([document, other])
+
+    assert document.ran and not other.ran
+    assert scheduler.only == ["word/document.xml"]
+    assert "LIMITED - Per-part checks only covered: word/document.xml" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("args", [(), ("--fail-fast",)])
+def test_command_line(unpacked_docx, original_docx, cache_dir, args):
+    duplicate = '<w:p><w:bookmarkStart w:id="1" w:name="a"/></w:p>' * 2
+    (unpacked_docx / "word" / "document.xml").write_text(document_xml(duplicate))
+
+    result = validate(unpacked_docx, original_docx, *args)
+
+    assert result.returncode == 1
+    assert "Duplicate id='1'" in result.stdout
+    assert ("INCOMPLETE" in result.stdout) == bool(args)
+    assert (cache_dir / COSTS_FILE).exists() == bool(args)
+
+
+def test_command_line_only_keeps_estimates(unpacked_docx, original_docx, cache_dir):
+    assert validate(unpacked_docx, original_docx, "--fail-fast").returncode == 0
+    before = json.loads((cache_dir / COSTS_FILE).read_text())
+
+    for _ in range(3):
+        result = validate(unpacked_docx, original_docx, "--only", "word/document.xml")
+        assert result.returncode == 0, result.stdout
+
+    assert json.loads((cache_dir / COSTS_FILE).read_text()) == before
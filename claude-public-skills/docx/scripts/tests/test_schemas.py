@@ -0,0 +1,73 @@
+import lxml.etree
+import pytest
+from conftest import SCRIPTS_DIR, run_script
+from ooxml.scripts.validation.runner import validate_for_pack
+from ooxml.scripts.validation.schemas import SchemaRegistry
+
+SCHEMA = """<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+  <xs:element name="note" type="xs:string"/>
+</xs:schema>
+"""
+
+
+def test_schema_compiled_once(tmp_path):
+    xsd = tmp_path / "note.xsd"
+    xsd.write_text(SCHEMA)
+    registry = SchemaRegistry()
+
+    first = registry.get(xsd)
+    second = registry.get(tmp_path / "." / "note.xsd")
+
+    assert first is second
+    assert (registry.compiled, registry.hits) == (1, 1)
+    assert first.validate(lxml.etree.fromstring(b"<note>x</note>"))
+    assert "1 schema(s) compiled" in registry.summary()
+
+
+def test_broken_schema_error_is_remembered(tmp_path):
+    xsd = tmp_path / "broken.xsd"
+    xsd.write_text("<xs:schema")
+    registry = SchemaRegistry()
+
+    for _ in range(2):
+        with pytest.raises(lxml.etree.XMLSyntaxError):
+            registry.get(xsd)
+    assert registry.compiled == 1
+
+
+def test_clear_resets_statistics(tmp_path):
+    xsd = tmp_path / "note.xsd"
+    xsd.write_text(SCHEMA)
+    registry = SchemaRegistry()
+    registry.get(xsd)
+    registry.get(xsd)
+
+    registry.clear()
+
+    assert (registry.compiled, registry.hits, registry.compile_time) == (0, 0, 0.0)
+
+
+def test_pack_validation_prints_cache_statistics_only_when_verbose(
+    unpacked_docx, original_docx
+):
+    success, output = validate_for_pack(unpacked_docx, original_docx)
+    assert success
+    assert "Schema cache" not in output
+
+    success, output = validate_for_pack(unpacked_docx, original_docx, verbose=True)
+    assert success
+    assert "Schema cache" in output
+
+
+def test_pack_cli_verbose(tmp_path, unpacked_docx, original_docx):
+    output = tmp_path / "out.docx"
+    args = (unpacked_docx, output, "--original", original_docx)
+
+    quiet = run_script(SCRIPTS_DIR / "pack.py", *args)
+    verbose = run_script(SCRIPTS_DIR / "pack.py", *args, "-v")
+
+    assert quiet.returncode == 0, quiet.stderr
+    assert "Schema cache" not in quiet.stdout
+    assert verbose.returncode == 0, verbose.stderr
+    assert "Schema cache" in verbose.stdout
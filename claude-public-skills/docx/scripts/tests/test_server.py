@@ -0,0 +1,161 @@
+import contextlib
+import io
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+from conftest import document_xml, validate
+from ooxml.scripts.validation import client, server as server_module
+from ooxml.scripts.validation.baseline import BaselineRegistry
+from ooxml.scripts.validation.client import request
+from ooxml.scripts.validation.runner import validate_for_pack, validate_path
+from ooxml.scripts.validation.server import ValidationServer
+
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to about 100 bytes, so keep it short
+    with tempfile.TemporaryDirectory(prefix="ooxml-") as directory:
+        yield Path(directory) / "s.sock"
+
+
+@pytest.fixture
+def server(socket_path):
+    server = ValidationServer(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture
+def edited_docx(unpacked_docx):
+    duplicate = '<w:p><w:bookmarkStart w:id="1" w:name="a"/></w:p>' * 2
+    (unpacked_docx / "word" / "document.xml").write_text(document_xml(duplicate))
+    return unpacked_docx
+
+
+def _in_process(function, *args, **kwargs):
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        result = function(*args, **kwargs)
+    return result, stdout.getvalue()
+
+
+def test_no_server_means_no_response(socket_path):
+    assert request("validate", socket_path, path="/x", original="/y") is None
+
+
+def test_validate_matches_in_process_output(server, edited_docx, original_docx):
+    response = request(
+        "validate",
+        server.socket_path,
+        path=str(edited_docx),
+        original=str(original_docx),
+    )
+    success, output = _in_process(validate_path, edited_docx, original_docx)
+
+    assert not success
+    assert response["exit_code"] == 1
+    assert response["stdout"] == output
+    assert response["report"] is None
+    assert server.requests == 1
+
+
+def test_pack_validation_returns_output_and_report(server, unpacked_docx, original_docx):
+    response = request(
+        "pack-validation",
+        server.socket_path,
+        path=str(unpacked_docx),
+        original=str(original_docx),
+        report=True,
+    )
+
+    assert response["success"] is True
+    assert response["output"] == validate_for_pack(unpacked_docx, original_docx)[1]
+    assert response["report"]["success"] is True
+    assert response["report"]["checks"]
+
+
+def test_baselines_stay_warm_across_requests(server, edited_docx, original_docx):
+    for _ in range(2):
+        request(
+            "validate", server.socket_path, path=str(edited_docx), original=str(original_docx)
+        )
+    assert server.baselines.hits >= 1
+
+
+def test_unknown_commands_fall_back(server):
+    assert request("unknown", server.socket_path) is None
+    assert server.requests == 0
+
+
+def test_other_protocol_versions_fall_back(server, monkeypatch):
+    monkeypatch.setattr(client, "PROTOCOL_VERSION", client.PROTOCOL_VERSION + 1)
+    assert request("validate", server.socket_path, path="/x", original="/y") is None
+    assert server.requests == 0
+
+
+def test_handler_errors_become_a_failed_run(server, monkeypatch):
+    def crash(request, baselines):
+        raise RuntimeError("handler crashed")
+
+    monkeypatch.setitem(server_module.COMMANDS, "validate", crash)
+    response = request("validate", server.socket_path)
+
+    assert response["exit_code"] == 1
+    assert "RuntimeError: handler crashed" in response["stderr"]
+
+
+def test_one_server_per_socket(server, socket_path):
+    with pytest.raises(RuntimeError):
+        ValidationServer(socket_path)
+
+
+def test_stale_socket_files_are_replaced(socket_path):
+    first = ValidationServer(socket_path)
+    first.socket.close()  # Dies without removing its socket file
+    assert socket_path.exists()
+
+    second = ValidationServer(socket_path)
+    second.server_close()
+    assert not socket_path.exists()
+
+
+def test_cli_client_output_matches_in_process(server, edited_docx, original_docx):
+    in_process = validate(edited_docx, original_docx)
+    with_server = validate(
+        edited_docx, original_docx, "--server", "--socket", server.socket_path
+    )
+
+    assert server.requests == 1
+    assert with_server.returncode == in_process.returncode == 1
+    assert with_server.stdout == in_process.stdout
+
+
+def test_cli_client_falls_back_without_a_server(socket_path, edited_docx, original_docx):
+    in_process = validate(edited_docx, original_docx)
+    fallback = validate(edited_docx, original_docx, "--server", "--socket", socket_path)
+
+    assert fallback.returncode == in_process.returncode == 1
+    assert fallback.stdout == in_process.stdout
+
+
+def test_registry_keys_on_the_original_file(tmp_path):
+    registry = BaselineRegistry(max_entries=2)
+    original = tmp_path / "original.docx"
+    original.write_bytes(b"one")
+
+    memo = registry.errors_memo("DOCX", original)
+    assert registry.errors_memo("DOCX", original) is memo
+    assert registry.errors_memo("PPTX", original) is not memo
+    assert registry.hits == 1
+
+    original.write_bytes(b"changed")
+    assert registry.errors_memo("DOCX", original) is not memo
+    assert registry.errors_memo("DOCX", tmp_path / "missing.docx") == {}
+    assert len(registry._errors) == 2
+
@@ -0,0 +1,66 @@
+import lxml.etree
+import pytest
+from ooxml.scripts.validation.docx import DOCXSchemaValidator
+
+
+@pytest.fixture
+def validator(unpacked_docx, original_docx):
+    validator = DOCXSchemaValidator(unpacked_docx, original_docx)
+    yield validator
+    validator.close()
+
+
+def test_each_part_is_parsed_once(validator, unpacked_docx):
+    document = unpacked_docx / "word" / "document.xml"
+
+    first = validator._parse(document)
+    second = validator._parse(document)
+
+    assert first is second
+    assert validator.bytes_parsed == document.stat().st_size
+
+
+def test_parse_copy_is_private(validator, unpacked_docx):
+    document = unpacked_docx / "word" / "document.xml"
+
+    copy = validator._parse_copy(document)
+    copy.getroot().clear()
+
+    assert len(validator._parse(document).getroot()) == 1
+
+
+def test_parse_errors_are_cached_and_reraised(validator, unpacked_docx):
+    broken = unpacked_docx / "word" / "broken.xml"
+    broken.write_text("<a>")
+
+    for _ in range(2):
+        with pytest.raises(lxml.etree.XMLSyntaxError):
+            validator._parse(broken)
+    assert validator.bytes_parsed == broken.stat().st_size
+
+
+def test_invalidate_reparses_a_rewritten_part(validator, unpacked_docx):
+    document = unpacked_docx / "word" / "document.xml"
+    first = validator._parse(document)
+    validator._scan(document)
+
+    validator.invalidate(document)
+
+    assert validator._parse(document) is not first
+    assert document not in validator._scans
+
+
+def test_large_parts_are_not_kept(validator, unpacked_docx, monkeypatch):
+    monkeypatch.setattr(DOCXSchemaValidator, "LARGE_PART_BYTES", 10)
+    document = unpacked_docx / "word" / "document.xml"
+
+    assert validator._parse(document) is not validator._parse(document)
+
+
+def test_checks_share_one_parse_per_part(validator, unpacked_docx):
+    assert validator.validate()
+
+    parts = sum(f.stat().st_size for f in validator.xml_files)
+    # Every part is scanned once and parsed at most once more for the
+    # package-level and XSD checks
+    assert validator.bytes_parsed <= 2 * parts
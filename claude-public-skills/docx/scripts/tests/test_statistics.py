@@ -0,0 +1,72 @@
+import pytest
+from conftest import docx_parts, document_xml, paragraph, write_directory, write_package
+from ooxml.scripts.validation.docx import DOCXSchemaValidator
+
+SECTION = "<w:sectPr/>"
+TABLE = f"<w:tbl><w:tr><w:tc>{paragraph('cell')}</w:tc></w:tr></w:tbl>"
+
+ORIGINAL = document_xml(paragraph("a"), TABLE, paragraph("b"), SECTION)
+EDITED = document_xml(paragraph("a"), TABLE, TABLE, SECTION)
+
+
+@pytest.fixture
+def validator(tmp_path):
+    original = write_package(tmp_path / "original.docx", docx_parts(ORIGINAL))
+    unpacked = write_directory(tmp_path / "unpacked", docx_parts(EDITED))
+    validator = DOCXSchemaValidator(unpacked, original)
+    yield validator
+    validator.close()
+
+
+def test_original_counts_stream_from_the_zip(validator):
+    assert validator.document_statistics_in_original() == {
+        "Paragraphs": 3,
+        "Tables": 1,
+        "Sections": 1,
+    }
+    assert validator.count_paragraphs_in_original() == 3
+
+
+@pytest.mark.parametrize("parsed", [False, True])
+def test_unpacked_counts_match_with_and_without_a_shared_parse(validator, parsed):
+    if parsed:
+        validator._parse(validator.unpacked_dir / "word" / "document.xml")
+    assert validator.document_statistics_in_unpacked() == {
+        "Paragraphs": 3,
+        "Tables": 2,
+        "Sections": 1,
+    }
+    assert validator.count_paragraphs_in_unpacked() == 3
+
+
+def test_unpacked_counts_reuse_the_streaming_scan(validator):
+    document = validator.unpacked_dir / "word" / "document.xml"
+    scan = validator._scan(document)
+    bytes_parsed = validator.bytes_parsed
+
+    validator.document_statistics_in_unpacked()
+
+    assert validator._scans[document] is scan
+    assert validator.bytes_parsed == bytes_parsed
+
+
+def test_summary_lists_paragraphs_tables_and_sections(validator, capsys):
+    validator.compare_paragraph_counts()
+
+    assert capsys.readouterr().out.splitlines()[1:] == [
+        "Paragraphs: 3 → 3 (0)",
+        "Tables: 1 → 2 (+1)",
+        "Sections: 1 → 1 (0)",
+    ]
+
+
+def test_missing_original_document_counts_zero(tmp_path, unpacked_docx, capsys):
+    original = write_package(tmp_path / "empty.docx", {"[Content_Types].xml": "<Types/>"})
+    validator = DOCXSchemaValidator(unpacked_docx, original)
+    try:
+        counts = validator.document_statistics_in_original()
+    finally:
+        validator.close()
+
+    assert counts == {"Paragraphs": 0, "Tables": 0, "Sections": 0}
+    assert "Error counting paragraphs in original document" in capsys.readouterr().out
@@ -0,0 +1,128 @@
+import io
+
+import lxml.etree
+import pytest
+from conftest import R_NS, W_NS, document_xml
+from ooxml.scripts.validation.base import BaseSchemaValidator
+from ooxml.scripts.validation.docx import DOCXSchemaValidator
+from ooxml.scripts.validation.streaming import count_tags, scan_part
+
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+W14_NS = "http://schemas.microsoft.com/office/word/2010/wordml"
+
+DOCUMENT = f"""<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}" xmlns:mc="{MC_NS}"
+    xmlns:w14="{W14_NS}" mc:Ignorable="w14">
+<w:body>
+<w:p w14:paraId="1A2B3C4D"><w:r><w:t> lead</w:t></w:r></w:p>
+<w:bookmarkStart w:id="1" w:name="a"/>
+<w:bookmarkStart w:id="1" w:name="b"/>
+<mc:AlternateContent><w:bookmarkStart w:id="1" w:name="c"/></mc:AlternateContent>
+<w:del><w:r><w:t>deleted</w:t></w:r></w:del>
+<w:ins><w:r><w:delText>odd</w:delText></w:r></w:ins>
+<w:ins><w:del><w:r><w:delText>fine</w:delText></w:r></w:del></w:ins>
+<w:commentRangeStart w:id="0"/><w:commentRangeEnd w:id="0"/>
+<w:r><w:commentReference w:id="0"/></w:r>
+<w:p><w:hyperlink r:id="rId7"/></w:p>
+</w:body>
+</w:document>"""
+
+
+def _scan(text=DOCUMENT):
+    return scan_part(
+        io.BytesIO(text.encode()),
+        BaseSchemaValidator.UNIQUE_ID_REQUIREMENTS,
+        BaseSchemaValidator.EXCLUDED_ID_CONTAINERS,
+        DOCXSchemaValidator.SCAN_TRACKED_ATTRIBUTES,
+    )
+
+
+def test_scan_collects_what_the_checks_need():
+    scan = _scan()
+
+    assert scan.root_tag == f"{{{W_NS}}}document"
+    assert scan.root_attrib[f"{{{MC_NS}}}Ignorable"] == "w14"
+    assert scan.tag_counts[f"{{{W_NS}}}bookmarkStart"] == 3
+    assert scan.id_findings == [("file", 6, "bookmarkstart", "id", "1", 5)]
+    assert scan.relationship_refs == [(13, "hyperlink", "rId7")]
+    assert scan.tracked_attributes == [(4, f"{{{W14_NS}}}paraId", "1A2B3C4D")]
+    assert scan.unpreserved_whitespace == [(4, " lead")]
+    assert scan.text_in_deletions == [(8, "deleted")]
+    assert scan.deltext_in_insertions == [(9, "odd")]
+    assert scan.comment_range_starts == scan.comment_references == {"0"}
+
+
+def test_scan_matches_sourceline_of_a_full_parse():
+    root = lxml.etree.fromstring(DOCUMENT.encode())
+    bookmarks = root.iter(f"{{{W_NS}}}bookmarkStart")
+    lines = [elem.sourceline for elem in bookmarks]
+
+    _, line, _, _, _, first_line = _scan().id_findings[0]
+    assert (first_line, line) == tuple(lines[:2])
+
+
+def test_excluded_containers_skip_id_rules():
+    pml = "http://schemas.openxmlformats.org/presentationml/2006/main"
+    text = (
+        f'<p:presentation xmlns:p="{pml}"><p:sldIdLst><p:sldId id="256"/></p:sldIdLst>'
+        '<p:sectionLst><p:section><p:sldId id="256"/></p:section></p:sectionLst>'
+        "</p:presentation>"
+    )
+    assert _scan(text).id_findings == []
+
+
+def test_scan_raises_on_malformed_xml():
+    with pytest.raises(lxml.etree.XMLSyntaxError):
+        _scan("<w:document>")
+
+
+def test_count_tags():
+    paragraph = f"{{{W_NS}}}p"
+    table = f"{{{W_NS}}}tbl"
+    counts = count_tags(io.BytesIO(DOCUMENT.encode()), [paragraph, table])
+    assert counts == {paragraph: 2, table: 0}
+
+
+@pytest.mark.parametrize(
+    "check, body, message",
+    [
+        (
+            "validate_whitespace_preservation",
+            "<w:p><w:r><w:t>trailing </w:t></w:r></w:p>",
+            "missing xml:space='preserve'",
+        ),
+        (
+            "validate_deletions",
+            "<w:p><w:del><w:r><w:t>gone</w:t></w:r></w:del></w:p>",
+            "w:t",
+        ),
+        (
+            "validate_insertions",
+            "<w:p><w:ins><w:r><w:delText>x</w:delText></w:r></w:ins></w:p>",
+            "w:delText",
+        ),
+        (
+            "validate_unique_ids",
+            '<w:bookmarkStart w:id="5" w:name="a"/><w:bookmarkStart w:id="5" w:name="b"/>',
+            "Duplicate id='5'",
+        ),
+        (
+            "validate_all_relationship_ids",
+            '<w:p><w:hyperlink r:id="rId9"/></w:p>',
+            "rId9",
+        ),
+    ],
+)
+def test_scan_based_checks_report_violations(
+    check, body, message, unpacked_docx, original_docx, capsys
+):
+    (unpacked_docx / "word" / "document.xml").write_text(document_xml(body))
+    validator = DOCXSchemaValidator(unpacked_docx, original_docx)
+    try:
+        assert getattr(validator, check)() is False
+    finally:
+        validator.close()
+
+    output = capsys.readouterr().out
+    assert "FAILED" in output
+    assert message in output
+    assert "word/document.xml: Line 2" in output
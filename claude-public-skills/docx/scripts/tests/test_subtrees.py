@@ -0,0 +1,157 @@
+import io
+import json
+
+import pytest
+from conftest import (
+    OOXML_SCRIPTS_DIR,
+    W_NS,
+    docx_parts,
+    document_xml,
+    paragraph,
+    run_script,
+    write_directory,
+    write_package,
+)
+from ooxml.scripts.validation.subtrees import (
+    diff_regions,
+    format_changes,
+    hash_regions,
+    package_changes,
+)
+
+
+def regions(text):
+    return hash_regions(io.BytesIO(text.encode("utf-8")))
+
+
+def diff(original, modified):
+    return [
+        (change.kind, change.name, change.original_line, change.line)
+        for change in diff_regions(regions(original), regions(modified), "word/document.xml")
+    ]
+
+
+def table(*cells):
+    row = "".join(f"<w:tc>{paragraph(text)}</w:tc>" for text in cells)
+    return f"<w:tbl><w:tr>{row}</w:tr></w:tbl>"
+
+
+def test_formatting_and_prefixes_do_not_matter():
+    original = document_xml(paragraph("a"), table("b", "c"))
+    pretty = (
+        f'<x:document xmlns:x="{W_NS}">\n  <x:body>\n'
+        '    <x:p>\n      <!-- note -->\n      <x:r><x:t xml:space="preserve">a</x:t></x:r>\n    </x:p>\n'
+        "    <x:tbl><x:tr>\n"
+        '      <x:tc><x:p><x:r><x:t xml:space="preserve">b</x:t></x:r></x:p></x:tc>\n'
+        '      <x:tc><x:p><x:r><x:t xml:space="preserve">c</x:t></x:r></x:p></x:tc>\n'
+        "    </x:tr></x:tbl>\n  </x:body>\n</x:document>\n"
+    )
+    assert regions(original).digest == regions(pretty).digest
+    assert diff(original, pretty) == []
+
+
+def test_whitespace_in_text_elements_matters():
+    assert diff(document_xml(paragraph("a b")), document_xml(paragraph("a  b"))) == [
+        ("changed", "w:p", 2, 2)
+    ]
+
+
+def test_attribute_order_does_not_matter():
+    original = document_xml('<w:p><w:pPr><w:ind w:left="1" w:right="2"/></w:pPr></w:p>')
+    modified = document_xml('<w:p><w:pPr><w:ind w:right="2" w:left="1"/></w:pPr></w:p>')
+    assert diff(original, modified) == []
+
+
+def test_innermost_changed_region_is_reported():
+    original = "\n".join(["", paragraph("a"), table("b", "c"), paragraph("d")])
+    modified = "\n".join(["", paragraph("a"), table("b", "changed"), paragraph("d")])
+
+    assert diff(document_xml(original), document_xml(modified)) == [("changed", "w:p", 4, 4)]
+
+
+def test_added_and_removed_regions():
+    original = document_xml("\n".join(["", paragraph("a"), paragraph("b"), table("c")]))
+    modified = document_xml("\n".join(["", paragraph("a"), paragraph("new"), paragraph("b")]))
+
+    assert diff(original, modified) == [
+        ("added", "w:p", None, 4),
+        ("removed", "w:tbl", 5, None),
+    ]
+
+
+def test_changes_outside_nested_regions_change_the_container():
+    original = document_xml(table("a"))
+    properties = '<w:tblPr><w:jc w:val="center"/></w:tblPr>'
+    modified = document_xml(table("a").replace("<w:tbl>", f"<w:tbl>{properties}"))
+
+    assert diff(original, modified) == [("changed", "w:tbl", 2, 2)]
+
+
+@pytest.fixture
+def edited(tmp_path):
+    original = write_package(
+        tmp_path / "original.docx",
+        docx_parts(
+            document_xml("\n" + paragraph("a") + "\n" + paragraph("b")),
+            extra={"word/media/image1.png": b"\x89PNG1", "word/old.xml": "<old/>"},
+        ),
+    )
+    unpacked = write_directory(
+        tmp_path / "unpacked",
+        docx_parts(
+            document_xml("\n" + paragraph("a") + "\n" + paragraph("edited")),
+            extra={"word/media/image1.png": b"\x89PNG2", "word/new.xml": "<new/>"},
+        ),
+    )
+    return unpacked, original
+
+
+def test_package_changes(edited):
+    changes = package_changes(*edited)
+
+    assert [str(change) for change in changes] == [
+        "word/document.xml: Line 4: changed w:p (original line 4)",
+        "word/media/image1.png: changed",
+        "word/new.xml: added",
+        "word/old.xml: removed",
+    ]
+    assert format_changes(changes).endswith("4 changed subtree(s) in 4 part(s)")
+
+
+def test_unchanged_package_has_no_changes(unpacked_docx, original_docx):
+    assert package_changes(unpacked_docx, original_docx) == []
+
+
+def test_unparsable_parts_are_reported_whole(unpacked_docx, original_docx):
+    (unpacked_docx / "word" / "document.xml").write_text("<w:document")
+    assert [str(change) for change in package_changes(unpacked_docx, original_docx)] == [
+        "word/document.xml: changed"
+    ]
+
+
+def test_command_line(edited, tmp_path):
+    unpacked, original = edited
+
+    result = run_script(OOXML_SCRIPTS_DIR / "changes.py", unpacked, "--original", original)
+    assert result.returncode == 0
+    assert "word/document.xml: Line 4: changed w:p (original line 4)" in result.stdout
+
+    packed = write_package(
+        tmp_path / "edited.docx",
+        {
+            str(path.relative_to(unpacked)): path.read_bytes()
+            for path in unpacked.rglob("*")
+            if path.is_file()
+        },
+    )
+    result = run_script(
+        OOXML_SCRIPTS_DIR / "changes.py", packed, "--original", original, "--json"
+    )
+    assert result.returncode == 0
+    assert json.loads(result.stdout)[0] == {
+        "part": "word/document.xml",
+        "kind": "changed",
+        "name": "w:p",
+        "original_line": 4,
+        "line": 4,
+    }
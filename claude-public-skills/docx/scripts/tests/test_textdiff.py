@@ -0,0 +1,121 @@
+import random
+
+import pytest
+from ooxml.scripts.validation import textdiff
+from ooxml.scripts.validation.textdiff import diff_paragraphs, diff_sequences
+
+
+def _edit_distance(a, b):
+    """Insertions plus deletions, by dynamic programming."""
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            if x == y:
+                current.append(previous[j - 1])
+            else:
+                current.append(1 + min(previous[j], current[j - 1]))
+        previous = current
+    return previous[-1]
+
+
+def _apply(ops):
+    before = "".join(items for op, items in ops if op != "+")
+    after = "".join(items for op, items in ops if op != "-")
+    edits = sum(len(items) for op, items in ops if op != "=")
+    return before, after, edits
+
+
+def test_diff_sequences_finds_a_shortest_edit_script():
+    rng = random.Random(0)
+    for _ in range(300):
+        a = "".join(rng.choices("abc", k=rng.randrange(12)))
+        b = "".join(rng.choices("abc", k=rng.randrange(12)))
+        ops = diff_sequences(a, b, len(a) + len(b))
+
+        assert _apply(ops) == (a, b, _edit_distance(a, b))
+
+
+def test_diff_sequences_gives_up_above_max_d():
+    assert diff_sequences("abcd", "wxyz", 7) is None
+    assert diff_sequences("abcd", "wxyz", 8) is not None
+
+
+def test_equal_lists_have_no_diff():
+    assert diff_paragraphs(["a", "b"], ["a", "b"]) == ""
+
+
+def test_changed_paragraphs_are_diffed_inline():
+    original = ["Hello world", "Same", "Gone", "Kept"]
+    modified = ["Hello there world", "Same", "Kept", "Added"]
+
+    assert diff_paragraphs(original, modified).splitlines() == [
+        "Hello {+there +}world",
+        "[-Gone-]",
+        "{+Added+}",
+    ]
+
+
+def test_replacements_are_paired_with_the_most_similar_paragraph():
+    original = ["The quick fox"]
+    modified = ["Unrelated", "The quick brown fox"]
+
+    assert diff_paragraphs(original, modified).splitlines() == [
+        "{+Unrelated+}",
+        "The quick {+brown +}fox",
+    ]
+
+
+@pytest.mark.parametrize(
+    "original, modified, expected",
+    [
+        (
+            "The quick brown fox jumps over the lazy dog",
+            "the quick brown fox jumps over the lazy dog.",
+            "[-T-]{+t+}he quick brown fox jumps over the lazy dog{+.+}",
+        ),
+        ("cell", " cell ", "{+ +}cell{+ +}"),
+        ("abc", "xyz", "[-abc-]{+xyz+}"),
+    ],
+)
+def test_edits_at_both_ends_are_diffed_inline(original, modified, expected):
+    assert diff_paragraphs(["a", original, "b"], ["a", modified, "b"]) == expected
+
+
+def test_paragraphs_sharing_words_are_paired():
+    original = ["Total: 10 items"]
+    modified = ["Unrelated", "total: 12 items."]
+
+    assert diff_paragraphs(original, modified).splitlines() == [
+        "{+Unrelated+}",
+        "[-T-]{+t+}otal: 1[-0-]{+2+} items{+.+}",
+    ]
+
+
+@pytest.mark.parametrize(
+    "limit, expected",
+    [
+        (2_000_000, "a[-b-]{+x+}c d"),
+        (20, "[-abc-]{+axc+} d"),
+        (1, "[-abc d-]{+axc d+}"),
+    ],
+)
+def test_expensive_diffs_fall_back_to_coarser_tokens(monkeypatch, limit, expected):
+    monkeypatch.setattr(textdiff, "_WORK_LIMIT", limit)
+    assert diff_paragraphs(["abc d"], ["axc d"]) == expected
+
+
+def test_output_is_truncated():
+    original = [f"paragraph {i}" for i in range(100)]
+    modified = [f"paragraph {i}!" for i in range(100)]
+
+    lines = diff_paragraphs(original, modified, max_chars=100).splitlines()
+
+    assert lines[0] == "paragraph 0{+!+}"
+    assert lines[-1] == f"... diff truncated ({100 - len(lines) + 1} more changed paragraph(s))"
+    assert sum(len(line) + 1 for line in lines[:-1]) <= 100
+
+
+def test_pure_insertions_and_deletions_respect_max_d():
+    assert diff_sequences("", "abc", 2) is None
+    assert diff_sequences("abc", "", 3) == [("-", "abc")]
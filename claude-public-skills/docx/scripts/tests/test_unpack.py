@@ -0,0 +1,165 @@
+import defusedxml.minidom
+import legacy
+import pytest
+import unpack
+from conftest import (
+    OOXML_SCRIPTS_DIR,
+    R_NS,
+    SCRIPTS_DIR,
+    W_NS,
+    docx_parts,
+    document_xml,
+    run_script,
+    write_package,
+)
+
+RUNS = (
+    '<w:p><w:r w:rsidR="00A1"><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">Hello </w:t></w:r>'
+    '<w:proofErr w:type="spellStart"/>'
+    '<w:r w:rsidR="00B2"><w:rPr><w:b/></w:rPr><w:t>world</w:t></w:r>'
+    "<w:r><w:t>plain</w:t></w:r><w:r><w:t>text</w:t></w:r></w:p>"
+)
+
+DOCUMENT_BODIES = {
+    "runs": RUNS,
+    "smart quotes": "<w:p><w:r><w:t>“quoted” and ‘single’</w:t></w:r></w:p>",
+    "comments and processing instructions": (
+        f"<!-- before -->{RUNS}<?custom data?><w:p><!-- inside --><w:r><w:t>x</w:t></w:r></w:p>"
+    ),
+    "character references": "<w:p><w:r><w:t>&lt;a&gt; &amp; &#x2014; &#169;</w:t></w:r></w:p>",
+    "mixed content": (
+        "<w:p>text before<w:r><w:t>run</w:t></w:r>between<w:r><w:t>run</w:t></w:r>after</w:p>"
+    ),
+    "CDATA": "<w:p><w:r><w:t><![CDATA[<not> & markup]]></w:t></w:r></w:p>" + RUNS,
+    "attribute with tab and newline": (
+        '<w:p><w:r><w:rPr><w:rStyle w:val="a&#9;b&#10;c"/></w:rPr><w:t>x</w:t></w:r>'
+        '<w:r><w:rPr><w:rStyle w:val="a&#9;b&#10;c"/></w:rPr><w:t>y</w:t></w:r></w:p>'
+    ),
+    "carriage returns": "<w:p><w:r><w:t>line\r\nbreak\rhere</w:t></w:r></w:p>" + RUNS,
+    "nested tables": (
+        f"<w:tbl><w:tr><w:tc>{RUNS}<w:tbl><w:tr><w:tc>{RUNS}</w:tc></w:tr></w:tbl>"
+        "</w:tc></w:tr></w:tbl>"
+    ),
+    "empty elements": "<w:p/><w:p><w:r/></w:p><w:p><w:r><w:t></w:t></w:r></w:p>",
+}
+
+DOCTYPE = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n<!DOCTYPE w:document>\n'
+    f'<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}"><w:body>{RUNS}</w:body></w:document>'
+)
+
+DOCUMENTS = {name: document_xml(body) for name, body in DOCUMENT_BODIES.items()}
+DOCUMENTS["doctype"] = DOCTYPE
+
+STYLES = f'<w:styles xmlns:w="{W_NS}"><w:style w:styleId="“x”"/></w:styles>'
+
+# Documents that are serialized and parsed again instead of indented in place
+READ_BACK_CHANGED = {"CDATA", "attribute with tab and newline", "doctype"}
+
+
+def unpacked_files(directory):
+    return {
+        str(path.relative_to(directory)): path.read_bytes()
+        for path in sorted(directory.rglob("*"))
+        if path.is_file()
+    }
+
+
+def unpack_both(tmp_path, parts, merge_runs=True):
+    docx = write_package(tmp_path / "input.docx", parts)
+    _, message = unpack.unpack(str(docx), str(tmp_path / "new"), merge_runs=merge_runs)
+    _, expected = legacy.unpack(str(docx), str(tmp_path / "old"), merge_runs=merge_runs)
+    return message, expected
+
+
+@pytest.mark.parametrize("merge_runs", [True, False])
+@pytest.mark.parametrize("document", DOCUMENTS.values(), ids=DOCUMENTS.keys())
+def test_matches_the_old_pipeline(tmp_path, document, merge_runs):
+    parts = docx_parts(
+        document,
+        extra={
+            "word/styles.xml": STYLES,
+            "word/media/image1.png": b"\x89PNG\r\n\x1a\n",
+        },
+    )
+
+    message, expected = unpack_both(tmp_path, parts, merge_runs)
+
+    assert message == expected
+    assert unpacked_files(tmp_path / "new") == unpacked_files(tmp_path / "old")
+
+
+@pytest.mark.parametrize("name", DOCUMENTS)
+def test_indenting_in_place_matches_reparsing(name):
+    dom = defusedxml.minidom.parseString(DOCUMENTS[name])
+    expected = defusedxml.minidom.parseString(dom.toprettyxml(indent="  ")).toxml()
+
+    assert unpack._reads_back_unchanged(dom) == (name not in READ_BACK_CHANGED)
+    assert unpack._pretty_printed_dom(dom).toxml() == expected
+
+
+def test_merges_runs_and_escapes_smart_quotes(tmp_path):
+    parts = docx_parts(document_xml(DOCUMENT_BODIES["runs"], DOCUMENT_BODIES["smart quotes"]))
+    message, _ = unpack_both(tmp_path, parts)
+
+    assert message.endswith("(4 XML files), merged 2 runs")
+    document = (tmp_path / "new" / "word" / "document.xml").read_text(encoding="utf-8")
+    assert "Hello world" in document
+    assert "proofErr" not in document
+    assert "&#x201C;quoted&#x201D;" in document
+
+
+def test_unparsable_part_gives_the_same_error(tmp_path):
+    parts = docx_parts(extra={"word/broken.xml": "<w:a>"})
+    message, expected = unpack_both(tmp_path, parts)
+
+    assert message.startswith("Error unpacking:")
+    assert message == expected
+    # Unlike before, the parts after the broken one are formatted too
+    assert (tmp_path / "new" / "word" / "broken.xml").read_text() == "<w:a>"
+    assert "\n  " in (tmp_path / "new" / "word" / "document.xml").read_text()
+
+
+def test_members_outside_the_output_directory_are_not_written(tmp_path):
+    parts = docx_parts(extra={"../escape.xml": "<a/>", "/absolute.bin": b"x"})
+    unpack_both(tmp_path, parts)
+
+    assert unpacked_files(tmp_path / "new") == unpacked_files(tmp_path / "old")
+    assert not (tmp_path / "escape.xml").exists()
+
+
+def test_jobs_give_the_same_output(tmp_path):
+    parts = docx_parts(DOCUMENTS["runs"], extra={"word/styles.xml": DOCUMENTS["CDATA"]})
+    docx = write_package(tmp_path / "input.docx", parts)
+
+    unpack.unpack(str(docx), str(tmp_path / "serial"))
+    unpack.unpack(str(docx), str(tmp_path / "parallel"), jobs=2)
+
+    assert unpacked_files(tmp_path / "serial") == unpacked_files(tmp_path / "parallel")
+
+
+def test_command_line(tmp_path):
+    docx = write_package(tmp_path / "input.docx", docx_parts())
+
+    result = run_script(SCRIPTS_DIR / "unpack.py", docx, tmp_path / "out")
+
+    assert result.returncode == 0
+    assert result.stdout.startswith(f"Unpacked {docx} (4 XML files), merged 0 runs")
+    assert (tmp_path / "out" / "word" / "document.xml").exists()
+
+    result = run_script(SCRIPTS_DIR / "unpack.py", tmp_path / "missing.docx", tmp_path / "out")
+    assert result.returncode == 1
+
+
+@pytest.mark.parametrize(
+    "script", [SCRIPTS_DIR / "unpack.py", OOXML_SCRIPTS_DIR / "unpack.py"]
+)
+def test_timing_only_with_verbose(tmp_path, script):
+    docx = write_package(tmp_path / "input.docx", docx_parts())
+
+    quiet = run_script(script, docx, tmp_path / "quiet")
+    verbose = run_script(script, docx, tmp_path / "verbose", "--verbose")
+
+    assert quiet.returncode == verbose.returncode == 0
+    assert "Timing:" not in quiet.stdout
+    assert "Timing: extract" in verbose.stdout
@@ -0,0 +1,177 @@
+import pytest
+from conftest import PKG_RELS_NS, write_directory, write_package
+from ooxml.scripts.validation.runner import validate_path
+from ooxml.scripts.validation.xlsx import XLSXSchemaValidator
+
+SML_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+REL_TYPES = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+SML_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+
+CONTENT_TYPES = (
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    f'<Override PartName="/xl/workbook.xml" ContentType="{SML_CONTENT_TYPE}.sheet.main+xml"/>'
+    f'<Override PartName="/xl/worksheets/sheet1.xml" ContentType="{SML_CONTENT_TYPE}.worksheet+xml"/>'
+    f'<Override PartName="/xl/sharedStrings.xml" ContentType="{SML_CONTENT_TYPE}.sharedStrings+xml"/>'
+    f'<Override PartName="/xl/styles.xml" ContentType="{SML_CONTENT_TYPE}.styles+xml"/>'
+    "</Types>"
+)
+
+ROOT_RELS = (
+    f'<Relationships xmlns="{PKG_RELS_NS}">'
+    f'<Relationship Id="rId1" Type="{REL_TYPES}/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+WORKBOOK_RELS = (
+    f'<Relationships xmlns="{PKG_RELS_NS}">'
+    f'<Relationship Id="rId1" Type="{REL_TYPES}/worksheet" Target="worksheets/sheet1.xml"/>'
+    f'<Relationship Id="rId2" Type="{REL_TYPES}/sharedStrings" Target="sharedStrings.xml"/>'
+    f'<Relationship Id="rId3" Type="{REL_TYPES}/styles" Target="styles.xml"/>'
+    "</Relationships>"
+)
+
+SHARED_STRINGS = (
+    f'<sst xmlns="{SML_NS}" count="2" uniqueCount="2">'
+    "<si><t>one</t></si><si><t>two</t></si></sst>"
+)
+
+STYLES = (
+    f'<styleSheet xmlns="{SML_NS}">'
+    '<fonts count="1"><font/></fonts>'
+    '<fills count="1"><fill/></fills>'
+    '<borders count="1"><border/></borders>'
+    '<cellXfs count="2"><xf/><xf/></cellXfs>'
+    "</styleSheet>"
+)
+
+
+def workbook(sheets=("Sheet1",), defined_names=""):
+    entries = "".join(
+        f'<sheet name="{name}" sheetId="{i}" r:id="rId1"/>'
+        for i, name in enumerate(sheets, 1)
+    )
+    names = f"<definedNames>{defined_names}</definedNames>" if defined_names else ""
+    return (
+        f'<workbook xmlns="{SML_NS}" xmlns:r="{R_NS}">'
+        f"<sheets>{entries}</sheets>{names}</workbook>"
+    )
+
+
+def sheet(rows):
+    return f'<worksheet xmlns="{SML_NS}"><sheetData>{rows}</sheetData></worksheet>'
+
+
+def xlsx_parts(workbook_xml=None, sheet_xml=None):
+    return {
+        "[Content_Types].xml": CONTENT_TYPES,
+        "_rels/.rels": ROOT_RELS,
+        "xl/workbook.xml": workbook_xml or workbook(),
+        "xl/_rels/workbook.xml.rels": WORKBOOK_RELS,
+        "xl/worksheets/sheet1.xml": sheet_xml
+        or sheet('<row r="1"><c r="A1" t="s" s="1"><v>1</v></c></row>'),
+        "xl/sharedStrings.xml": SHARED_STRINGS,
+        "xl/styles.xml": STYLES,
+    }
+
+
+@pytest.fixture
+def original_xlsx(tmp_path):
+    return write_package(tmp_path / "original.xlsx", xlsx_parts())
+
+
+@pytest.fixture
+def check(tmp_path, original_xlsx):
+    """Run one check on a package built from xlsx_parts(**kwargs)."""
+    validators = []
+
+    def run(name, **kwargs):
+        unpacked = write_directory(tmp_path / f"unpacked{len(validators)}", xlsx_parts(**kwargs))
+        validators.append(XLSXSchemaValidator(unpacked, original_xlsx))
+        return getattr(validators[-1], name)()
+
+    yield run
+    for validator in validators:
+        validator.close()
+
+
+def test_valid_workbook_passes(tmp_path, original_xlsx):
+    unpacked = write_directory(tmp_path / "unpacked", xlsx_parts())
+    assert validate_path(unpacked, original_xlsx)
+    assert validate_path(original_xlsx, original_xlsx)
+
+
+def test_duplicate_sheet_names_ignore_case(check, capsys):
+    assert not check("validate_sheet_names", workbook_xml=workbook(["Data", "DATA"]))
+    assert "Duplicate sheet name 'DATA' (first occurrence at line 1)" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "defined_name, message",
+    [
+        ('<definedName name="a" localSheetId="1">Sheet1!$A$1</definedName>', "localSheetId='1'"),
+        ('<definedName name="b">Missing!$A$1</definedName>', "missing sheet 'Missing'"),
+        ("<definedName name=\"c\">'Other sheet'!$A$1</definedName>", "missing sheet 'Other sheet'"),
+        ('<definedName name="d">SUM(Sheet1:Sheet3!A1)</definedName>', "missing sheet 'Sheet3'"),
+    ],
+)
+def test_bad_defined_names(check, capsys, defined_name, message):
+    assert not check("validate_defined_names", workbook_xml=workbook(defined_names=defined_name))
+    assert message in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "formula",
+    [
+        "Sheet1!$A$1",
+        "'Sheet1'!A1:B2",
+        '"Missing!A1"&amp;Sheet1!A1',
+        "[1]Other!A1",
+        "#REF!",
+    ],
+)
+def test_defined_names_that_need_no_sheet_pass(check, formula):
+    defined_name = f'<definedName name="n">{formula}</definedName>'
+    assert check("validate_defined_names", workbook_xml=workbook(defined_names=defined_name))
+
+
+@pytest.mark.parametrize(
+    "row, message",
+    [
+        ('<c r="A1" t="s"><v>2</v></c>', "references shared string 2"),
+        ('<c r="A1" t="s"><v>x</v></c>', "invalid shared string index 'x'"),
+        ('<c r="A1" s="2"><v>1</v></c>', "uses style 2"),
+        ('<c r="A1" s="-1"><v>1</v></c>', "invalid style index '-1'"),
+    ],
+)
+def test_bad_cell_indexes(check, capsys, row, message):
+    sheet_xml = sheet(f'<row r="1">{row}</row>')
+    assert not check("validate_cell_indexes", sheet_xml=sheet_xml)
+    assert message in capsys.readouterr().out
+
+
+def test_row_and_column_styles_are_checked(check, capsys):
+    sheet_xml = (
+        f'<worksheet xmlns="{SML_NS}"><cols><col min="1" max="2" style="5"/></cols>'
+        '<sheetData><row r="1" s="7" customFormat="1"/></sheetData></worksheet>'
+    )
+    assert not check("validate_cell_indexes", sheet_xml=sheet_xml)
+
+    output = capsys.readouterr().out
+    assert "Columns 1-2 uses style 5" in output
+    assert "Row 1 uses style 7" in output
+
+
+def test_cell_errors_per_part_are_capped(check, capsys):
+    rows = "".join(
+        f'<row r="{i}"><c r="A{i}" t="s"><v>9</v></c></row>' for i in range(1, 31)
+    )
+    assert not check("validate_cell_indexes", sheet_xml=sheet(rows))
+
+    output = capsys.readouterr().out
+    assert "FAILED - Found 30 cell index errors:" in output
+    assert output.count("references shared string 9") == XLSXSchemaValidator.MAX_CELL_ERRORS_PER_PART
+    assert "xl/worksheets/sheet1.xml: ... and 10 more" in output
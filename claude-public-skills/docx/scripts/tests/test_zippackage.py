@@ -0,0 +1,96 @@
+import tempfile
+
+import pytest
+from conftest import docx_parts, document_xml, paragraph, validate, write_package
+from ooxml.scripts.validation.runner import validate_path
+from ooxml.scripts.validation.zippackage import ZipPackage, as_path, xml_source
+
+
+@pytest.fixture
+def package(tmp_path):
+    path = write_package(
+        tmp_path / "doc.docx", docx_parts(extra={"word/media/image1.png": b"png"})
+    )
+    with ZipPackage(path) as package:
+        yield package
+
+
+def test_paths_behave_like_an_unpacked_directory(package):
+    root = package.root
+    document = root / "word" / "document.xml"
+
+    assert document.is_file() and not document.is_dir()
+    assert (root / "word").is_dir() and (root / "word" / "media").exists()
+    assert not (root / "missing.xml").exists()
+    assert document.relative_to(root).as_posix() == "word/document.xml"
+    assert document.stat().st_size == len(document_xml())
+    assert document.read_text() == document_xml()
+    assert as_path(document) is document
+    assert xml_source(document).read() == document.read_bytes()
+
+    with pytest.raises(FileNotFoundError):
+        (root / "missing.xml").stat()
+
+
+def test_listing(package):
+    root = package.root
+    word = root / "word"
+
+    assert [path.name for path in word.iterdir()] == [
+        "_rels",
+        "media",
+        "document.xml",
+    ]
+    assert [path.name for path in root.glob("*.xml")] == ["[Content_Types].xml"]
+    assert sorted(path.relative_to(root).as_posix() for path in root.rglob("*.rels")) == [
+        "_rels/.rels",
+        "word/_rels/document.xml.rels",
+    ]
+    assert [directory.relative_to(root).as_posix() for directory, _, _ in root.walk()] == [
+        ".",
+        "_rels",
+        "word",
+        "word/_rels",
+        "word/media",
+    ]
+
+
+def test_writes_stay_in_memory(package):
+    document = package.root / "word" / "document.xml"
+    document.write_bytes(b"<edited/>")
+
+    assert document.read_bytes() == b"<edited/>"
+    assert document.stat().st_size == len(b"<edited/>")
+    with ZipPackage(package.path) as fresh:
+        assert (fresh.root / "word" / "document.xml").read_text() == document_xml()
+
+    with pytest.raises(PermissionError):
+        document.open("w")
+    with pytest.raises(FileNotFoundError):
+        (package.root / "new.xml").write_bytes(b"")
+
+
+def test_packed_files_are_validated_without_temporary_files(
+    tmp_path, original_docx, monkeypatch
+):
+    packed = write_package(
+        tmp_path / "edited.docx", docx_parts(document_xml(paragraph("Edited")))
+    )
+    monkeypatch.setattr(tempfile, "mkdtemp", pytest.fail)
+
+    assert validate_path(packed, original_docx)
+
+
+def test_packed_and_unpacked_results_match(tmp_path, unpacked_docx, original_docx):
+    broken = document_xml('<w:p><w:bookmarkStart w:id="1" w:name="a"/></w:p>' * 2)
+    (unpacked_docx / "word" / "document.xml").write_text(broken)
+    packed = write_package(tmp_path / "edited.docx", docx_parts(broken))
+
+    from_directory = validate(unpacked_docx, original_docx, "--no-cache")
+    from_zip = validate(packed, original_docx, "--no-cache")
+
+    assert from_directory.returncode == from_zip.returncode == 1
+    assert "Duplicate id='1'" in from_zip.stdout
+    assert from_zip.stdout.replace(str(packed), "") == from_directory.stdout.replace(
+        str(unpacked_docx), ""
+    )
@@ -2,16 +2,22 @@
 """Unpack DOCX files for editing.
 
 Extracts the ZIP archive, pretty-prints XML files, and merges adjacent runs
-with identical formatting (enabled by default).
+with identical formatting (enabled by default). Each member is read and
+parsed once and written once; with --jobs N, XML parts are formatted on N
+worker processes.
 """
 
 import argparse
+import os
+import shutil
 import sys
 import zipfile
 from pathlib import Path
+from xml.dom import Node
 
 import defusedxml.minidom
-from helpers.merge_runs import merge_runs as do_merge_runs
+from helpers.merge_runs import merge_runs_in_dom as do_merge_runs_in_dom
+from ooxml.scripts.validation.parallel import PhaseTimer, map_by_size
 
 # Smart quotes that get mangled by the tokenizer - convert to XML entities
 # Using hex escapes since we can't type the actual characters
@@ -27,6 +33,8 @@ def unpack(
     input_file: str,
     output_directory: str,
     merge_runs: bool = True,
+    jobs: int = 1,
+    timer: PhaseTimer | None = None,
 ) -> tuple[None, str]:
     """Unpack a DOCX file and prepare for editing.
 
@@ -34,6 +42,8 @@ def unpack(
         input_file: Path to DOCX file
         output_directory: Path to output directory
         merge_runs: If True, merge adjacent runs with identical formatting
+        jobs: Worker processes for formatting XML parts (0 = one per CPU)
+        timer: Optional PhaseTimer that records the time of each phase
 
     Returns:
         (None, message) - message indicates success or failure
@@ -51,25 +61,17 @@ def unpack(
         # Create output directory
         output_path.mkdir(parents=True, exist_ok=True)
 
-        # Extract ZIP contents
+        # Extract and format every member, writing each file once
         with zipfile.ZipFile(input_path, "r") as zf:
-            zf.extractall(output_path)
+            stats = _unpack_members(
+                zf, output_path, merge_runs, jobs, timer or PhaseTimer(jobs)
+            )
 
-        # Pretty print all XML files
-        xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-        for xml_file in xml_files:
-            _pretty_print_xml(xml_file)
-
-        message = f"Unpacked {input_file} ({len(xml_files)} XML files)"
+        message = f"Unpacked {input_file} ({stats['xml_files']} XML files)"
 
         # Merge runs if requested
         if merge_runs:
-            merge_count, _ = do_merge_runs(str(output_path))
-            message += f", merged {merge_count} runs"
-
-        # Escape smart quotes AFTER merge_runs (which rewrites files)
-        for xml_file in xml_files:
-            _escape_smart_quotes(xml_file)
+            message += f", merged {stats['merged_runs']} runs"
 
         return None, message
 
@@ -79,19 +81,208 @@ def unpack(
         return None, f"Error unpacking: {e}"
 
 
-def _pretty_print_xml(xml_file: Path) -> None:
-    """Pretty print an XML file with indentation."""
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="utf-8"))
+def _unpack_members(
+    zf: zipfile.ZipFile,
+    output_path: Path,
+    merge_runs: bool,
+    jobs: int,
+    timer: PhaseTimer,
+) -> dict:
+    """Write every member of zf below output_path, each file exactly once.
+
+    XML parts are read from the zip and parsed once: run merging (for
+    word/document.xml), pretty-printing and smart quote escaping all happen
+    in memory before the single write, on jobs worker processes (largest
+    parts first). Other members are streamed to disk. If a part cannot be
+    formatted it is written as extracted, the remaining members are still
+    unpacked, and the error of the first such part is raised at the end.
+
+    Returns:
+        {"xml_files", "merged_runs"}
+    """
+    stats = {"xml_files": 0, "merged_runs": 0}
+    document_xml = output_path / "word" / "document.xml"
+    parts = []  # (data, target, merge_runs) per XML part, in member order
+
+    with timer.phase("extract"):
+        for info in zf.infolist():
+            target = _member_path(output_path, info.filename)
+            if target is None:
+                continue
+            if info.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+
+            if not target.name.endswith((".xml", ".rels")):
+                with zf.open(info) as source, open(target, "wb") as destination:
+                    shutil.copyfileobj(source, destination)
+                continue
+
+            stats["xml_files"] += 1
+            parts.append((zf.read(info), target, merge_runs and target == document_xml))
+
+    with timer.phase("format"):
+        results = map_by_size(
+            _write_xml_part, parts, [len(part[0]) for part in parts], jobs
+        )
+
+    error = None
+    for merge_count, part_error in results:
+        stats["merged_runs"] += merge_count
+        error = error or part_error
+
+    if error is not None:
+        raise error
+    return stats
+
+
+def _write_xml_part(part: tuple[bytes, Path, bool]) -> tuple[int, Exception | None]:
+    """Format one XML part and write it; runs on a worker process with --jobs.
+
+    Returns:
+        (merged runs, the error if the part was written as is)
+    """
+    data, target, merge_runs = part
+    try:
+        text, merge_count = _format_xml(data, merge_runs)
+    except Exception as e:
+        target.write_bytes(data)
+        return 0, e
+    target.write_text(text, encoding="utf-8")
+    return merge_count, None
+
+
+def _member_path(output_path: Path, name: str) -> Path | None:
+    """Return where ZipFile.extract() would write member name, or None.
+
+    Absolute paths, drive letters and "." / ".." components are dropped the
+    same way, so no member ends up outside output_path.
+    """
+    arcname = name.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = [
+        part
+        for part in arcname.split(os.path.sep)
+        if part not in ("", os.path.curdir, os.path.pardir)
+    ]
+    return output_path.joinpath(*parts) if parts else None
 
 
-def _escape_smart_quotes(xml_file: Path) -> None:
+def _read_text(data: bytes) -> str:
+    """Decode data like Path.read_text(encoding="utf-8") (universal newlines)."""
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _format_xml(data: bytes, merge_runs: bool) -> tuple[str, int]:
+    """Return the text to write for an XML part and the number of runs merged.
+
+    The result is what extracting, pretty-printing, merging runs (for
+    document.xml) and escaping smart quotes file by file produce.
+    """
+    dom = defusedxml.minidom.parseString(_read_text(data))
+    merge_count = 0
+
+    if not merge_runs:
+        content = dom.toprettyxml(indent="  ", encoding="utf-8")
+    else:
+        # Runs are merged in the document as it reads back once pretty-printed
+        pretty_dom = _pretty_printed_dom(dom)
+        try:
+            merge_count = do_merge_runs_in_dom(pretty_dom)
+            content = pretty_dom.toxml(encoding="UTF-8")
+        except Exception:
+            # Left pretty-printed but unmerged
+            merge_count = 0
+            dom = defusedxml.minidom.parseString(_read_text(data))
+            content = dom.toprettyxml(indent="  ", encoding="utf-8")
+
+    return _escape_smart_quotes(_read_text(content)), merge_count
+
+
+def _pretty_printed_dom(dom):
+    """Return the document that parsing dom.toprettyxml(indent="  ") gives.
+
+    The indentation toprettyxml() writes between nodes is inserted as text
+    nodes in place, so dom is modified and no second parse is needed. Content
+    that would not read back unchanged (CDATA sections, a doctype, carriage
+    returns, tabs or newlines in attribute values) is serialized and parsed
+    again instead.
+    """
+    if not _reads_back_unchanged(dom):
+        pretty = dom.toprettyxml(indent="  ", encoding="utf-8")
+        return defusedxml.minidom.parseString(_read_text(pretty))
+
+    # Elements still to indent, with the indentation of their own tags
+    pending = [(dom.documentElement, "")]
+    while pending:
+        element, indent = pending.pop()
+        children = element.childNodes
+        if not children or (
+            len(children) == 1 and children[0].nodeType == Node.TEXT_NODE
+        ):
+            continue  # Written inline
+
+        child_indent = indent + "  "
+        nodes = []
+        whitespace = "\n"  # Text read back before the next non-text child
+        for child in children:
+            if child.nodeType == Node.TEXT_NODE:
+                whitespace += child_indent + child.data + "\n"
+                continue
+            nodes.append(dom.createTextNode(whitespace + child_indent))
+            nodes.append(child)
+            whitespace = "\n"
+            if child.nodeType == Node.ELEMENT_NODE:
+                pending.append((child, child_indent))
+        nodes.append(dom.createTextNode(whitespace + indent))
+
+        # Relink the children directly: insertBefore() searches the child
+        # list on every call, which is quadratic for a large body. The result
+        # is checked against the serialize and re-parse route in
+        # tests/test_unpack.py
+        previous = None
+        for node in nodes:
+            node.parentNode = element
+            node.previousSibling = previous
+            if previous is not None:
+                previous.nextSibling = node
+            previous = node
+        previous.nextSibling = None
+        children[:] = nodes
+
+    return dom
+
+
+def _reads_back_unchanged(dom) -> bool:
+    """True if parsing dom's pretty-printed form only adds indentation."""
+    if dom.doctype is not None:
+        return False
+    pending = list(dom.childNodes)
+    while pending:
+        node = pending.pop()
+        if node.nodeType == Node.ELEMENT_NODE:
+            for attribute in node.attributes.values():
+                if any(c in attribute.value for c in "\r\n\t"):
+                    return False
+            pending.extend(node.childNodes)
+        elif node.nodeType == Node.CDATA_SECTION_NODE:
+            return False
+        elif "\r" in (getattr(node, "data", "") or ""):
+            return False
+    return True
+
+
+def _escape_smart_quotes(content: str) -> str:
     """Replace smart quotes with XML entities so they survive tokenization."""
-    content = xml_file.read_text(encoding="utf-8")
     for char, entity in SMART_QUOTE_REPLACEMENTS.items():
         content = content.replace(char, entity)
-    xml_file.write_text(content, encoding="utf-8")
+    return content
 
 
 if __name__ == "__main__":
@@ -105,12 +296,32 @@ if __name__ == "__main__":
         metavar="true|false",
         help="Merge adjacent runs with identical formatting (default: true)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for formatting XML parts (0 = one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Also print the time each phase took",
+    )
     args = parser.parse_args()
 
+    timer = PhaseTimer(args.jobs)
     _, message = unpack(
-        args.input_file, args.output_directory, merge_runs=args.merge_runs
+        args.input_file,
+        args.output_directory,
+        merge_runs=args.merge_runs,
+        jobs=args.jobs,
+        timer=timer,
     )
     print(message)
+    if args.verbose:
+        print(timer.summary())
 
     if "Error" in message:
         sys.exit(1)
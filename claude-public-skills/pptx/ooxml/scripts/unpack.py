@@ -1,29 +1,68 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Usage: python unpack.py <office_file> <output_dir> [--jobs N] [--verbose]
+"""
+
+import argparse
 import random
-import sys
 import defusedxml.minidom
 import zipfile
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
+from validation.parallel import PhaseTimer, map_by_size
 
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
 
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
+def pretty_print(xml_file):
+    """Pretty print one extracted XML file in place."""
     content = xml_file.read_text(encoding="utf-8")
     dom = defusedxml.minidom.parseString(content)
     xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
 
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Unpack an Office file for editing")
+    parser.add_argument("input_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Output directory")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for pretty printing XML parts (0 = one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Also print the time each phase took",
+    )
+    args = parser.parse_args()
+    timer = PhaseTimer(args.jobs)
+
+    # Extract and format
+    with timer.phase("extract"):
+        output_path = Path(args.output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        zipfile.ZipFile(args.input_file).extractall(output_path)
+
+    # Pretty print all XML files, largest first across the workers
+    with timer.phase("format"):
+        xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
+        map_by_size(
+            pretty_print,
+            xml_files,
+            [xml_file.stat().st_size for xml_file in xml_files],
+            args.jobs,
+        )
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.input_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+    if args.verbose:
+        print(timer.summary())
+
+
+if __name__ == "__main__":
+    main()
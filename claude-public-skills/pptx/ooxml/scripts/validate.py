@@ -3,36 +3,69 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <path> --original <original_file> [--auto-repair]
+    python validate.py <path> --original <original_file> [--auto-repair] [--jobs N] [--no-cache]
+                       [--report text|json] [--xsd-large-parts] [--server] [--socket PATH]
+                       [--fail-fast] [--time-budget SECONDS] [--only PART [PART ...]]
+    python validate.py --batch <directory|manifest> [--original <file|directory>] [--jobs N]
+                       [--auto-repair] [--no-cache]
+    python validate.py --serve [--socket PATH]
 
 The first argument can be either:
 - An unpacked directory containing the Office document XML files
-- A packed Office file (.docx/.pptx/.xlsx) which will be unpacked to a temp directory
+- A packed Office file (.docx/.pptx/.xlsx), whose parts are read straight from the
+  archive (nothing is extracted to disk; auto-repairs only apply in memory)
+
+Large parts (e.g. worksheets over 16 MB) skip XSD validation, which needs the
+whole part in memory, unless --xsd-large-parts is given; the other checks
+stream them. JSON reports list them with XSD status "oversized".
+
+For quick iterations, --fail-fast stops at the first failing check,
+--time-budget defers checks not expected to finish in time (based on their
+cost in earlier runs) and --only limits the per-part checks to the given parts
+(e.g. word/document.xml). In these modes checks run cheapest first with XSD
+validation last, and every check that did not run is listed; the run never
+prints "All validations PASSED!", so finish with a full run before packing.
 
 Auto-repair fixes:
 - paraId/durableId values that exceed OOXML limits
 - Missing xml:space="preserve" on w:t elements with whitespace
+
+With --report json, the only thing written to stdout is a JSON report: one
+entry per check with pass/fail, errors (part/line/code), wall time and bytes
+parsed, plus XSD time per part. Free-form output goes to stderr.
+
+--serve starts a local validation server on a Unix socket that keeps compiled
+schemas and original-file baselines warm between calls. With --server, this
+script sends the validation to that server and prints the same output with the
+same exit code; if no server is running it validates in-process as usual.
+
+--batch validates many documents on a pool of --jobs worker processes (default:
+one per CPU). Its argument is either a directory, whose packed Office files are
+compared with --original (one file, or a directory holding the originals under
+the same relative paths), or a manifest with one "candidate<TAB>original" pair
+or {"path": ..., "original": ...} object per line. One JSON line is written per
+document as it finishes, then a {"summary": ...} line with docs/s and MB/s.
 """
 
 import argparse
+import contextlib
 import sys
-import tempfile
-import zipfile
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation.client import request
+from validation.report import ValidationReport
 
 
 def main():
     parser = argparse.ArgumentParser(description="Validate Office document XML files")
     parser.add_argument(
         "path",
+        nargs="?",
         help="Path to unpacked directory or packed Office file (.docx/.pptx/.xlsx)",
     )
     parser.add_argument(
         "--original",
-        required=True,
-        help="Path to original file (.docx/.pptx/.xlsx)",
+        help="Path to original file (.docx/.pptx/.xlsx); with --batch, may be a directory",
     )
     parser.add_argument(
         "-v",
@@ -45,59 +78,172 @@ def main():
         action="store_true",
         help="Automatically repair common issues (hex IDs, whitespace preservation)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Worker processes for per-part checks, or per document with --batch "
+        "(0 = one per CPU, default: 1, or one per CPU with --batch)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the persistent per-part result cache",
+    )
+    parser.add_argument(
+        "--xsd-large-parts",
+        action="store_true",
+        help="Also validate parts above the XSD size limit (large worksheets) against schemas",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first failing check (cheapest checks run first)",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Defer checks that are not expected to finish within SECONDS",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        metavar="PART",
+        help="Limit per-part checks to these parts (e.g. word/document.xml)",
+    )
+    parser.add_argument(
+        "--report",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Validate every document in a directory or manifest, one JSON line each",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a validation server that keeps schemas warm (until interrupted)",
+    )
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Validate through a running server, falling back to in-process validation",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Server socket path (default: $OOXML_VALIDATION_SOCKET or the cache directory)",
+    )
     args = parser.parse_args()
 
-    # Validate paths
-    path = Path(args.path)
-    original_file = Path(args.original)
-    file_extension = original_file.suffix.lower()
-    assert path.exists(), f"Error: {path} does not exist"
-    assert original_file.is_file(), f"Error: {original_file} is not a file"
-    assert file_extension in [".docx", ".pptx", ".xlsx"], (
-        f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
-    )
-
-    # If path is a packed file, unpack to temp directory
-    if path.is_file() and path.suffix.lower() in [".docx", ".pptx", ".xlsx"]:
-        temp_dir = tempfile.mkdtemp()
-        with zipfile.ZipFile(path, "r") as zf:
-            zf.extractall(temp_dir)
-        unpacked_dir = Path(temp_dir)
+    if args.serve:
+        from validation.server import serve
+
+        sys.exit(0 if serve(args.socket) else 1)
+    if args.batch:
+        if args.path is None:
+            parser.error("--batch requires a directory or manifest")
+        if Path(args.path).is_dir() and args.original is None:
+            parser.error("--original is required when batch validating a directory")
+        sys.exit(0 if run_batch(args) else 1)
+    if args.jobs is None:
+        args.jobs = 1
+    if args.path is None or args.original is None:
+        parser.error("path and --original are required")
+
+    if args.server:
+        response = run_on_server(args)
+        if response is not None:
+            json_report = args.report == "json"
+            sys.stdout.flush()
+            (sys.stderr if json_report else sys.stdout).write(response["stdout"])
+            sys.stderr.write(response["stderr"])
+            if json_report:
+                report = ValidationReport(echo=False)
+                report.load(response["report"])
+                print(report.to_json())
+            sys.exit(response["exit_code"])
+
+    if args.report == "json":
+        report = ValidationReport(echo=False)
+        with contextlib.redirect_stdout(sys.stderr):
+            success = run(args, report)
+        print(report.to_json())
     else:
-        assert path.is_dir(), f"Error: {path} is not a directory or Office file"
-        unpacked_dir = path
-
-    # Run validations
-    match file_extension:
-        case ".docx":
-            validators = [DOCXSchemaValidator, RedliningValidator]
-        case ".pptx":
-            validators = [PPTXSchemaValidator]
-        case _:
-            print(f"Error: Validation not supported for file type {file_extension}")
-            sys.exit(1)
-
-    # Auto-repair if requested
-    if args.auto_repair:
-        total_repairs = 0
-        for V in validators:
-            validator = V(unpacked_dir, original_file, verbose=args.verbose)
-            total_repairs += validator.repair()
-        if total_repairs:
-            print(f"Auto-repaired {total_repairs} issue(s)")
-
-    # Run validators
-    success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
-
-    if success:
-        print("All validations PASSED!")
+        success = run(args)
 
     sys.exit(0 if success else 1)
 
 
+def run(args, report=None):
+    """Validate args.path and return True if all validations pass.
+
+    When a ValidationReport is given, every check is recorded in it.
+    """
+    # Imported here so client runs (--server) never load lxml or the validators
+    from validation.runner import validate_path
+
+    return validate_path(
+        args.path,
+        args.original,
+        verbose=args.verbose,
+        auto_repair=args.auto_repair,
+        jobs=args.jobs,
+        cache=not args.no_cache,
+        report=report,
+        xsd_large_parts=args.xsd_large_parts,
+        fail_fast=args.fail_fast,
+        time_budget=args.time_budget,
+        only=args.only,
+    )
+
+
+def run_batch(args):
+    """Validate every document args.path lists; returns True if all pass."""
+    from validation.batch import (
+        find_documents,
+        format_summary,
+        read_manifest,
+        validate_batch,
+    )
+
+    if Path(args.path).is_dir():
+        pairs = find_documents(args.path, args.original)
+    else:
+        pairs = read_manifest(args.path, args.original)
+
+    summary = validate_batch(
+        pairs,
+        jobs=args.jobs or 0,
+        auto_repair=args.auto_repair,
+        cache=not args.no_cache,
+        xsd_large_parts=args.xsd_large_parts,
+    )
+    print(format_summary(summary), file=sys.stderr)
+    return summary["passed"] == summary["documents"]
+
+
+def run_on_server(args):
+    """Send the validation to a running server; returns None if none is available."""
+    return request(
+        "validate",
+        args.socket,
+        path=str(Path(args.path).absolute()),
+        original=str(Path(args.original).absolute()),
+        verbose=args.verbose,
+        auto_repair=args.auto_repair,
+        jobs=args.jobs,
+        cache=not args.no_cache,
+        report=args.report == "json",
+        xsd_large_parts=args.xsd_large_parts,
+        fail_fast=args.fail_fast,
+        time_budget=args.time_budget,
+        only=args.only,
+    )
+
+
 if __name__ == "__main__":
     main()
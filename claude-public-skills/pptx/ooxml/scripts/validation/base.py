@@ -2,12 +2,34 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import os
+import posixpath
 import re
+import time
+import zlib
 from pathlib import Path
 
-import defusedxml.minidom
 import lxml.etree
 
+from .baseline import OriginalBaseline
+from .cache import ResultCache, fingerprint_files
+from .condense import condense_xml_bytes
+from .package import PackageIndex, rels_part_for
+from .parallel import PartPool
+from .report import CheckError, print_failure, record_errors
+from .scheduler import CheckScheduler
+from .schemas import SCHEMA_REGISTRY
+from .streaming import scan_part
+from .zippackage import PackagePath, as_path, xml_source
+
+
+# Parser for parts rewritten by auto-repair: no entity expansion, no DTD
+# loading, no network (the guarantees defusedxml gives the minidom code paths)
+_REPAIR_PARSER = lxml.etree.XMLParser(
+    resolve_entities=False, no_network=True, load_dtd=False
+)
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -48,6 +70,32 @@ class BaseSchemaValidator:
         "grpsp": ("id", "file"),  # Group shape IDs
     }
 
+    # Checks validate() runs, in their default order (see CheckScheduler).
+    # validate_xml comes first: the other checks need well-formed XML
+    CHECKS = ()
+
+    # Checks that only print information and never fail validation
+    INFORMATIONAL_CHECKS = ()
+
+    # Parts larger than this are never kept as parsed trees between checks;
+    # element-level checks read them through the streaming scan instead
+    LARGE_PART_BYTES = 16 * 1024 * 1024
+
+    # Parts larger than this are skipped by XSD validation unless the validator
+    # is created with xsd_large_parts=True (None = validate parts of any size)
+    XSD_SIZE_LIMIT = None
+
+    # Attributes (Clark notation) recorded by the streaming scan for subclass checks
+    SCAN_TRACKED_ATTRIBUTES = ()
+
+    # Element-level auto-repairs applied by repair() in a single pass per part.
+    # Maps repair method name -> byte pattern a part must contain for the repair
+    # to apply (parts matching none of the patterns are not parsed at all).
+    # Repair log lines are printed grouped per repair, in this order.
+    REPAIRS = {
+        "_repair_text_whitespace": re.compile(rb"<[^\s<>/!?]+:t[\s>]"),
+    }
+
     # Container elements where ID uniqueness checks should be skipped
     # These hold references that intentionally duplicate IDs of elements they reference
     # Example: <p14:sldId id="301"> in sectionLst references <p:sldId id="301"> in sldIdLst
@@ -99,6 +147,13 @@ class BaseSchemaValidator:
         "http://schemas.openxmlformats.org/package/2006/content-types"
     )
 
+    # Version of the XSD preprocessing/validation logic. Bump it whenever that
+    # logic changes so results in the persistent result cache are not reused.
+    CACHE_VERSION = 2
+
+    # Template placeholders removed from text content before XSD validation
+    TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
     # Folders where we should clean ignorable namespaces
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
@@ -121,14 +176,69 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir).resolve()
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        schema_registry=None,
+        jobs=1,
+        result_cache=None,
+        report=None,
+        baseline_registry=None,
+        xsd_large_parts=False,
+    ):
+        self.unpacked_dir = as_path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
 
+        # Worker processes for per-part checks (0 = one per CPU)
+        self.jobs = jobs or os.cpu_count() or 1
+        if isinstance(self.unpacked_dir, PackagePath):
+            # Parts of a packed file (and any repairs) only live in this process
+            self.jobs = 1
+        self._pool = None
+
+        # Validate parts above XSD_SIZE_LIMIT against their schema too
+        self.xsd_large_parts = xsd_large_parts
+
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
 
+        # Compiled schemas are shared process-wide unless a registry is passed in
+        self.schema_registry = (
+            schema_registry if schema_registry is not None else SCHEMA_REGISTRY
+        )
+
+        # Per-part XSD results persisted across runs, keyed by content hash
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
+
+        # XSD errors of the original file, read from its zip on demand and
+        # shared with earlier runs when a BaselineRegistry is passed in
+        self.baseline = OriginalBaseline(
+            self.original_file,
+            self._validate_xsd_tree,
+            result_cache=self.result_cache if self.result_cache.enabled else None,
+            cache_key=self._xsd_cache_key,
+            errors=(
+                baseline_registry.errors_memo(type(self).__name__, self.original_file)
+                if baseline_registry is not None
+                else None
+            ),
+        )
+
+        # Parsed trees and streaming scans shared by all checks (see _parse, _scan)
+        self._parsed = {}
+        self._scans = {}
+
+        # Part set, content types and relationship graph (see _package_index)
+        self._package = None
+
+        # Optional ValidationReport the checks are recorded in, and the number
+        # of XML bytes parsed so far (reported per check)
+        self.report = report
+        self.bytes_parsed = 0
+
         # Get all XML and .rels files
         patterns = ["*.xml", "*.rels"]
         self.xml_files = [
@@ -138,97 +248,280 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+    def _parse(self, xml_file):
+        """Return the parsed tree for xml_file, parsing each file at most once.
+
+        The tree is shared between all checks and must be treated as read-only;
+        checks that modify it should use _parse_copy(). Parse errors are cached
+        too and re-raised on every call.
+        """
+        key = as_path(xml_file)
+        if key not in self._parsed:
+            size = key.stat().st_size if key.exists() else 0
+            self.bytes_parsed += size
+            try:
+                tree = lxml.etree.parse(xml_source(key))
+            except Exception as e:
+                tree = e
+            if size > self.LARGE_PART_BYTES:
+                # Not worth the memory: large parts are re-parsed when needed
+                if isinstance(tree, Exception):
+                    raise tree
+                return tree
+            self._parsed[key] = tree
+
+        tree = self._parsed[key]
+        if isinstance(tree, Exception):
+            raise tree
+        return tree
+
+    def _parse_copy(self, xml_file):
+        """Return a private, modifiable copy of the parsed tree for xml_file."""
+        return copy.deepcopy(self._parse(xml_file))
+
+    def _scan(self, xml_file):
+        """Return the PartScan for xml_file, walking each file at most once.
+
+        The scan gathers everything the element-level checks (unique IDs,
+        relationship IDs, whitespace, tracked changes, comment markers) need in
+        a single bounded-memory iterparse pass. Parse errors are cached and
+        re-raised like in _parse().
+        """
+        key = as_path(xml_file)
+        if key not in self._scans:
+            try:
+                self.bytes_parsed += key.stat().st_size
+                self._scans[key] = scan_part(
+                    xml_source(key),
+                    self.UNIQUE_ID_REQUIREMENTS,
+                    self.EXCLUDED_ID_CONTAINERS,
+                    self.SCAN_TRACKED_ATTRIBUTES,
+                )
+            except Exception as e:
+                self._scans[key] = e
+
+        scan = self._scans[key]
+        if isinstance(scan, Exception):
+            raise scan
+        return scan
+
+    def _package_index(self):
+        """Return the PackageIndex of the unpacked directory, building it once."""
+        if self._package is None:
+            self._package = PackageIndex(self.unpacked_dir, self._parse)
+        return self._package
+
+    def invalidate(self, xml_file=None):
+        """Drop the cached parse and scan of xml_file (or of all files) after it was rewritten."""
+        self._package = None
+        if xml_file is None:
+            self._parsed.clear()
+            self._scans.clear()
+        else:
+            self._parsed.pop(as_path(xml_file), None)
+            self._scans.pop(as_path(xml_file), None)
+
+    def _map_parts(self, method_name, xml_files):
+        """Call the per-part method method_name(xml_file) for every file.
+
+        With jobs > 1 the calls are spread over worker processes. Results always
+        come back in the order of xml_files, so the merged output is identical
+        to a sequential run.
+        """
+        xml_files = list(xml_files)
+        if self.jobs <= 1 or len(xml_files) < 2:
+            method = getattr(self, method_name)
+            return [method(xml_file) for xml_file in xml_files]
+
+        if self._pool is None:
+            self._pool = PartPool(
+                type(self),
+                (self.unpacked_dir, self.original_file),
+                {
+                    "result_cache": self.result_cache,
+                    "xsd_large_parts": self.xsd_large_parts,
+                },
+                self.jobs,
+            )
+        return self._pool.map(method_name, xml_files)
+
+    def close(self):
+        """Release worker processes and the original archive."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        self.baseline.close()
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
-        raise NotImplementedError("Subclasses must implement the validate method")
+        if not self.CHECKS:
+            raise NotImplementedError("Subclasses must define CHECKS")
+        return CheckScheduler(self.report, self.result_cache).run([self])
+
+    def limit_parts(self, parts):
+        """Limit the per-part checks to the given part names ("word/document.xml").
+
+        Package-level checks (relationships, content types) still look at the
+        whole package. Returns True: those checks always apply.
+        """
+        parts = set(parts)
+        self.xml_files = [
+            f
+            for f in self.xml_files
+            if f.relative_to(self.unpacked_dir).as_posix() in parts
+        ]
+        return True
 
     def repair(self) -> int:
-        """Run auto-repairs. Returns count of repairs made. Subclasses should override and call super()."""
-        return self.repair_whitespace_preservation()
+        """Run all auto-repairs in REPAIRS. Returns count of repairs made."""
+        return self._apply_repairs(list(self.REPAIRS))
 
     def repair_whitespace_preservation(self) -> int:
         """Add xml:space='preserve' to w:t/a:t elements with leading/trailing whitespace."""
-        repairs = 0
+        return self._apply_repairs(["_repair_text_whitespace"])
+
+    def _apply_repairs(self, repair_names):
+        """Apply the named element repairs to every part in one pass per part.
+
+        Each part is parsed once with entity expansion and network access
+        disabled, every element is offered to every applicable repair, and
+        only parts that were actually changed are written back. Parts that are
+        not well-formed or that declare entities (which defusedxml refuses) are
+        left untouched.
+
+        Returns:
+            int: Number of repairs made
+        """
+        repairs = {name: [] for name in repair_names}  # name -> log lines
 
         for xml_file in self.xml_files:
             try:
-                content = xml_file.read_text(encoding="utf-8")
-                dom = defusedxml.minidom.parseString(content)
-                modified = False
-
-                for elem in dom.getElementsByTagName("*"):
-                    if elem.tagName.endswith(":t") and elem.firstChild:
-                        text = elem.firstChild.nodeValue
-                        if text and (text.startswith((' ', '\t')) or text.endswith((' ', '\t'))):
-                            if elem.getAttribute("xml:space") != "preserve":
-                                elem.setAttribute("xml:space", "preserve")
-                                text_preview = repr(text[:30]) + "..." if len(text) > 30 else repr(text)
-                                print(f"  Repaired: {xml_file.name}: Added xml:space='preserve' to {elem.tagName}: {text_preview}")
-                                repairs += 1
-                                modified = True
-
-                if modified:
-                    xml_file.write_bytes(dom.toxml(encoding="UTF-8"))
+                data = xml_file.read_bytes()
+                active = [
+                    (getattr(self, name), name)
+                    for name in repair_names
+                    if self.REPAIRS[name].search(data)
+                ]
+                if not active:
+                    continue
+
+                tree = lxml.etree.fromstring(data, _REPAIR_PARSER).getroottree()
+                dtd = tree.docinfo.internalDTD
+                if dtd is not None and any(True for _ in dtd.iterentities()):
+                    continue
+
+                file_repairs = []
+                for elem in tree.iter(lxml.etree.Element):
+                    for repair, name in active:
+                        message = repair(xml_file, elem)
+                        if message:
+                            file_repairs.append((name, message))
+
+                if file_repairs:
+                    xml_file.write_bytes(
+                        lxml.etree.tostring(
+                            tree,
+                            xml_declaration=True,
+                            encoding="UTF-8",
+                            standalone=tree.docinfo.standalone,
+                        )
+                    )
+                    self.invalidate(xml_file)
+                    for name, message in file_repairs:
+                        repairs[name].append(message)
 
             except Exception:
                 pass
 
-        return repairs
+        for messages in repairs.values():
+            for message in messages:
+                print(message)
+
+        return sum(len(messages) for messages in repairs.values())
+
+    def _repair_text_whitespace(self, xml_file, elem):
+        """Add xml:space='preserve' to a text element (w:t, a:t, ...) whose text
+        starts or ends with a space or tab. Returns the log line, or None."""
+        if elem.prefix is None or not elem.tag.endswith("}t"):
+            return None
+
+        text = elem.text
+        xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
+        if (
+            text
+            and (text.startswith((" ", "\t")) or text.endswith((" ", "\t")))
+            and elem.get(xml_space_attr) != "preserve"
+        ):
+            elem.set(xml_space_attr, "preserve")
+            text_preview = repr(text[:30]) + "..." if len(text) > 30 else repr(text)
+            return (
+                f"  Repaired: {xml_file.name}: Added xml:space='preserve' "
+                f"to {elem.prefix}:t: {text_preview}"
+            )
+        return None
 
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
-        errors = []
-
-        for xml_file in self.xml_files:
-            try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
-            except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
-            except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
-                )
+        errors = [
+            error
+            for error in self._map_parts("_check_well_formed", self.xml_files)
+            if error
+        ]
 
         if errors:
-            print(f"FAILED - Found {len(errors)} XML violations:")
-            for error in errors:
-                print(error)
+            print_failure(f"Found {len(errors)} XML violations:", errors)
             return False
         else:
             if self.verbose:
                 print("PASSED - All XML files are well-formed")
             return True
 
+    def _check_well_formed(self, xml_file):
+        """Return a CheckError if xml_file is not well-formed, else None."""
+        try:
+            # Scanning reports the same syntax errors as a full parse and its
+            # result is cached for the element-level checks
+            self._scan(xml_file)
+        except lxml.etree.XMLSyntaxError as e:
+            return CheckError(
+                xml_file.relative_to(self.unpacked_dir), e.lineno, "not_well_formed", e.msg
+            )
+        except Exception as e:
+            return CheckError(
+                xml_file.relative_to(self.unpacked_dir),
+                None,
+                "check_error",
+                f"Unexpected error: {str(e)}",
+            )
+        return None
+
     def validate_namespaces(self):
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+                scan = self._scan(xml_file)
+                declared = set(scan.root_nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
+                    v for k, v in scan.root_attrib.items() if k.endswith("Ignorable")
                 ]:
                     undeclared = set(attr_val.split()) - declared
                     errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
+                        CheckError(
+                            xml_file.relative_to(self.unpacked_dir),
+                            None,
+                            "undeclared_namespace",
+                            f"Namespace '{ns}' in Ignorable but not declared",
+                        )
                         for ns in undeclared
                     )
             except lxml.etree.XMLSyntaxError:
                 continue
 
         if errors:
-            print(f"FAILED - {len(errors)} namespace issues:")
-            for error in errors:
-                print(error)
+            print_failure(f"{len(errors)} namespace issues:", errors)
             return False
         if self.verbose:
             print("PASSED - All namespace prefixes properly declared")
@@ -239,205 +532,128 @@ class BaseSchemaValidator:
         errors = []
         global_ids = {}  # Track globally unique IDs across all files
 
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
-
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
+        # Per-file findings come back in document order; global IDs are merged here
+        all_findings = self._map_parts("_collect_unique_ids", self.xml_files)
+        for xml_file, findings in zip(self.xml_files, all_findings):
+            for finding in findings:
+                if finding[0] == "error":
+                    errors.append(finding[1])
+                    continue
 
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        # Skip if element is inside an excluded container
-                        # (e.g., <p14:sldId> inside <p14:sectionLst> is a reference, not a definition)
-                        in_excluded_container = any(
-                            ancestor.tag.split("}")[-1].lower() in self.EXCLUDED_ID_CONTAINERS
-                            for ancestor in elem.iterancestors()
+                _, id_value, line, tag = finding
+                if id_value in global_ids:
+                    prev_file, prev_line, prev_tag = global_ids[id_value]
+                    errors.append(
+                        CheckError(
+                            xml_file.relative_to(self.unpacked_dir),
+                            line,
+                            "duplicate_global_id",
+                            f"Global ID '{id_value}' in <{tag}> already used in "
+                            f"{prev_file} at line {prev_line} in <{prev_tag}>",
                         )
-                        if in_excluded_container:
-                            continue
-
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                    )
+                else:
+                    global_ids[id_value] = (
+                        xml_file.relative_to(self.unpacked_dir),
+                        line,
+                        tag,
+                    )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
-            for error in errors:
-                print(error)
+            print_failure(f"Found {len(errors)} ID uniqueness violations:", errors)
             return False
         else:
             if self.verbose:
                 print("PASSED - All required IDs are unique")
             return True
 
+    def _collect_unique_ids(self, xml_file):
+        """Check file-scoped ID uniqueness for one file.
+
+        Returns a list of findings in document order: ("error", CheckError)
+        for file-level violations and ("global", id_value, line, tag) for IDs
+        that must be unique across files, which the caller merges.
+        """
+        findings = []
+
+        try:
+            # The scan skips mc:AlternateContent and excluded containers
+            for finding in self._scan(xml_file).id_findings:
+                if finding[0] == "global":
+                    # Global uniqueness is checked by the caller
+                    findings.append(finding)
+                    continue
+
+                _, line, tag, attr_name, id_value, prev_line = finding
+                findings.append((
+                    "error",
+                    CheckError(
+                        xml_file.relative_to(self.unpacked_dir),
+                        line,
+                        "duplicate_id",
+                        f"Duplicate {attr_name}='{id_value}' in <{tag}> "
+                        f"(first occurrence at line {prev_line})",
+                    ),
+                ))
+
+        except (lxml.etree.XMLSyntaxError, Exception) as e:
+            findings.append((
+                "error",
+                CheckError(
+                    xml_file.relative_to(self.unpacked_dir), None, "check_error", f"Error: {e}"
+                ),
+            ))
+
+        return findings
+
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
         """
         errors = []
 
-        # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        package = self._package_index()
 
-        if not rels_files:
+        if not package.rels_parts:
             if self.verbose:
                 print("PASSED - No .rels files found")
             return True
 
-        # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
-
-        # Track all files that are referenced by any .rels file
-        all_referenced_files = set()
+        # All files that must be reached through relationships
+        all_files = [
+            part
+            for part in package.files
+            if part != "[Content_Types].xml" and not part.endswith(".rels")
+        ]
 
         if self.verbose:
             print(
-                f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
+                f"Found {len(package.rels_parts)} .rels files and {len(all_files)} target files"
             )
 
-        # Check each .rels file
-        for rels_file in rels_files:
+        # Check each .rels file for targets that do not exist
+        for rels_part in package.rels_parts:
             try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
-                broken_refs = []
-
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
-                    if target and not target.startswith(
-                        ("http", "mailto:")
-                    ):  # Skip external URLs
-                        # Resolve the target path
-                        # Absolute paths (starting with /) are relative to package root
-                        # Relative paths are relative to the .rels file's parent directory
-                        if target.startswith("/"):
-                            # Absolute path - resolve from unpacked_dir root
-                            # Strip leading / to avoid pathlib replacing the base
-                            target_path = self.unpacked_dir / target.lstrip("/")
-                        elif rels_file.name == ".rels":
-                            # Root .rels file - relative targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
-                        else:
-                            # Other .rels files - relative targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
-
-                # Report broken references
-                if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
-                    for broken_ref, line_num in broken_refs:
+                for rel in package.relationships(rels_part):
+                    if rel.part is not None and rel.part not in package.files:
                         errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
+                            CheckError(
+                                rels_part,
+                                rel.line,
+                                "broken_reference",
+                                f"Broken reference to {rel.target}",
+                            )
                         )
-
             except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
+                errors.append(CheckError(rels_part, None, "check_error", f"Error: {e}"))
 
-        # Check for unreferenced files (files that exist but are not referenced anywhere)
-        unreferenced_files = set(all_files) - all_referenced_files
-
-        if unreferenced_files:
-            for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+        # Files that cannot be reached from the package relationships
+        reachable = package.reachable_parts()
+        for part in sorted(set(all_files) - reachable):
+            errors.append(CheckError(part, None, "unreferenced_part", "Unreferenced file"))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} relationship validation errors:")
-            for error in errors:
-                print(error)
+            print_failure(f"Found {len(errors)} relationship validation errors:", errors)
             print(
                 "CRITICAL: These errors will cause the document to appear corrupt. "
                 + "Broken references MUST be fixed, "
@@ -456,98 +672,96 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
-        # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
-            # Skip .rels files themselves
-            if xml_file.suffix == ".rels":
-                continue
+        # Each file is checked against its own .rels file, so files are independent
+        for file_errors in self._map_parts("_check_relationship_ids", self.xml_files):
+            errors.extend(file_errors)
 
-            # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
+        if errors:
+            print_failure(f"Found {len(errors)} relationship ID reference errors:", errors)
+            print("\nThese ID mismatches will cause the document to appear corrupt!")
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All relationship ID references are valid")
+            return True
 
-            # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
-                continue
+    def _check_relationship_ids(self, xml_file):
+        """Return r:id reference errors (CheckErrors) for a single XML file."""
+        errors = []
 
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
+        # Skip .rels files themselves
+        if xml_file.suffix == ".rels":
+            return errors
 
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+        # The corresponding .rels file: for dir/file.xml, it's dir/_rels/file.xml.rels
+        package = self._package_index()
+        rels_part = rels_part_for(package.part_name(xml_file))
+
+        # Skip if there's no corresponding .rels file (that's okay)
+        if rels_part not in package.files:
+            return errors
+
+        try:
+            # Valid relationship IDs and their types
+            rid_to_type = {}
+
+            for rel in package.relationships(rels_part):
+                rid = rel.id
+                if rid:
+                    # Check for duplicate rIds
+                    if rid in rid_to_type:
+                        errors.append(
+                            CheckError(
+                                rels_part,
+                                rel.line,
+                                "duplicate_relationship_id",
+                                f"Duplicate relationship ID '{rid}' (IDs must be unique)",
                             )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
                         )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+                    # Extract just the type name from the full URL
+                    type_name = (
+                        rel.type.split("/")[-1] if "/" in rel.type else rel.type
+                    )
+                    rid_to_type[rid] = type_name
+
+            # All r:id references in the XML file, from its streaming scan
+            xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+            for line, elem_name, rid_attr in self._scan(xml_file).relationship_refs:
+                # Check if the ID exists
+                if rid_attr not in rid_to_type:
+                    errors.append(
+                        CheckError(
+                            xml_rel_path,
+                            line,
+                            "missing_relationship",
+                            f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                            f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})",
                         )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
+                    )
+                # Check if we have type expectations for this element
+                elif self.ELEMENT_RELATIONSHIP_TYPES:
+                    expected_type = self._get_expected_relationship_type(elem_name)
+                    if expected_type:
+                        actual_type = rid_to_type[rid_attr]
+                        # Check if the actual type matches or contains the expected type
+                        if expected_type not in actual_type.lower():
                             errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
+                                CheckError(
+                                    xml_rel_path,
+                                    line,
+                                    "wrong_relationship_type",
+                                    f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                    f"but should point to a '{expected_type}' relationship",
+                                )
                             )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
 
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+        except Exception as e:
+            xml_rel_path = xml_file.relative_to(self.unpacked_dir)
+            errors.append(CheckError(xml_rel_path, None, "check_error", f"Error: {e}"))
 
-        if errors:
-            print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
-            for error in errors:
-                print(error)
-            print("\nThese ID mismatches will cause the document to appear corrupt!")
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All relationship ID references are valid")
-            return True
+        return errors
 
     def _get_expected_relationship_type(self, element_name):
         """
@@ -590,32 +804,24 @@ class BaseSchemaValidator:
         errors = []
 
         # Find [Content_Types].xml file
-        content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
-            print("FAILED - [Content_Types].xml file not found")
+        package = self._package_index()
+        if "[Content_Types].xml" not in package.files:
+            print_failure(
+                None,
+                [
+                    CheckError(
+                        "[Content_Types].xml",
+                        None,
+                        "missing_content_types",
+                        "[Content_Types].xml file not found",
+                    )
+                ],
+            )
             return False
 
         try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
-
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
+            # Declared extensions (Default) and specific parts (Override)
+            declared_extensions, declared_parts = package.content_types()
 
             # Root elements that require content type declaration
             declarable_roots = {
@@ -641,15 +847,10 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
-
             # Check all XML files for Override declarations
-            for xml_file in self.xml_files:
-                path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
-                    "\\", "/"
-                )
+            for path_str in package.files:
+                if not path_str.endswith(".xml"):
+                    continue
 
                 # Skip non-content files
                 if any(
@@ -659,43 +860,51 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = package.root_tag(path_str)
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
                         errors.append(
-                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+                            CheckError(
+                                path_str,
+                                None,
+                                "undeclared_part",
+                                f"File with <{root_name}> root not declared in [Content_Types].xml",
+                            )
                         )
 
                 except Exception:
                     continue  # Skip unparseable files
 
             # Check all non-XML files for Default extension declarations
-            for file_path in all_files:
+            for relative_path in package.files:
                 # Skip XML files and metadata files (already checked above)
-                if file_path.suffix.lower() in {".xml", ".rels"}:
+                extension = posixpath.splitext(relative_path)[1].lstrip(".").lower()
+                if extension in {"xml", "rels"}:
                     continue
-                if file_path.name == "[Content_Types].xml":
-                    continue
-                if "_rels" in file_path.parts or "docProps" in file_path.parts:
+                folders = relative_path.split("/")[:-1]
+                if "_rels" in folders or "docProps" in folders:
                     continue
 
-                extension = file_path.suffix.lstrip(".").lower()
                 if extension and extension not in declared_extensions:
                     # Check if it's a known media extension that should be declared
                     if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
                         errors.append(
-                            f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
+                            CheckError(
+                                relative_path,
+                                None,
+                                "undeclared_extension",
+                                f"File with extension '{extension}' not declared in [Content_Types].xml - should add: <Default Extension=\"{extension}\" ContentType=\"{media_extensions[extension]}\"/>",
+                            )
                         )
 
         except Exception as e:
-            errors.append(f"  Error parsing [Content_Types].xml: {e}")
+            errors.append(
+                CheckError("[Content_Types].xml", None, "check_error", f"Error: {e}")
+            )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} content type declaration errors:")
-            for error in errors:
-                print(error)
+            print_failure(f"Found {len(errors)} content type declaration errors:", errors)
             return False
         else:
             if self.verbose:
@@ -714,19 +923,38 @@ class BaseSchemaValidator:
         Returns:
             tuple: (is_valid, new_errors_set) where is_valid is True/False/None (skipped)
         """
+        is_valid, new_errors, _ = self._validate_part_against_xsd(xml_file, verbose)
+        return is_valid, new_errors
+
+    def _validate_part_against_xsd(self, xml_file, verbose=False):
+        """Per-part XSD check behind validate_file_against_xsd.
+
+        Returns:
+            tuple: (is_valid, new_errors_set, unchanged) where unchanged is True if
+            the part matched the original byte for byte and was not validated
+        """
         # Resolve both paths to handle symlinks
-        xml_file = Path(xml_file).resolve()
+        xml_file = as_path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
 
+        if not self._get_schema_path(xml_file) or self._exceeds_xsd_size_limit(xml_file):
+            return None, set(), False  # Skipped
+
+        # Parts identical to the original cannot introduce new errors
+        if self._matches_original(xml_file, unpacked_dir):
+            if verbose:
+                print("PASSED - Unchanged from original")
+            return True, set(), True
+
         # Validate current file
         is_valid, current_errors = self._validate_single_file_xsd(
             xml_file, unpacked_dir
         )
 
         if is_valid is None:
-            return None, set()  # Skipped
+            return None, set(), False  # Skipped
         elif is_valid:
-            return True, set()  # Valid, no errors
+            return True, set(), False  # Valid, no errors
 
         # Get errors from original file for this specific file
         original_errors = self._get_original_file_errors(xml_file)
@@ -745,32 +973,86 @@ class BaseSchemaValidator:
             if verbose:
                 relative_path = xml_file.relative_to(unpacked_dir)
                 print(f"FAILED - {relative_path}: {len(new_errors)} new error(s)")
-                for error in list(new_errors)[:3]:
+                for error in sorted(new_errors)[:3]:
                     truncated = error[:250] + "..." if len(error) > 250 else error
                     print(f"  - {truncated}")
-            return False, new_errors
+            return False, new_errors, False
         else:
             # All errors existed in original
             if verbose:
                 print(
                     f"PASSED - No new errors (original had {len(current_errors)} errors)"
                 )
-            return True, set()
+            return True, set(), False
+
+    def _timed_xsd_part(self, xml_file):
+        """Run _validate_part_against_xsd and return (result, seconds)."""
+        start = time.perf_counter()
+        result = self._validate_part_against_xsd(xml_file)
+        return result, time.perf_counter() - start
+
+    def _exceeds_xsd_size_limit(self, xml_file):
+        """Return True if xml_file is too large to be validated against its schema."""
+        if self.XSD_SIZE_LIMIT is None or self.xsd_large_parts:
+            return False
+        return xml_file.stat().st_size > self.XSD_SIZE_LIMIT
+
+    def _matches_original(self, xml_file, unpacked_dir):
+        """Return True if xml_file is byte-identical to its original member once condensed.
+
+        The comparison uses the CRC-32 and size stored in the original archive's
+        central directory, so the original member is neither decompressed nor
+        parsed. Raw bytes are tried first (e.g. a packed file extracted as-is),
+        then the pack-style condensed form of a pretty-printed part.
+        """
+        info = self.baseline.member_info(xml_file.relative_to(unpacked_dir))
+        if info is None:
+            return False
+
+        try:
+            data = xml_file.read_bytes()
+            if len(data) == info.file_size and zlib.crc32(data) == info.CRC:
+                return True
+            condensed = condense_xml_bytes(data)
+        except Exception:
+            return False  # Unreadable or malformed; let validation report it
+
+        return len(condensed) == info.file_size and zlib.crc32(condensed) == info.CRC
 
     def validate_against_xsd(self):
         """Validate XML files against XSD schemas, showing only new errors compared to original."""
         new_errors = []
+        lines = []  # Per-part summaries listing the first errors of each part
         original_error_count = 0
         valid_count = 0
         skipped_count = 0
+        oversized_count = 0
+        unchanged_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._map_parts("_timed_xsd_part", self.xml_files)
+        for xml_file, ((is_valid, new_file_errors, unchanged), seconds) in zip(
+            self.xml_files, results
+        ):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
-
-            if is_valid is None:
+            oversized = is_valid is None and self._exceeds_xsd_size_limit(xml_file)
+            if unchanged:
+                unchanged_count += 1
+
+            if self.report is not None:
+                if unchanged:
+                    status = "unchanged"
+                elif oversized:
+                    status = "oversized"
+                elif is_valid is None:
+                    status = "skipped"
+                else:
+                    status = "invalid" if new_file_errors else "valid"
+                self.report.add_xsd_part(relative_path, seconds, status)
+
+            if oversized:
+                oversized_count += 1
+                continue
+            elif is_valid is None:
                 skipped_count += 1
                 continue
             elif is_valid and not new_file_errors:
@@ -783,9 +1065,13 @@ class BaseSchemaValidator:
                 continue
 
             # Has new errors
-            new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
-                new_errors.append(
+            new_file_errors = sorted(new_file_errors)
+            new_errors.extend(
+                CheckError(relative_path, None, "xsd", error) for error in new_file_errors
+            )
+            lines.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
+            for error in new_file_errors[:3]:  # Show first 3 errors
+                lines.append(
                     f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
                 )
 
@@ -794,16 +1080,21 @@ class BaseSchemaValidator:
             print(f"Validated {len(self.xml_files)} files:")
             print(f"  - Valid: {valid_count}")
             print(f"  - Skipped (no schema): {skipped_count}")
+            if oversized_count:
+                print(
+                    f"  - Skipped (larger than {self.XSD_SIZE_LIMIT // (1024 * 1024)} MB, "
+                    f"see --xsd-large-parts): {oversized_count}"
+                )
+            if unchanged_count:
+                print(f"  - Unchanged from original (not re-validated): {unchanged_count}")
             if original_error_count:
                 print(f"  - With original errors (ignored): {original_error_count}")
-            print(
-                f"  - With NEW errors: {len(new_errors) > 0 and len([e for e in new_errors if not e.startswith('    ')]) or 0}"
-            )
+            print(f"  - With NEW errors: {len({e.part for e in new_errors})}")
 
         if new_errors:
-            print("\nFAILED - Found NEW validation errors:")
-            for error in new_errors:
-                print(error)
+            print()
+            print_failure("Found NEW validation errors:", lines)
+            record_errors(new_errors)
             return False
         else:
             if self.verbose:
@@ -834,96 +1125,136 @@ class BaseSchemaValidator:
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
-
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
+    def _prepare_for_xsd(self, xml_doc, clean_namespaces):
+        """Return a copy of xml_doc ready for XSD validation.
 
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
+        A single pass over one copy of the tree:
+        - template tags ({{ ... }}) are removed from text content, except in
+          t elements, where they are text the document really contains
+        - mc:Ignorable is removed from the root element
+        - with clean_namespaces, attributes and elements outside
+          OOXML_NAMESPACES are removed
 
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
+        Args:
+            xml_doc: Parsed lxml ElementTree (not modified)
+            clean_namespaces: Remove attributes and elements not in an allowed namespace
+        """
+        xml_copy = copy.deepcopy(xml_doc)
+        root = xml_copy.getroot()
 
-        return lxml.etree.ElementTree(xml_copy)
+        ignorable = f"{{{self.MC_NAMESPACE}}}Ignorable"
+        if ignorable in root.attrib:
+            del root.attrib[ignorable]
 
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
+        strip_template_tags = self.TEMPLATE_TAG_PATTERN.sub
+        allowed = self.OOXML_NAMESPACES
+        foreign = {}  # Qualified name -> True if outside the allowed namespaces
         elements_to_remove = []
 
-        # Find elements to remove
-        for elem in list(root):
-            # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
+        # Elements only: comments and processing instructions are left as they are
+        for elem in root.iter(lxml.etree.Element):
+            tag = elem.tag
+            if not (tag.endswith("}t") or tag == "t"):
+                text = elem.text
+                if text and "{{" in text:
+                    elem.text = strip_template_tags("", text)
+                tail = elem.tail
+                if tail and "{{" in tail:
+                    elem.tail = strip_template_tags("", tail)
+
+            if not clean_namespaces:
                 continue
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
+            is_foreign = foreign.get(tag)
+            if is_foreign is None:
+                is_foreign = foreign[tag] = (
+                    tag.startswith("{") and tag[1:].split("}", 1)[0] not in allowed
+                )
+            if is_foreign and elem is not root:
+                # Removed with its whole subtree once the walk is done
+                elements_to_remove.append(elem)
+                continue
 
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
+            for name in elem.keys():
+                is_foreign = foreign.get(name)
+                if is_foreign is None:
+                    is_foreign = foreign[name] = (
+                        name.startswith("{")
+                        and name[1:].split("}", 1)[0] not in allowed
+                    )
+                if is_foreign:
+                    del elem.attrib[name]
 
-        # Remove collected elements
         for elem in elements_to_remove:
-            root.remove(elem)
+            elem.getparent().remove(elem)
 
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
-
-        # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
-
-        return xml_doc
+        return xml_copy
 
     def _validate_single_file_xsd(self, xml_file, base_path):
         """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
-        schema_path = self._get_schema_path(xml_file)
-        if not schema_path:
+        if not self._get_schema_path(xml_file):
             return None, None  # Skip file
 
+        relative_path = xml_file.relative_to(base_path)
+        key = None
+        if self.result_cache.enabled:
+            try:
+                key = self._xsd_cache_key(relative_path, xml_file.read_bytes())
+            except OSError as e:
+                return False, {str(e)}
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached["valid"], set(cached["errors"])
+
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            xml_doc = self._parse(xml_file)
+        except Exception as e:
+            return False, {str(e)}
+
+        is_valid, errors = self._validate_xsd_tree(xml_doc, relative_path)
+        if key is not None:
+            self.result_cache.put(key, {"valid": is_valid, "errors": sorted(errors or ())})
+        return is_valid, errors
+
+    def _xsd_cache_key(self, relative_path, data):
+        """Result-cache key for validating data as the part at relative_path.
+
+        Identical bytes at the same path share one entry, whether they come from
+        the unpacked directory or from the original archive.
+        """
+        return self.result_cache.make_key(
+            "xsd",
+            type(self).__name__,
+            str(self.CACHE_VERSION),
+            fingerprint_files(self.schemas_dir),
+            Path(relative_path).as_posix(),
+            data,
+        )
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+    def _validate_xsd_tree(self, xml_doc, relative_path):
+        """Validate a parsed XML document against its XSD schema.
 
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+        Args:
+            xml_doc: Parsed lxml ElementTree (not modified)
+            relative_path: Path of the part relative to the package root
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+        Returns:
+            tuple: (is_valid, errors_set), or (None, None) if no schema applies
+        """
+        schema_path = self._get_schema_path(relative_path)
+        if not schema_path:
+            return None, None  # Skip file
+
+        try:
+            # Load schema (compiled once per process)
+            schema = self.schema_registry.get(schema_path)
+
+            # Preprocess XML, cleaning ignorable namespaces in main content parts
+            xml_doc = self._prepare_for_xsd(
+                xml_doc,
+                clean_namespaces=bool(relative_path.parts)
+                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS,
+            )
 
             # Validate
             if schema.validate(xml_doc):
@@ -941,82 +1272,21 @@ class BaseSchemaValidator:
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
+        The member is parsed straight from the original zip and the result is
+        memoized, so repeated lookups for the same part are free.
+
         Args:
             xml_file: Path to the XML file in unpacked_dir to check
 
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
-        xml_file = Path(xml_file).resolve()
+        xml_file = as_path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
-
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
-
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
-
-        Template tags follow the pattern {{ ... }} and are used as placeholders
-        for content replacement. They should be removed from text content before
-        XSD validation while preserving XML structure.
-
-        Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
-        """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
-                    )
-                return template_pattern.sub("", text)
-            return text
-
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
-
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
-
-        return lxml.etree.ElementTree(xml_copy), warnings
+        return self.baseline.errors_for(relative_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,179 @@
+"""
+Persistent cache of per-part validation results keyed by content hash.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# Environment variable that overrides the default cache location
+CACHE_DIR_ENV = "OOXML_VALIDATION_CACHE"
+
+# Entries not read or written for this many seconds are deleted by prune()
+MAX_ENTRY_AGE = 30 * 24 * 60 * 60
+
+# Total bytes of entries kept by prune(); the least recently used go first
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# Seconds between automatic prunes, done by the first put() of a process
+# once this long has passed since the last one
+PRUNE_INTERVAL = 24 * 60 * 60
+
+# File in the cache directory whose modification time records the last prune
+PRUNE_MARKER = "last-prune"
+
+_fingerprints = {}  # (directory, pattern) -> digest, computed once per process
+
+
+def fingerprint_files(directory, pattern="**/*.xsd"):
+    """Return a digest of the names and contents of all files matching pattern.
+
+    Used to tie cached XSD results to the exact schema set that produced them.
+    """
+    directory = Path(directory)
+    cache_key = (directory.resolve(), pattern)
+    if cache_key not in _fingerprints:
+        digest = hashlib.sha256()
+        for path in sorted(directory.glob(pattern)):
+            digest.update(path.relative_to(directory).as_posix().encode())
+            digest.update(path.read_bytes())
+        _fingerprints[cache_key] = digest.hexdigest()
+    return _fingerprints[cache_key]
+
+
+def write_json_atomic(path, value):
+    """Write value to path as JSON via a temporary file, so readers never see
+    a partial file. Raises OSError."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(value, f)
+    os.replace(temp_name, path)
+
+
+class ResultCache:
+    """On-disk store of JSON results, one small file per key.
+
+    Keys are content hashes built with make_key(), so entries never need to be
+    invalidated: a changed part, schema set or validator version simply hashes
+    to a different key. Writes are atomic and any I/O error just turns into a
+    cache miss, so a read-only or missing cache directory never fails validation.
+
+    Entries that are no longer looked up are left behind by such changes, so
+    the cache is pruned to max_age and max_bytes at most once per
+    PRUNE_INTERVAL; every hit refreshes an entry's modification time.
+    """
+
+    def __init__(
+        self,
+        cache_dir=None,
+        enabled=True,
+        max_age=MAX_ENTRY_AGE,
+        max_bytes=MAX_CACHE_BYTES,
+    ):
+        if cache_dir is None:
+            cache_dir = os.environ.get(CACHE_DIR_ENV) or (
+                Path.home() / ".cache" / "ooxml-validation"
+            )
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._prune_checked = False
+
+    @staticmethod
+    def make_key(*parts):
+        """Hash the given str/bytes parts into a cache key."""
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode("utf-8")
+            # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+            digest.update(len(part).to_bytes(8, "big"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the stored value for key, or None on a miss."""
+        if not self.enabled:
+            return None
+        try:
+            with open(self._entry_path(key), encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            os.utime(self._entry_path(key))  # Recently used entries are kept
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        """Store a JSON-serializable value under key."""
+        if not self.enabled:
+            return
+        try:
+            write_json_atomic(self._entry_path(key), value)
+        except OSError:
+            return
+        if not self._prune_checked:
+            self._prune_checked = True
+            self._prune_if_due()
+
+    def _prune_if_due(self):
+        marker = self.cache_dir / PRUNE_MARKER
+        try:
+            if time.time() - marker.stat().st_mtime < PRUNE_INTERVAL:
+                return
+        except OSError:
+            pass  # Never pruned
+        self.prune()
+        try:
+            marker.touch()
+        except OSError:
+            pass
+
+    def prune(self):
+        """Delete entries older than max_age, then the least recently used
+        ones until the rest fit in max_bytes. Returns the number deleted."""
+        entries = []
+        for path in self.cache_dir.glob("??/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort(reverse=True)  # Most recently used first
+        cutoff = time.time() - self.max_age
+        total = 0
+        deleted = 0
+        for mtime, size, path in entries:
+            if mtime >= cutoff and total + size <= self.max_bytes:
+                total += size
+                continue
+            try:
+                path.unlink()
+                deleted += 1
+            except OSError:
+                pass
+        return deleted
+
+    def summary(self):
+        """One-line description of cache hits and misses."""
+        if not self.enabled:
+            return "Result cache: disabled"
+        return (
+            f"Result cache: {self.hits} hit(s), {self.misses} miss(es) "
+            f"in {self.cache_dir}"
+        )
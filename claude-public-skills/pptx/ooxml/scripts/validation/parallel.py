@@ -0,0 +1,122 @@
+"""
+Process pools for spreading per-part work across CPU cores.
+"""
+
+import contextlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Validator instance owned by the current worker process (see _init_worker)
+_worker_validator = None
+
+
+def _init_worker(validator_class, args, kwargs):
+    """Build the validator a worker uses for all of its parts.
+
+    The instance lives for the whole life of the worker, so its compiled
+    schemas, parsed trees and original-file baseline stay warm between parts
+    and between checks.
+    """
+    global _worker_validator
+    _worker_validator = validator_class(*args, **kwargs)
+
+
+def _run_part(method_name, xml_file):
+    return getattr(_worker_validator, method_name)(xml_file)
+
+
+class PartPool:
+    """Run a validator's per-part methods on worker processes."""
+
+    def __init__(self, validator_class, args, kwargs, jobs):
+        """
+        Args:
+            validator_class: Validator class instantiated once in every worker
+            args, kwargs: Constructor arguments for the worker validators
+            jobs: Number of worker processes
+        """
+        self.jobs = jobs
+        self._executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(validator_class, args, kwargs),
+        )
+
+    def map(self, method_name, xml_files):
+        """Call method_name(xml_file) for every file and return results in input order."""
+        xml_files = list(xml_files)
+        # A few chunks per worker keeps IPC overhead low while still balancing load
+        chunksize = max(1, len(xml_files) // (self.jobs * 4))
+        return list(
+            self._executor.map(
+                _run_part,
+                [method_name] * len(xml_files),
+                xml_files,
+                chunksize=chunksize,
+            )
+        )
+
+    def close(self):
+        self._executor.shutdown()
+
+
+def map_by_size(function, items, sizes, jobs=1):
+    """Return [function(item) for item in items], computed on worker processes.
+
+    Items are handed to the workers largest first, so a few huge parts start
+    right away instead of being left for last and holding up the whole job.
+    Results come back in the order of items whatever order the workers finish
+    in; if any call raises, the exception of the earliest such item is raised.
+
+    Args:
+        function: Module-level function of one picklable argument
+        items: Arguments, one call each
+        sizes: Size of every item (bytes of the part), for balancing
+        jobs: Worker processes (0 = one per CPU); 1 runs everything in-process
+    """
+    items = list(items)
+    jobs = min(jobs or os.cpu_count() or 1, len(items))
+    if jobs <= 1:
+        return [function(item) for item in items]
+
+    order = sorted(range(len(items)), key=lambda i: sizes[i], reverse=True)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [None] * len(items)
+        for i in order:
+            futures[i] = executor.submit(function, items[i])
+        return [future.result() for future in futures]
+
+
+class PhaseTimer:
+    """Wall time spent in each phase of a job, for a one-line summary."""
+
+    def __init__(self, jobs=1):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.phases = {}  # Phase name -> seconds, in first-run order
+        self._started = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def total(self):
+        return time.perf_counter() - self._started
+
+    def to_dict(self):
+        return {
+            "jobs": self.jobs,
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "total": round(self.total, 6),
+        }
+
+    def summary(self):
+        phases = "".join(
+            f"{name} {seconds:.2f}s, " for name, seconds in self.phases.items()
+        )
+        return f"Timing: {phases}total {self.total:.2f}s ({self.jobs} job(s))"
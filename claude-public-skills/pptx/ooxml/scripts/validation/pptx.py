@@ -2,9 +2,12 @@
 Validator for PowerPoint presentation XML files against XSD schemas.
 """
 
+import posixpath
 import re
 
 from .base import BaseSchemaValidator
+from .package import rels_part_for
+from .report import CheckError, print_failure
 
 
 class PPTXSchemaValidator(BaseSchemaValidator):
@@ -25,57 +28,49 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         "tablestyleid": "tablestyles",
     }
 
-    def validate(self):
-        """Run all validation checks and return True if all pass."""
+    # PowerPoint checks run by validate(), in order
+    CHECKS = (
         # Test 0: XML well-formedness
-        if not self.validate_xml():
-            return False
-
+        "validate_xml",
         # Test 1: Namespace declarations
-        all_valid = True
-        if not self.validate_namespaces():
-            all_valid = False
-
+        "validate_namespaces",
         # Test 2: Unique IDs
-        if not self.validate_unique_ids():
-            all_valid = False
-
+        "validate_unique_ids",
         # Test 3: UUID ID validation
-        if not self.validate_uuid_ids():
-            all_valid = False
-
+        "validate_uuid_ids",
         # Test 4: Relationship and file reference validation
-        if not self.validate_file_references():
-            all_valid = False
-
+        "validate_file_references",
         # Test 5: Slide layout ID validation
-        if not self.validate_slide_layout_ids():
-            all_valid = False
-
+        "validate_slide_layout_ids",
         # Test 6: Content type declarations
-        if not self.validate_content_types():
-            all_valid = False
-
+        "validate_content_types",
         # Test 7: XSD schema validation
-        if not self.validate_against_xsd():
-            all_valid = False
-
+        "validate_against_xsd",
         # Test 8: Notes slide reference validation
-        if not self.validate_notes_slide_references():
-            all_valid = False
-
+        "validate_notes_slide_references",
         # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
-            all_valid = False
-
+        "validate_all_relationship_ids",
         # Test 10: Duplicate slide layout references validation
-        if not self.validate_no_duplicate_slide_layouts():
-            all_valid = False
-
-        return all_valid
+        "validate_no_duplicate_slide_layouts",
+    )
 
     def validate_uuid_ids(self):
         """Validate that ID attributes that look like UUIDs contain only hex values."""
+        errors = []
+
+        for file_errors in self._map_parts("_check_uuid_ids", self.xml_files):
+            errors.extend(file_errors)
+
+        if errors:
+            print_failure(f"Found {len(errors)} UUID ID validation errors:", errors)
+            return False
+        else:
+            if self.verbose:
+                print("PASSED - All UUID-like IDs contain valid hex values")
+            return True
+
+    def _check_uuid_ids(self, xml_file):
+        """Return UUID-like ID errors for a single XML file."""
         import lxml.etree
 
         errors = []
@@ -84,39 +79,39 @@ class PPTXSchemaValidator(BaseSchemaValidator):
             r"^[\{\(]?[0-9A-Fa-f]{8}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{4}-?[0-9A-Fa-f]{12}[\}\)]?$"
         )
 
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Check all elements for ID attributes
-                for elem in root.iter():
-                    for attr, value in elem.attrib.items():
-                        # Check if this is an ID attribute
-                        attr_name = attr.split("}")[-1].lower()
-                        if attr_name == "id" or attr_name.endswith("id"):
-                            # Check if value looks like a UUID (has the right length and pattern structure)
-                            if self._looks_like_uuid(value):
-                                # Validate that it contains only hex characters in the right positions
-                                if not uuid_pattern.match(value):
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: ID '{value}' appears to be a UUID but contains invalid hex characters"
+        try:
+            root = self._parse(xml_file).getroot()
+
+            # Check all elements for ID attributes
+            for elem in root.iter():
+                for attr, value in elem.attrib.items():
+                    # Check if this is an ID attribute
+                    attr_name = attr.split("}")[-1].lower()
+                    if attr_name == "id" or attr_name.endswith("id"):
+                        # Check if value looks like a UUID (has the right length and pattern structure)
+                        if self._looks_like_uuid(value):
+                            # Validate that it contains only hex characters in the right positions
+                            if not uuid_pattern.match(value):
+                                errors.append(
+                                    CheckError(
+                                        xml_file.relative_to(self.unpacked_dir),
+                                        elem.sourceline,
+                                        "invalid_uuid",
+                                        f"ID '{value}' appears to be a UUID but contains invalid hex characters",
                                     )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
+                                )
+
+        except (lxml.etree.XMLSyntaxError, Exception) as e:
+            errors.append(
+                CheckError(
+                    xml_file.relative_to(self.unpacked_dir),
+                    None,
+                    "check_error",
+                    f"Error: {e}",
                 )
+            )
 
-        if errors:
-            print(f"FAILED - Found {len(errors)} UUID ID validation errors:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print("PASSED - All UUID-like IDs contain valid hex values")
-            return True
+        return errors
 
     def _looks_like_uuid(self, value):
         """Check if a value has the general structure of a UUID."""
@@ -132,7 +127,8 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         errors = []
 
         # Find all slide master files
-        slide_masters = list(self.unpacked_dir.glob("ppt/slideMasters/*.xml"))
+        package = self._package_index()
+        slide_masters = package.parts_in("ppt/slideMasters", ".xml")
 
         if not slide_masters:
             if self.verbose:
@@ -142,29 +138,28 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         for slide_master in slide_masters:
             try:
                 # Parse the slide master file
-                root = lxml.etree.parse(str(slide_master)).getroot()
+                root = self._parse(package.files[slide_master]).getroot()
 
                 # Find the corresponding _rels file for this slide master
-                rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
+                rels_part = rels_part_for(slide_master)
 
-                if not rels_file.exists():
+                if rels_part not in package.files:
                     errors.append(
-                        f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                        f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}"
+                        CheckError(
+                            slide_master,
+                            None,
+                            "missing_relationships_part",
+                            f"Missing relationships file: {rels_part}",
+                        )
                     )
                     continue
 
-                # Parse the relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Build a set of valid relationship IDs that point to slide layouts
-                valid_layout_rids = set()
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "slideLayout" in rel_type:
-                        valid_layout_rids.add(rel.get("Id"))
+                valid_layout_rids = {
+                    rel.id
+                    for rel in package.relationships(rels_part)
+                    if "slideLayout" in rel.type
+                }
 
                 # Find all sldLayoutId elements in the slide master
                 for sld_layout_id in root.findall(
@@ -177,20 +172,20 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
                     if r_id and r_id not in valid_layout_rids:
                         errors.append(
-                            f"  {slide_master.relative_to(self.unpacked_dir)}: "
-                            f"Line {sld_layout_id.sourceline}: sldLayoutId with id='{layout_id}' "
-                            f"references r:id='{r_id}' which is not found in slide layout relationships"
+                            CheckError(
+                                slide_master,
+                                sld_layout_id.sourceline,
+                                "missing_slide_layout",
+                                f"sldLayoutId with id='{layout_id}' references r:id='{r_id}' "
+                                f"which is not found in slide layout relationships",
+                            )
                         )
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {slide_master.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(CheckError(slide_master, None, "check_error", f"Error: {e}"))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} slide layout ID validation errors:")
-            for error in errors:
-                print(error)
+            print_failure(f"Found {len(errors)} slide layout ID validation errors:", errors)
             print(
                 "Remove invalid references or add missing slide layouts to the relationships file."
             )
@@ -205,35 +200,33 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         import lxml.etree
 
         errors = []
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        package = self._package_index()
+        slide_rels_files = package.parts_in("ppt/slides/_rels", ".xml.rels")
 
         for rels_file in slide_rels_files:
             try:
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Find all slideLayout relationships
                 layout_rels = [
                     rel
-                    for rel in root.findall(
-                        f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                    )
-                    if "slideLayout" in rel.get("Type", "")
+                    for rel in package.relationships(rels_file)
+                    if "slideLayout" in rel.type
                 ]
 
                 if len(layout_rels) > 1:
                     errors.append(
-                        f"  {rels_file.relative_to(self.unpacked_dir)}: has {len(layout_rels)} slideLayout references"
+                        CheckError(
+                            rels_file,
+                            None,
+                            "duplicate_slide_layout",
+                            f"has {len(layout_rels)} slideLayout references",
+                        )
                     )
 
             except Exception as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(CheckError(rels_file, None, "check_error", f"Error: {e}"))
 
         if errors:
-            print("FAILED - Found slides with duplicate slideLayout references:")
-            for error in errors:
-                print(error)
+            print_failure("Found slides with duplicate slideLayout references:", errors)
             return False
         else:
             if self.verbose:
@@ -248,7 +241,8 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         notes_slide_references = {}  # Track which slides reference each notesSlide
 
         # Find all slide relationship files
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        package = self._package_index()
+        slide_rels_files = package.parts_in("ppt/slides/_rels", ".xml.rels")
 
         if not slide_rels_files:
             if self.verbose:
@@ -257,52 +251,48 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
         for rels_file in slide_rels_files:
             try:
-                # Parse the relationships file
-                root = lxml.etree.parse(str(rels_file)).getroot()
-
                 # Find all notesSlide relationships
-                for rel in root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rel_type = rel.get("Type", "")
-                    if "notesSlide" in rel_type:
-                        target = rel.get("Target", "")
-                        if target:
-                            # Normalize the target path to handle relative paths
-                            normalized_target = target.replace("../", "")
-
-                            # Track which slide references this notesSlide
-                            slide_name = rels_file.stem.replace(
-                                ".xml", ""
-                            )  # e.g., "slide1"
-
-                            if normalized_target not in notes_slide_references:
-                                notes_slide_references[normalized_target] = []
-                            notes_slide_references[normalized_target].append(
-                                (slide_name, rels_file)
-                            )
+                for rel in package.relationships(rels_file):
+                    if "notesSlide" in rel.type and rel.target:
+                        # Shown in messages: the target without parent references
+                        normalized_target = rel.target.replace("../", "")
+
+                        # Track which slide references this notesSlide
+                        slide_name = posixpath.basename(rels_file).removesuffix(
+                            ".rels"
+                        ).replace(".xml", "")  # e.g., "slide1"
+
+                        # Group by resolved part so differently written
+                        # targets for the same notes slide are recognized
+                        key = rel.part or normalized_target
+                        if key not in notes_slide_references:
+                            notes_slide_references[key] = (normalized_target, [])
+                        notes_slide_references[key][1].append((slide_name, rels_file))
 
             except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {rels_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+                errors.append(CheckError(rels_file, None, "check_error", f"Error: {e}"))
 
-        # Check for duplicate references
-        for target, references in notes_slide_references.items():
+        # Check for duplicate references, listing the referencing
+        # relationship files below each error
+        lines = list(errors)
+        for part, (target, references) in notes_slide_references.items():
             if len(references) > 1:
                 slide_names = [ref[0] for ref in references]
-                errors.append(
-                    f"  Notes slide '{target}' is referenced by multiple slides: {', '.join(slide_names)}"
+                error = CheckError(
+                    part,
+                    None,
+                    "shared_notes_slide",
+                    f"Notes slide '{target}' is referenced by multiple slides: {', '.join(slide_names)}",
                 )
+                errors.append(error)
+                lines.append(error)
                 for slide_name, rels_file in references:
-                    errors.append(f"    - {rels_file.relative_to(self.unpacked_dir)}")
+                    lines.append(f"    - {rels_file}")
 
         if errors:
-            print(
-                f"FAILED - Found {len([e for e in errors if not e.startswith('    ')])} notes slide reference validation errors:"
+            print_failure(
+                f"Found {len(errors)} notes slide reference validation errors:", lines
             )
-            for error in errors:
-                print(error)
             print("Each slide may optionally have its own slide file.")
             return False
         else:
@@ -2,123 +2,273 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
+import hashlib
+import itertools
 import zipfile
 from pathlib import Path
 
+import lxml.etree
+
+from .report import CheckError, print_failure
+from .scheduler import CheckScheduler
+from .textdiff import diff_paragraphs
+from .zippackage import as_path, xml_source
+
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+_W_P = f"{{{WORD_2006_NAMESPACE}}}p"
+_W_T = f"{{{WORD_2006_NAMESPACE}}}t"
+_W_INS = f"{{{WORD_2006_NAMESPACE}}}ins"
+_W_DEL = f"{{{WORD_2006_NAMESPACE}}}del"
+_W_DELTEXT = f"{{{WORD_2006_NAMESPACE}}}delText"
+_W_AUTHOR = f"{{{WORD_2006_NAMESPACE}}}author"
+
+
+class ParagraphStream:
+    """Paragraph texts of a document.xml with one author's changes rejected.
+
+    Iterating parses the part once with iterparse: the author's w:ins are
+    skipped, and w:delText inside the author's w:del counts as text. Empty
+    paragraphs are skipped to avoid false positives when tracked insertions
+    add only structural elements without text content. A paragraph nested in
+    another (text boxes) contributes its text to both, and paragraphs come in
+    start-tag order. Elements are cleared as soon as they are processed, so
+    memory does not grow with the size of the part.
+    """
+
+    def __init__(self, source, author):
+        """
+        Args:
+            source: Path or binary file-like object with the XML
+            author: w:author whose tracked changes are rejected
+        """
+        self.source = source
+        self.author = author
+        self.tracked_changes = 0  # Author's w:ins/w:del seen so far
+
+    def __iter__(self):
+        context = lxml.etree.iterparse(
+            str(self.source) if not hasattr(self.source, "read") else self.source,
+            events=("start", "end"),
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+        )
+
+        skip_depth = 0  # Open author w:ins elements (their content is dropped)
+        del_depth = 0  # Open author w:del elements (their w:delText is kept)
+        paragraphs = []  # Text parts of the open paragraphs, outermost first
+        pending = []  # Text parts of paragraphs awaiting the outermost end
+        depth = 0
+
+        for event, elem in context:
+            tag = elem.tag
+
+            if event == "start":
+                depth += 1
+                if skip_depth:
+                    if tag == _W_INS:
+                        skip_depth += 1
+                elif tag == _W_INS and elem.get(_W_AUTHOR) == self.author:
+                    self.tracked_changes += 1
+                    skip_depth = 1
+                elif tag == _W_DEL and elem.get(_W_AUTHOR) == self.author:
+                    self.tracked_changes += 1
+                    del_depth += 1
+                elif tag == _W_P:
+                    parts = []
+                    paragraphs.append(parts)
+                    pending.append(parts)
+                continue
+
+            depth -= 1
+            if skip_depth:
+                if tag == _W_INS:
+                    skip_depth -= 1
+            elif tag == _W_T or (tag == _W_DELTEXT and del_depth):
+                # Text is only complete at the end event
+                if elem.text:
+                    for parts in paragraphs:
+                        parts.append(elem.text)
+            elif tag == _W_DEL and del_depth and elem.get(_W_AUTHOR) == self.author:
+                del_depth -= 1
+            elif tag == _W_P:
+                paragraphs.pop()
+                if not paragraphs:
+                    for parts in pending:
+                        text = "".join(parts)
+                        if text:
+                            yield text
+                    pending = []
+
+            # Free the processed subtree and any earlier siblings
+            elem.clear(keep_tail=True)
+            if depth:
+                parent = elem.getparent()
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+    def fingerprints(self):
+        """Yield a digest per paragraph text, in the same order as iteration."""
+        for text in self:
+            yield hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir)
+    AUTHOR = "Claude"
+
+    # Approximate cap on the size of the diff shown when the text differs
+    MAX_DIFF_CHARS = 20_000
+
+    # Error message when the text differs once Claude's changes are removed
+    TEXT_MISMATCH = "Document text doesn't match after removing Claude's tracked changes"
+
+    # Checks run by validate() (see CheckScheduler)
+    CHECKS = ("validate_tracked_changes",)
+
+    def __init__(
+        self, unpacked_dir, original_docx, verbose=False, report=None, show_diff=True
+    ):
+        """
+        Args:
+            show_diff: Print a paragraph diff on failure. Without it the check
+                only reads the documents up to the first mismatching paragraph.
+        """
+        self.unpacked_dir = as_path(unpacked_dir)
         self.original_docx = Path(original_docx)
         self.verbose = verbose
-        self.namespaces = {
-            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
-        }
+        self.report = report
+        self.show_diff = show_diff
+        self.bytes_parsed = 0
 
     def repair(self) -> int:
         """No auto-repairs for redlining validation. Returns 0."""
         return 0
 
+    def close(self):
+        """Nothing to release; present for symmetry with the schema validators."""
+
     def validate(self):
         """Main validation method that returns True if valid, False otherwise."""
+        return CheckScheduler(self.report).run([self])
+
+    def limit_parts(self, parts):
+        """Return True if the tracked-change check applies to the given part names."""
+        return "word/document.xml" in parts
+
+    def validate_tracked_changes(self):
+        """Check that removing Claude's tracked changes restores the original text.
+
+        The current document.xml and the original one, read straight from the
+        original archive, are streamed side by side and compared by paragraph
+        fingerprints, stopping at the first mismatch.
+        """
         # Verify unpacked directory exists and has correct structure
         modified_file = self.unpacked_dir / "word" / "document.xml"
         if not modified_file.exists():
-            print(f"FAILED - Modified document.xml not found at {modified_file}")
+            self._fail(
+                "missing_part", f"Modified document.xml not found at {modified_file}"
+            )
             return False
 
-        # First, check if there are any tracked changes by Claude to validate
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
-            # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
-                if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
-                return True
-
-        except Exception:
-            # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
+            original_zip = zipfile.ZipFile(self.original_docx, "r")
+        except Exception as e:
+            if not self._has_tracked_changes(modified_file):
+                return self._no_tracked_changes()
+            self._fail("check_error", f"Error unpacking original docx: {e}")
+            return False
 
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
+        with original_zip:
+            try:
+                original_info = original_zip.getinfo("word/document.xml")
+            except KeyError:
+                if not self._has_tracked_changes(modified_file):
+                    return self._no_tracked_changes()
+                self._fail(
+                    "missing_part",
+                    f"Original document.xml not found in {self.original_docx}",
                 )
                 return False
 
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
+            self.bytes_parsed += modified_file.stat().st_size + original_info.file_size
+
             try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
+                with original_zip.open(original_info) as original_source:
+                    modified = ParagraphStream(xml_source(modified_file), self.AUTHOR)
+                    original = ParagraphStream(original_source, self.AUTHOR)
+                    modified_fingerprints = modified.fingerprints()
+                    matches = all(
+                        a == b
+                        for a, b in itertools.zip_longest(
+                            original.fingerprints(), modified_fingerprints
+                        )
+                    )
+
+                if matches:
+                    if not modified.tracked_changes:
+                        return self._no_tracked_changes()
+                    if self.verbose:
+                        print("PASSED - All changes by Claude are properly tracked")
+                    return True
+
+                # Redlining validation is only needed if tracked changes by
+                # Claude have been used, so read on until one shows up
+                for _ in modified_fingerprints:
+                    if modified.tracked_changes:
+                        break
+                if not modified.tracked_changes:
+                    return self._no_tracked_changes()
+
+                if not self.show_diff:
+                    self._fail("text_mismatch", self.TEXT_MISMATCH)
+                    return False
+
+                # Only a failing check needs the full text, for the diff
+                with original_zip.open(original_info) as original_source:
+                    original_paragraphs = list(
+                        ParagraphStream(original_source, self.AUTHOR)
+                    )
+                modified_paragraphs = list(
+                    ParagraphStream(xml_source(modified_file), self.AUTHOR)
+                )
+            except (lxml.etree.XMLSyntaxError, zipfile.BadZipFile) as e:
+                self._fail("check_error", f"Error parsing XML files: {e}")
                 return False
 
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
+        self._fail("text_mismatch", self.TEXT_MISMATCH)
+        print(self._generate_detailed_diff(original_paragraphs, modified_paragraphs))
+        return False
 
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
+    def _fail(self, code, message):
+        """Print and record the single error of a failed tracked-change check."""
+        print_failure(None, [CheckError("word/document.xml", None, code, message)])
 
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+    def _has_tracked_changes(self, modified_file):
+        """Return True if the modified document has tracked changes by Claude.
 
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
+        A document that cannot be parsed counts as having them, so it goes on
+        to fail validation.
+        """
+        stream = ParagraphStream(xml_source(modified_file), self.AUTHOR)
+        try:
+            for _ in stream:
+                if stream.tracked_changes:
+                    return True
+        except lxml.etree.XMLSyntaxError:
             return True
+        return stream.tracked_changes > 0
+
+    def _no_tracked_changes(self):
+        if self.verbose:
+            print("PASSED - No tracked changes by Claude found.")
+        return True
 
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+    def _generate_detailed_diff(self, original_paragraphs, modified_paragraphs):
+        """Generate character-level differences of the changed paragraphs."""
         error_parts = [
-            "FAILED - Document text doesn't match after removing Claude's tracked changes",
             "",
             "Likely causes:",
             "  1. Modified text inside another author's <w:ins> or <w:del> tags",
@@ -131,153 +281,13 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
+        diff = diff_paragraphs(
+            original_paragraphs, modified_paragraphs, self.MAX_DIFF_CHARS
+        )
+        error_parts.extend(["Differences:", "============", diff])
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
-
-        return None
-
-    def _remove_claude_tracked_changes(self, root):
-        """Remove tracked changes authored by Claude from the XML root."""
-        ins_tag = f"{{{self.namespaces['w']}}}ins"
-        del_tag = f"{{{self.namespaces['w']}}}del"
-        author_attr = f"{{{self.namespaces['w']}}}author"
-
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
-
-        # Unwrap content in w:del elements where author is "Claude"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
-
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
-
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
-
-        Empty paragraphs are skipped to avoid false positives when tracked
-        insertions add only structural elements without text content.
-        """
-        p_tag = f"{{{self.namespaces['w']}}}p"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
-            # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
-            # Skip empty paragraphs - they don't affect content validation
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
-
-        return "\n".join(paragraphs)
-
 
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
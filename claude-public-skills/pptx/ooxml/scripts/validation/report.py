@@ -0,0 +1,211 @@
+"""
+Machine-readable validation report with per-check timings.
+"""
+
+import contextlib
+import contextvars
+import io
+import json
+import sys
+import time
+
+from .zippackage import as_path
+
+# Errors recorded by the check ValidationReport.run() is running, if any
+_recorded_errors = contextvars.ContextVar("recorded_errors", default=None)
+
+
+class CheckError:
+    """One error found by a check.
+
+    part and line are None when the error is not tied to one; code is a short
+    snake_case name for the kind of error ("broken_reference", "xsd", ...).
+    str() gives the indented line checks print under their FAILED line.
+    """
+
+    __slots__ = ("part", "line", "code", "message")
+
+    def __init__(self, part, line, code, message):
+        self.part = str(part) if part is not None else None
+        self.line = line
+        self.code = code
+        self.message = message
+
+    def __str__(self):
+        if self.part is None:
+            return f"  {self.message}"
+        if self.line is None:
+            return f"  {self.part}: {self.message}"
+        return f"  {self.part}: Line {self.line}: {self.message}"
+
+    def __repr__(self):
+        return f"CheckError({self.part!r}, {self.line!r}, {self.code!r}, {self.message!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, CheckError):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def record_errors(errors):
+    """Add CheckError records to the report entry of the running check, if any."""
+    recorded = _recorded_errors.get()
+    if recorded is not None:
+        recorded.extend(errors)
+
+
+def print_failure(summary, errors=()):
+    """Print a check's FAILED block and record its errors.
+
+    Each CheckError in errors is printed on its own line under
+    "FAILED - summary". Plain strings in errors are printed as they are but not
+    recorded (notes such as "... and 3 more"). With summary None the failure
+    is a single error, printed as "FAILED - message".
+    """
+    errors = list(errors)
+    if summary is None:
+        (error,) = errors
+        print(f"FAILED - {error.message}")
+    else:
+        print(f"FAILED - {summary}")
+        for error in errors:
+            print(error)
+    record_errors(error for error in errors if isinstance(error, CheckError))
+
+
+class _Tee(io.TextIOBase):
+    """Text stream that records everything written and optionally echoes it."""
+
+    def __init__(self, echo_to=None):
+        self.buffer = io.StringIO()
+        self._echo_to = echo_to
+
+    def write(self, text):
+        self.buffer.write(text)
+        if self._echo_to is not None:
+            self._echo_to.write(text)
+        return len(text)
+
+    def flush(self):
+        if self._echo_to is not None:
+            self._echo_to.flush()
+
+
+class ValidationReport:
+    """Structured result of one validation run.
+
+    Validators record every check they run through run_check(): its result,
+    wall time, bytes of XML parsed for it, and the CheckError records it
+    reported with print_failure(). The text a check prints is captured for
+    the report and, when echo is True, still written to stdout, so text
+    output is unchanged.
+    """
+
+    def __init__(self, echo=True):
+        self.echo = echo
+        self.checks = []
+        self.xsd_parts = []
+        self.files = 0
+        self.parts = 0
+        self.success = None
+        self.info = {}  # Extra top-level fields (cache statistics, messages, ...)
+        self._started = time.perf_counter()
+        self.seconds = None
+
+    def describe_package(self, unpacked_dir):
+        """Record how many files and XML parts the package has."""
+        files = [f for f in as_path(unpacked_dir).rglob("*") if f.is_file()]
+        self.files = len(files)
+        self.parts = sum(1 for f in files if f.suffix.lower() in (".xml", ".rels"))
+
+    def run(self, check, *args, **kwargs):
+        """Call a bound check method and record it. Returns the check's result."""
+        validator = getattr(check, "__self__", None)
+        name = check.__name__
+        bytes_before = getattr(validator, "bytes_parsed", 0)
+
+        tee = _Tee(sys.stdout if self.echo else None)
+        errors = []
+        token = _recorded_errors.set(errors)
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(tee):
+                result = check(*args, **kwargs)
+        finally:
+            _recorded_errors.reset(token)
+        seconds = time.perf_counter() - start
+
+        output = tee.buffer.getvalue()
+        self.checks.append({
+            "validator": type(validator).__name__ if validator is not None else None,
+            "name": name,
+            "passed": result is not False,
+            "seconds": round(seconds, 6),
+            "bytes_parsed": getattr(validator, "bytes_parsed", 0) - bytes_before,
+            "errors": [error.to_dict() for error in errors],
+            "output": output.splitlines(),
+        })
+        return result
+
+    def add_xsd_part(self, part, seconds, status):
+        """Record the XSD time of one part.
+
+        status is valid, invalid, skipped (no schema), oversized (above the
+        validator's XSD_SIZE_LIMIT) or unchanged.
+        """
+        self.xsd_parts.append(
+            {"part": str(part), "seconds": round(seconds, 6), "status": status}
+        )
+
+    def add_cache_stats(self, schema_registry, result_cache):
+        """Record schema compilation and result cache statistics."""
+        self.info["schema_cache"] = {
+            "compiled": schema_registry.compiled,
+            "compile_seconds": round(schema_registry.compile_time, 6),
+            "hits": schema_registry.hits,
+        }
+        self.info["result_cache"] = {
+            "enabled": result_cache.enabled,
+            "hits": result_cache.hits,
+            "misses": result_cache.misses,
+        }
+
+    def finish(self, success):
+        """Record the overall outcome and total wall time."""
+        self.success = success
+        self.seconds = time.perf_counter() - self._started
+
+    def to_dict(self):
+        return {
+            "success": self.success,
+            "seconds": round(self.seconds, 6) if self.seconds is not None else None,
+            "files": self.files,
+            "parts": self.parts,
+            "checks": self.checks,
+            "xsd_parts": self.xsd_parts,
+            **self.info,
+        }
+
+    def load(self, data):
+        """Fill the report from to_dict() output, e.g. one made by the validation server."""
+        data = dict(data)
+        self.success = data.pop("success", None)
+        self.seconds = data.pop("seconds", None)
+        self.files = data.pop("files", 0)
+        self.parts = data.pop("parts", 0)
+        self.checks = data.pop("checks", [])
+        self.xsd_parts = data.pop("xsd_parts", [])
+        self.info.update(data)
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+
+def run_check(report, check, *args, **kwargs):
+    """Call a validator check, recording it in report when one is given."""
+    if report is None:
+        return check(*args, **kwargs)
+    return report.run(check, *args, **kwargs)
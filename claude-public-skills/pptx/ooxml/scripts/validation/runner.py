@@ -0,0 +1,257 @@
+"""
+Validation runs shared by validate.py, pack.py and the validation server.
+"""
+
+from pathlib import Path
+
+from .base import BaseSchemaValidator
+from .cache import ResultCache
+from .docx import DOCXSchemaValidator
+from .pptx import PPTXSchemaValidator
+from .redlining import RedliningValidator
+from .xlsx import XLSXSchemaValidator
+from .report import run_check
+from .scheduler import CheckScheduler
+from .schemas import SCHEMA_REGISTRY
+from .zippackage import ZipPackage
+
+PACKED_SUFFIXES = [".docx", ".pptx", ".xlsx"]
+
+
+def _make_validators(
+    validator_classes,
+    unpacked_dir,
+    original_file,
+    verbose=False,
+    jobs=1,
+    result_cache=None,
+    report=None,
+    baseline_registry=None,
+    xsd_large_parts=False,
+):
+    """Instantiate validator_classes, passing schema options only where accepted."""
+    schema_options = {
+        "jobs": jobs,
+        "result_cache": result_cache,
+        "baseline_registry": baseline_registry,
+        "xsd_large_parts": xsd_large_parts,
+    }
+    return [
+        V(
+            unpacked_dir,
+            original_file,
+            verbose=verbose,
+            report=report,
+            **schema_options,
+        )
+        if issubclass(V, BaseSchemaValidator)
+        else V(unpacked_dir, original_file, verbose=verbose, report=report)
+        for V in validator_classes
+    ]
+
+
+def validate_path(
+    path,
+    original_file,
+    verbose=False,
+    auto_repair=False,
+    jobs=1,
+    cache=True,
+    report=None,
+    baseline_registry=None,
+    xsd_large_parts=False,
+    fail_fast=False,
+    time_budget=None,
+    only=None,
+):
+    """Validate an unpacked directory or packed Office file, as validate.py does.
+
+    Output is printed. Returns True if all validations pass.
+
+    Args:
+        path: Unpacked directory or packed .docx/.pptx/.xlsx
+        original_file: Original .docx/.pptx/.xlsx to compare against
+        verbose: Print passing checks and cache statistics too
+        auto_repair: Apply the validators' auto-repairs before validating
+        jobs: Worker processes for per-part checks (0 = one per CPU)
+        cache: Use the persistent per-part result cache
+        report: Optional ValidationReport every check is recorded in
+        baseline_registry: Optional BaselineRegistry keeping original-file
+            errors across runs (used by the validation server)
+        xsd_large_parts: Validate parts above the validators' XSD_SIZE_LIMIT
+            (large worksheets) against their schema too
+        fail_fast, time_budget, only: Partial-run options of CheckScheduler;
+            with any of them the run does not print "All validations PASSED!"
+    """
+    # Validate paths
+    path = Path(path)
+    original_file = Path(original_file)
+    file_extension = original_file.suffix.lower()
+    assert path.exists(), f"Error: {path} does not exist"
+    assert original_file.is_file(), f"Error: {original_file} is not a file"
+    assert file_extension in PACKED_SUFFIXES, (
+        f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
+    )
+
+    options = {
+        "verbose": verbose,
+        "auto_repair": auto_repair,
+        "jobs": jobs,
+        "cache": cache,
+        "report": report,
+        "baseline_registry": baseline_registry,
+        "xsd_large_parts": xsd_large_parts,
+        "scheduler_options": {
+            "fail_fast": fail_fast,
+            "time_budget": time_budget,
+            "only": only,
+        },
+    }
+
+    # If path is a packed file, validate its parts from a zip-backed view
+    if path.is_file() and path.suffix.lower() in PACKED_SUFFIXES:
+        with ZipPackage(path) as package:
+            return _validate_unpacked(package.root, original_file, **options)
+
+    assert path.is_dir(), f"Error: {path} is not a directory or Office file"
+    return _validate_unpacked(path, original_file, **options)
+
+
+def _validate_unpacked(
+    unpacked_dir,
+    original_file,
+    verbose,
+    auto_repair,
+    jobs,
+    cache,
+    report,
+    baseline_registry,
+    xsd_large_parts,
+    scheduler_options,
+):
+    # Run validations
+    match original_file.suffix.lower():
+        case ".docx":
+            validator_classes = [DOCXSchemaValidator, RedliningValidator]
+        case ".pptx":
+            validator_classes = [PPTXSchemaValidator]
+        case ".xlsx":
+            validator_classes = [XLSXSchemaValidator]
+        case _:
+            print(
+                "Error: Validation not supported for file type "
+                f"{original_file.suffix.lower()}"
+            )
+            return False
+
+    if report is not None:
+        report.describe_package(unpacked_dir)
+
+    # The same validator instances serve repair and validation, so parsed
+    # parts are shared and only files rewritten by a repair are parsed again
+    result_cache = ResultCache(enabled=cache)
+    validators = _make_validators(
+        validator_classes,
+        unpacked_dir,
+        original_file,
+        verbose=verbose,
+        jobs=jobs,
+        result_cache=result_cache,
+        report=report,
+        baseline_registry=baseline_registry,
+        xsd_large_parts=xsd_large_parts,
+    )
+
+    try:
+        # Auto-repair if requested
+        if auto_repair:
+            total_repairs = 0
+            for validator in validators:
+                total_repairs += run_check(report, validator.repair)
+            if total_repairs:
+                print(f"Auto-repaired {total_repairs} issue(s)")
+            if report is not None:
+                report.info["repairs"] = total_repairs
+
+        # Run validators
+        scheduler = CheckScheduler(report, result_cache, **scheduler_options)
+        success = scheduler.run(validators)
+    finally:
+        # Worker processes and archive handles must not outlive the run,
+        # least of all in the long-running validation server
+        for validator in validators:
+            validator.close()
+
+    if verbose:
+        print(SCHEMA_REGISTRY.summary())
+        print(result_cache.summary())
+
+    if report is not None:
+        report.add_cache_stats(SCHEMA_REGISTRY, result_cache)
+        report.finish(success)
+
+    if success and scheduler.complete:
+        print("All validations PASSED!")
+    elif success:
+        print("All checks that ran PASSED (incomplete validation)")
+
+    return success
+
+
+def validate_for_pack(
+    unpacked_dir,
+    original_file,
+    cache=True,
+    report=None,
+    baseline_registry=None,
+    verbose=False,
+):
+    """Run DOCX validation with auto-repair, as docx/scripts/pack.py does.
+
+    Checks print their own output; the repair count, final verdict and, when
+    verbose, cache statistics are returned instead.
+
+    Returns:
+        (success, output) - success is True if all validations pass
+    """
+    # Built once and reused for repair and validation so parsed parts are shared
+    result_cache = ResultCache(enabled=cache)
+    validators = _make_validators(
+        [DOCXSchemaValidator, RedliningValidator],
+        unpacked_dir,
+        original_file,
+        result_cache=result_cache,
+        report=report,
+        baseline_registry=baseline_registry,
+    )
+    if report is not None:
+        report.describe_package(unpacked_dir)
+    output_lines = []
+
+    try:
+        # Run auto-repair
+        total_repairs = 0
+        for validator in validators:
+            total_repairs += run_check(report, validator.repair)
+        if total_repairs:
+            output_lines.append(f"Auto-repaired {total_repairs} issue(s)")
+        if report is not None:
+            report.info["repairs"] = total_repairs
+
+        # Run validation
+        success = CheckScheduler(report, result_cache).run(validators)
+    finally:
+        for validator in validators:
+            validator.close()
+
+    if verbose:
+        output_lines.append(SCHEMA_REGISTRY.summary())
+        output_lines.append(result_cache.summary())
+    if report is not None:
+        report.add_cache_stats(SCHEMA_REGISTRY, result_cache)
+        report.finish(success)
+
+    if success:
+        output_lines.append("All validations PASSED!")
+
+    return success, "\n".join(output_lines) if output_lines else None
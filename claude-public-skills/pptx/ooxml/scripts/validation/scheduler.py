@@ -0,0 +1,279 @@
+"""
+Scheduler deciding which validator checks run, and in what order.
+"""
+
+import json
+import time
+
+from .cache import ResultCache, write_json_atomic
+from .report import run_check
+from .zippackage import as_path
+
+# Check every other check of a schema validator depends on: when it fails, the
+# validator's remaining checks are not run
+GATE_CHECK = "validate_xml"
+
+# The expensive check, always scheduled after every other check
+LAST_CHECK = "validate_against_xsd"
+
+# Upper bounds (seconds) of the cost tiers checks are ordered by. Checks in
+# the same tier keep their declared order, so timing noise between cheap
+# checks never changes which failure is reported first
+COST_TIERS = (0.01, 0.1, 1.0, 10.0)
+
+# File in the result cache directory holding measured check costs
+COSTS_FILE = "check-costs.json"
+
+# Bump when check costs are measured differently, so old estimates are dropped
+COSTS_VERSION = 1
+
+
+class CheckCosts:
+    """Measured cost of every check, in seconds per MB of package XML.
+
+    Estimates are a running average over earlier runs, stored next to the
+    result cache. Nothing is read or written when the cache is disabled.
+    """
+
+    def __init__(self, result_cache):
+        self.path = result_cache.cache_dir / COSTS_FILE
+        self.enabled = result_cache.enabled
+        self._costs = {}  # "Validator.check" -> seconds per MB
+        self._changed = False
+        if self.enabled:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == COSTS_VERSION:
+                    self._costs = data["costs"]
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+
+    def estimate(self, validator, check, megabytes):
+        """Expected seconds for check on a package of the given size, or None."""
+        rate = self._costs.get(f"{type(validator).__name__}.{check}")
+        return None if rate is None else rate * megabytes
+
+    def record(self, validator, check, seconds, megabytes):
+        key = f"{type(validator).__name__}.{check}"
+        rate = seconds / megabytes
+        previous = self._costs.get(key)
+        self._costs[key] = rate if previous is None else (previous + rate) / 2
+        self._changed = True
+
+    def save(self):
+        if not self.enabled or not self._changed:
+            return
+        try:
+            write_json_atomic(
+                self.path, {"version": COSTS_VERSION, "costs": self._costs}
+            )
+        except OSError:
+            pass
+
+
+class CheckScheduler:
+    """Run the checks validators declare in CHECKS.
+
+    By default every validator's checks run in declared order, stopping a
+    schema validator at its first check if the XML is not well-formed; this is
+    what validate() does.
+
+    With fail_fast, time_budget or only, the aim is the first actionable
+    failures: after the well-formedness checks (which always run, whatever the
+    budget), the checks of all validators run cheapest first by tier of
+    measured cost (COST_TIERS), with XSD validation last. Every check that does not run is listed at the
+    end, and complete stays False, so such a run is never mistaken for a full
+    validation.
+    """
+
+    def __init__(
+        self, report=None, result_cache=None, fail_fast=False, time_budget=None, only=None
+    ):
+        """
+        Args:
+            report: Optional ValidationReport the checks are recorded in
+            result_cache: ResultCache whose directory holds measured check
+                costs (used only when fail_fast, time_budget or only is set)
+            fail_fast: Stop after the first failing check
+            time_budget: Seconds; checks not expected to finish in time are deferred
+            only: Part names ("word/document.xml") per-part checks are limited to
+        """
+        self.report = report
+        self.fail_fast = fail_fast
+        self.time_budget = time_budget
+        self.only = None
+        if only:
+            self.only = [part.replace("\\", "/").lstrip("/") for part in only]
+
+        # Costs only order and budget scheduled runs, so a default run neither
+        # reads nor measures them
+        if result_cache is None or not self.scheduled:
+            result_cache = ResultCache(enabled=False)
+        self.costs = CheckCosts(result_cache)
+
+        # (validator, check, reason, estimated seconds or None) for checks not run
+        self.skipped = []
+
+    @property
+    def scheduled(self):
+        """True if any option changes which checks run or their order."""
+        return self.fail_fast or self.time_budget is not None or self.only is not None
+
+    @property
+    def measured(self):
+        """True if check costs are recorded for later runs.
+
+        With only, package-level checks and schema loading take as long as on
+        the whole package but would be scaled by the size of the selected
+        parts alone, so those runs leave the estimates as they are.
+        """
+        return self.scheduled and self.only is None
+
+    @property
+    def complete(self):
+        """True if the last run() ran every check on every part."""
+        return not self.skipped and self.only is None
+
+    def run(self, validators):
+        """Run the validators' checks. Returns True if every check that ran passed."""
+        self.skipped = []
+        active = list(validators)
+        if self.only is not None:
+            self._warn_unknown_parts(validators)
+            active = [v for v in validators if v.limit_parts(self.only)]
+            for validator in validators:
+                if validator not in active:
+                    for check in validator.CHECKS:
+                        self._skip(validator, check, "none of the --only parts")
+
+        megabytes = self._package_megabytes(active)
+        success = True
+        failed_gates = set()
+        start = time.perf_counter()
+
+        for validator, check in self._plan(active, megabytes):
+            informational = check in getattr(validator, "INFORMATIONAL_CHECKS", ())
+            estimate = self.costs.estimate(validator, check, megabytes)
+            elapsed = time.perf_counter() - start
+
+            if id(validator) in failed_gates:
+                self._skip(validator, check, "XML not well-formed")
+                continue
+            if self.fail_fast and not success:
+                self._skip(validator, check, "--fail-fast", estimate)
+                continue
+            if informational and self.only is not None:
+                self._skip(validator, check, "needs the whole document")
+                continue
+            if self.time_budget is not None and check != GATE_CHECK and (
+                elapsed >= self.time_budget
+                or (estimate is not None and elapsed + estimate > self.time_budget)
+            ):
+                self._skip(validator, check, "--time-budget", estimate)
+                continue
+
+            check_start = time.perf_counter()
+            passed = run_check(self.report, getattr(validator, check))
+            if self.measured:
+                self.costs.record(
+                    validator, check, time.perf_counter() - check_start, megabytes
+                )
+
+            if informational or passed:
+                continue
+            success = False
+            if check == GATE_CHECK:
+                failed_gates.add(id(validator))
+
+        if self.measured:
+            self.costs.save()
+        if self.scheduled:
+            self._print_summary()
+        if self.report is not None and self.scheduled:
+            self.report.info["schedule"] = {
+                "fail_fast": self.fail_fast,
+                "time_budget": self.time_budget,
+                "only": self.only,
+                "complete": self.complete,
+                "skipped": [
+                    {
+                        "validator": type(validator).__name__,
+                        "name": check,
+                        "reason": reason,
+                        "estimated_seconds": (
+                            round(estimate, 6) if estimate is not None else None
+                        ),
+                    }
+                    for validator, check, reason, estimate in self.skipped
+                ],
+            }
+        return success
+
+    def _plan(self, validators, megabytes):
+        """Return the (validator, check) pairs to run, in order."""
+        if not self.scheduled:
+            return [(v, check) for v in validators for check in v.CHECKS]
+
+        pairs = [(v, check) for v in validators for check in v.CHECKS]
+        gates = [pair for pair in pairs if pair[1] == GATE_CHECK]
+        rest = [pair for pair in pairs if pair[1] != GATE_CHECK]
+
+        def tier(pair):
+            estimate = self.costs.estimate(pair[0], pair[1], megabytes)
+            if estimate is None:
+                # Unmeasured checks go after all measured ones
+                return (pair[1] == LAST_CHECK, len(COST_TIERS) + 1)
+            return (
+                pair[1] == LAST_CHECK,
+                sum(1 for bound in COST_TIERS if estimate >= bound),
+            )
+
+        return gates + sorted(rest, key=tier)
+
+    def _skip(self, validator, check, reason, estimate=None):
+        self.skipped.append((validator, check, reason, estimate))
+
+    def _package_megabytes(self, validators):
+        """Size of the XML the checks read, for scaling cost estimates."""
+        for validator in validators:
+            xml_files = getattr(validator, "xml_files", None)
+            if xml_files is not None:
+                size = sum(as_path(f).stat().st_size for f in xml_files)
+                return max(size / (1024 * 1024), 0.001)
+        return 1.0
+
+    def _warn_unknown_parts(self, validators):
+        known = set()
+        for validator in validators:
+            for xml_file in getattr(validator, "xml_files", ()):
+                known.add(xml_file.relative_to(validator.unpacked_dir).as_posix())
+        for part in self.only:
+            if known and part not in known:
+                print(f"Warning: --only part {part} is not an XML part of the package")
+
+    def _print_summary(self):
+        """List the checks that did not run and why."""
+        reasons = {
+            "XML not well-formed": "not run because the XML is not well-formed",
+            "--fail-fast": "not run after the first failure (--fail-fast)",
+            "--time-budget": f"deferred, over the {self.time_budget}s time budget",
+            "none of the --only parts": "not run, none of their parts are in --only",
+            "needs the whole document": "not run, they need the whole document (--only)",
+        }
+        for reason, description in reasons.items():
+            entries = [entry for entry in self.skipped if entry[2] == reason]
+            if not entries:
+                continue
+            print(f"SKIPPED - {len(entries)} check(s) {description}:")
+            for validator, check, _, estimate in entries:
+                expected = f", ~{estimate:.2f}s" if estimate is not None else ""
+                print(f"  {check} ({type(validator).__name__}{expected})")
+
+        if self.only is not None:
+            print(f"LIMITED - Per-part checks only covered: {', '.join(self.only)}")
+        if not self.complete:
+            print(
+                "INCOMPLETE - Not a full validation. Run without --fail-fast, "
+                "--time-budget and --only before packing."
+            )